@@ -1,29 +1,77 @@
 __all__ = ["app"]
 __lazy_modules__ = [
     "os",
+    "subprocess",
     "concurrent",
     "difflib",
+    "io",
     "functools",
+    "itertools",
+    "contextlib",
     "textwrap",
     "inifix",
-    "re",
+    "inifix_cli._discovery",
+    "inifix_cli._stats",
+    "inifix_cli._watch",
 ]
 
 import os
+import re
+import subprocess
 import sys
-from concurrent.futures import ThreadPoolExecutor
-from dataclasses import dataclass
+import time
+from collections.abc import Iterable, Iterator, Sized
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from contextlib import ExitStack
+from dataclasses import dataclass, replace
+from io import BytesIO
 from difflib import unified_diff
 from functools import partial
+from itertools import chain, islice
 from enum import Enum, auto
-from typing import TYPE_CHECKING, Literal, NewType, Callable, Any, IO, final, cast
+from typing import (
+    TYPE_CHECKING,
+    Literal,
+    NewType,
+    Callable,
+    Any,
+    IO,
+    final,
+    cast,
+    assert_never,
+)
 import click
 from textwrap import indent
 import inifix
-import re
+
+from inifix_cli._discovery import (
+    compile_excludes,
+    compile_includes,
+    git_changed_files,
+    git_toplevel,
+    iter_changed_files,
+    iter_files,
+)
+from inifix_cli._stats import (
+    FileStats,
+    RunStats,
+    format_report,
+    phase,
+    profile_run,
+    timed_iter,
+)
+from inifix_cli._watch import watch as watch_files
 
 
 if TYPE_CHECKING:
+    from inifix._frozen import FrozenConfig
     from inifix._typing import AnyConfig
 
 
@@ -38,6 +86,7 @@ Message = NewType("Message", str)
 class TaskResults:
     status: Literal[0, 1]
     messages: list[Message]
+    stats: "FileStats | None" = None
 
 
 def get_cpu_count() -> int:
@@ -69,20 +118,238 @@ class Exit(click.ClickException):
     def show(self, file: IO[Any] | None = None) -> None: ...  # pyright: ignore[reportImplicitOverride] # pyrefly: ignore[missing-override-decorator]
 
 
-def run_as_pool(closure: Callable[[str], TaskResults], files: list[str]) -> None:
+class Backend(Enum):
+    threads = auto()
+    processes = auto()
+    serial = auto()
+    # this member needs to be defined last, as it shadows enum.auto
+    auto = auto()
+
+
+def is_gil_enabled() -> bool:
+    # this function exists primarily to be mocked
+    if sys.version_info >= (3, 13):
+        return sys._is_gil_enabled()
+    else:
+        return True
+
+
+def resolve_backend(
+    backend: Backend, *, jobs: int | None, file_count: int | None
+) -> Backend:
+    if backend is not Backend.auto:
+        return backend
+    if jobs == 1 or (file_count is not None and file_count < 2):
+        # not worth the cost of starting a pool
+        return Backend.serial
+    if is_gil_enabled():
+        # parsing and formatting are CPU-bound, so threads
+        # only scale on free-threaded builds
+        return Backend.processes
+    return Backend.threads
+
+
+def get_default_jobs(backend: Backend) -> int:
     cpu_count = get_cpu_count()
-    with ThreadPoolExecutor(max_workers=max(1, int(cpu_count / 2))) as executor:
-        futures = [executor.submit(closure, file) for file in files]
-        results = [f.result() for f in futures]
+    match backend:
+        case Backend.threads:
+            return max(1, int(cpu_count / 2))
+        case Backend.processes:
+            return cpu_count
+        case Backend.serial | Backend.auto:
+            return 1
+        case _ as unreachable:
+            assert_never(unreachable)
+
+
+def get_chunksize(file_count: int | None, jobs: int) -> int:
+    # submit files in batches to amortize inter-process communication,
+    # while keeping enough chunks around to balance the load between workers
+    if file_count is None:
+        return 16
+    return max(1, min(64, file_count // (4 * jobs)))
+
+
+def _run_batch(
+    closure: Callable[[str], TaskResults], files: list[str]
+) -> list[TaskResults]:
+    return [closure(file) for file in files]
+
+
+def _batched(files: Iterable[str], size: int, /) -> Iterator[list[str]]:
+    # itertools.batched requires Python 3.12
+    it = iter(files)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+def iter_results(
+    closure: Callable[[str], TaskResults],
+    files: Iterable[str],
+    *,
+    executor: Executor,
+    chunksize: int = 1,
+    window: int,
+    ordered: bool = True,
+    run_batch: Callable[..., list[TaskResults]] = _run_batch,
+) -> Iterator[TaskResults]:
+    """
+    Yield results as soon as they are available, while keeping at most
+    `window` batches of files either in flight or waiting to be yielded.
+
+    In ordered mode, results are yielded in the same order as `files`;
+    otherwise they are yielded in completion order.
+    """
+    batches = enumerate(_batched(files, chunksize))
+    pending: dict[Future[list[TaskResults]], int] = {}
+    # results that completed ahead of their turn (ordered mode only)
+    buffer: dict[int, list[TaskResults]] = {}
+    next_index = 0
+
+    def fill_window() -> None:
+        while len(pending) + len(buffer) < window:
+            if (item := next(batches, None)) is None:
+                return
+            index, batch = item
+            pending[executor.submit(run_batch, closure, batch)] = index
+
+    fill_window()
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            index = pending.pop(future)
+            if ordered:
+                buffer[index] = future.result()
+            else:
+                yield from future.result()
+        while next_index in buffer:
+            yield from buffer.pop(next_index)
+            next_index += 1
+        fill_window()
+
+
+def run_as_pool(
+    closure: Callable[[str], TaskResults],
+    files: Iterable[str],
+    *,
+    backend: Backend = Backend.auto,
+    jobs: int | None = None,
+    ordered: bool = True,
+    stats: RunStats | None = None,
+    profile: str | None = None,
+) -> None:
+    tstart = time.perf_counter()
+    file_count: int | None
+    if isinstance(files, Sized):
+        file_count = len(files)
+    else:
+        if stats is not None:
+            files = timed_iter(files, stats)
+        # peek ahead just enough to tell if starting a pool is worth it
+        it = iter(files)
+        head = list(islice(it, 2))
+        file_count = len(head) if len(head) < 2 else None
+        files = chain(head, it)
+    backend = resolve_backend(backend, jobs=jobs, file_count=file_count)
+    if jobs is None:
+        jobs = get_default_jobs(backend)
+
+    if stats is not None:
+        stats.backend = backend.name
+        stats.jobs = jobs
+
+    status = 0
+    with ExitStack() as stack:
+        # this needs to be entered first, so that worker profiles
+        # are collected after the executor is shut down
+        pool_kwargs: dict[str, Any] = {}
+        if profile is not None:
+            run_batch = stack.enter_context(profile_run(profile, backend=backend.name))
+            if run_batch is not None:
+                pool_kwargs["run_batch"] = run_batch
+
+        executor: Executor
+        results: Iterator[TaskResults]
+        match backend:
+            case Backend.serial:
+                results = map(closure, files)
+            case Backend.threads:
+                executor = stack.enter_context(ThreadPoolExecutor(max_workers=jobs))
+                results = iter_results(
+                    closure,
+                    files,
+                    executor=executor,
+                    window=4 * jobs,
+                    ordered=ordered,
+                    **pool_kwargs,
+                )
+            case Backend.processes:
+                executor = stack.enter_context(ProcessPoolExecutor(max_workers=jobs))
+                results = iter_results(
+                    closure,
+                    files,
+                    executor=executor,
+                    chunksize=get_chunksize(file_count, jobs),
+                    window=4 * jobs,
+                    ordered=ordered,
+                    **pool_kwargs,
+                )
+            case Backend.auto:
+                raise RuntimeError
+            case _ as unreachable:
+                assert_never(unreachable)
 
-    for res in results:
-        for message in res.messages:
-            print(message)
+        for res in results:
+            for message in res.messages:
+                print(message, flush=True)
+            status |= res.status
+            if stats is not None and res.stats is not None:
+                stats.files.append(res.stats)
 
-    if any(res.status for res in results):
+    if stats is not None:
+        stats.wall_time = time.perf_counter() - tstart
+    if status:
         raise Exit()
 
 
+def run(
+    closure: Callable[[str], TaskResults],
+    discover: Callable[[], Iterable[str]],
+    *,
+    backend: Backend,
+    jobs: int | None,
+    ordered: bool,
+    watch: bool,
+    stats: bool = False,
+    profile: str | None = None,
+) -> None:
+    run_stats = RunStats() if stats else None
+    try:
+        run_as_pool(
+            closure,
+            discover(),
+            backend=backend,
+            jobs=jobs,
+            ordered=ordered,
+            stats=run_stats,
+            profile=profile,
+        )
+    except Exit:
+        if not watch:
+            raise
+    finally:
+        if run_stats is not None:
+            click.echo(format_report(run_stats), err=True)
+
+    if not watch:
+        return
+    click.echo("Watching for changes (press Ctrl+C to stop)", err=True)
+    try:
+        watch_files(closure, discover)
+    except KeyboardInterrupt:
+        pass
+
+
 class SectionsArg(Enum):
     allow = auto()
     forbid = auto()
@@ -95,9 +362,103 @@ BUILTIN_EXCLUDES = [
 ]
 
 
-def filter_files(files: list[str], /, *, exclude: list[str] | None = None) -> list[str]:
-    exclude = exclude or []
-    return sorted(filter(lambda f: not any(re.search(p, f) for p in exclude), files))
+BUILTIN_INCLUDES = [
+    "*.ini",
+    "*.cfg",
+]
+
+
+def read_file_list(fh: IO[bytes], /, *, null_separated: bool) -> Iterator[str]:
+    # lazily read paths from a stream, so huge lists are never held in memory
+    separator = b"\0" if null_separated else b"\n"
+    remainder = b""
+    while chunk := fh.read(65536):
+        *paths, remainder = (remainder + chunk).split(separator)
+        for path in paths:
+            if not null_separated:
+                path = path.removesuffix(b"\r")
+            if path:
+                yield os.fsdecode(path)
+    if remainder:
+        yield os.fsdecode(remainder)
+
+
+def _git_directories(paths: list[str], /) -> list[str | None]:
+    # existing directories holding paths, or the current working directory
+    directories = dict.fromkeys(
+        path if os.path.isdir(path) else os.path.dirname(path) or os.curdir
+        for path in paths
+    )
+    return [d for d in directories if os.path.isdir(d)] or [None]
+
+
+def discover_files(
+    paths: list[str],
+    /,
+    *,
+    include: list[str],
+    exclude: list[str],
+    respect_gitignore: bool,
+    changed_since: str | None = None,
+    files_from: Iterable[str] | None = None,
+) -> Iterator[str]:
+    include_regexp = compile_includes(include)
+    try:
+        exclude_regexp = compile_excludes(exclude)
+    except re.error as exc:
+        raise click.BadParameter(
+            f"invalid regular expression {exc.pattern!r} ({exc})",
+            param_hint="'--exclude' / '--extend-exclude'",
+        ) from None
+
+    files: Iterator[str]
+    if changed_since is None:
+        files = iter_files(
+            paths,
+            include=include_regexp,
+            exclude=exclude_regexp,
+            respect_gitignore=respect_gitignore,
+        )
+    else:
+        try:
+            # run git from the repositories containing paths, rather than
+            # from the current working directory
+            toplevels = dict.fromkeys(
+                git_toplevel(directory) for directory in _git_directories(paths)
+            )
+            changed = [
+                file
+                for toplevel in toplevels
+                for file in git_changed_files(changed_since, cwd=toplevel)
+            ]
+        except subprocess.CalledProcessError as exc:
+            raise click.BadParameter(
+                f"git failed with: {exc.stderr.strip()}",
+                param_hint="'--changed-since'",
+            ) from None
+        except OSError as exc:
+            raise click.BadParameter(
+                f"could not run git ({exc})", param_hint="'--changed-since'"
+            ) from None
+
+        # git already skips untracked files that are ignored,
+        # and tracked files cannot be ignored
+        files = iter_changed_files(
+            paths,
+            changed=changed,
+            include=include_regexp,
+            exclude=exclude_regexp,
+        )
+
+    if files_from is None:
+        return files
+
+    # listed files are streamed as is (in order, without walking directories)
+    listed = (f for f in files_from if not exclude_regexp.search(f))
+    if changed_since is not None:
+        changed_real = {os.path.realpath(f) for f in changed}
+        listed = (f for f in listed if os.path.realpath(f) in changed_real)
+    return chain(files, listed)
 
 
 @app.command()
@@ -116,44 +477,207 @@ def filter_files(files: list[str], /, *, exclude: list[str] | None = None) -> li
     multiple=True,
     help="Extend the list of file names to exclude (as regular expressions). Multi-allowed.",
 )
+@click.option(
+    "--include",
+    multiple=True,
+    default=BUILTIN_INCLUDES,
+    help=(
+        "File name patterns (as globs) to look for when walking directories. Multi-allowed. "
+        f"Default: {BUILTIN_INCLUDES}"
+    ),
+)
+@click.option(
+    "--respect-gitignore",
+    is_flag=True,
+    help="Skip files and directories ignored by .gitignore files when walking directories",
+)
+@click.option(
+    "--files-from",
+    type=click.File("rb"),
+    help="Read additional file paths from a file, one per line ('-' for stdin).",
+)
+@click.option(
+    "-0",
+    "--null",
+    is_flag=True,
+    help="Paths in --files-from are separated by NUL characters instead of newlines",
+)
+@click.option(
+    "--changed-since",
+    metavar="REV",
+    help=(
+        "Only process files that changed since git revision REV, "
+        "or that are untracked (and not ignored)."
+    ),
+)
 @click.option(
     "--sections",
     type=click.Choice(SectionsArg, case_sensitive=True),
     default="allow",
 )
+@click.option(
+    "--backend",
+    type=click.Choice(Backend, case_sensitive=True),
+    default="auto",
+    help=(
+        "Execution backend. "
+        "'auto' uses threads on free-threaded Python builds and processes otherwise."
+    ),
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of workers. Default: depends on the backend and the number of available CPUs.",
+)
+@click.option(
+    "--unordered",
+    is_flag=True,
+    help="Report results in completion order instead of input order",
+)
+@click.option(
+    "--watch",
+    is_flag=True,
+    help="Keep running after all files are processed, and process files again as they change",
+)
+@click.option(
+    "--stats",
+    is_flag=True,
+    help="Print a summary of time spent per phase, slowest files and worker utilization to stderr",
+)
+@click.option(
+    "--profile",
+    type=click.Path(dir_okay=False, writable=True),
+    default=None,
+    help="Write a cProfile file covering all workers to this path",
+)
 def validate(
     files: list[str],
     exclude: list[str],
     extend_exclude: list[str],
+    include: list[str],
+    respect_gitignore: bool,
+    files_from: IO[bytes] | None,
+    null: bool,
+    changed_since: str | None,
     sections: SectionsArg,
+    backend: Backend,
+    jobs: int | None,
+    unordered: bool,
+    watch: bool,
+    stats: bool,
+    profile: str | None,
 ) -> None:
     """
     Validate files as inifix format-compliant.
+
+    Directories are searched recursively for files matching --include patterns.
+    Pass '-' to read data from stdin.
     """
-    files = filter_files(files, exclude=exclude + extend_exclude)
-    run_as_pool(partial(_validate_single_file, sections=sections), files)
+    if _check_stdin_mode(files, files_from):
+        data = click.get_binary_stream("stdin").read()
+        results = _validate_data(data, name="<stdin>", sections=sections)
+        for message in results.messages:
+            click.echo(message)
+        if results.status:
+            raise Exit()
+        return
+
+    run(
+        partial(_validate_single_file, sections=sections, collect_stats=stats),
+        partial(
+            discover_files,
+            files,
+            include=include,
+            exclude=exclude + extend_exclude,
+            respect_gitignore=respect_gitignore,
+            changed_since=changed_since,
+            files_from=_listed_files(files_from, null_separated=null, watch=watch),
+        ),
+        backend=backend,
+        jobs=jobs,
+        ordered=not unordered,
+        watch=watch,
+        stats=stats,
+        profile=profile,
+    )
+
+
+def _listed_files(
+    files_from: IO[bytes] | None, /, *, null_separated: bool, watch: bool
+) -> Iterable[str] | None:
+    if files_from is None:
+        return None
+    if not watch:
+        # streamed, since lists may be very long
+        return read_file_list(files_from, null_separated=null_separated)
+    if files_from is click.get_binary_stream("stdin"):
+        raise click.UsageError("--files-from - (stdin) cannot be combined with --watch")
+    # files are discovered again on changes, so the list must be re-iterable
+    return list(read_file_list(files_from, null_separated=null_separated))
+
+
+def _check_stdin_mode(files: list[str], files_from: IO[bytes] | None) -> bool:
+    if "-" not in files:
+        return False
+    if len(files) > 1 or files_from is not None:
+        raise click.UsageError(
+            "'-' (stdin) cannot be combined with other files or --files-from"
+        )
+    return True
+
+
+class _NamedBytesIO(BytesIO):
+    # inifix uses the name attribute of file handles in error messages
+    def __init__(self, data: bytes, /, *, name: str) -> None:
+        super().__init__(data)
+        self.name = name
+
+
+def _validate_single_file(
+    file: str, sections: SectionsArg, *, collect_stats: bool = False
+) -> TaskResults:
+    if not os.path.isfile(file):
+        return TaskResults(1, [Message(f"Error: could not find {file}")])
 
+    stats = FileStats(file) if collect_stats else None
+    with phase(stats, "read"), open(file, mode="rb") as fh:
+        data = fh.read()
+    results = _validate_data(data, name=file, sections=sections, stats=stats)
+    if stats is None:
+        return results
+    stats.bytes_read = len(data)
+    return replace(results, stats=stats)
 
-def _validate_single_file(file: str, sections: SectionsArg) -> TaskResults:
+
+def _validate_data(
+    data: bytes,
+    /,
+    *,
+    name: str,
+    sections: SectionsArg,
+    stats: FileStats | None = None,
+) -> TaskResults:
     status: Literal[0, 1] = 0
     messages: list[Message] = []
-    if not os.path.isfile(file):
-        status = 1
-        messages.append(Message(f"Error: could not find {file}"))
-        return TaskResults(status, messages)
 
     # mypy struggles to infer sections.name
     sections_name = cast("Literal['allow', 'forbid', 'require']", sections.name)  # pyright: ignore[reportUnnecessaryCast] # ty: ignore[redundant-cast]
     try:
-        _ = inifix.load(file, sections=sections_name)
+        # parsing and validating are done separately so they can be timed
+        with phase(stats, "parse"):
+            conf = inifix.load(_NamedBytesIO(data, name=name), skip_validation=True)
+        with phase(stats, "validate"):
+            inifix.validate_inifile_schema(conf, sections=sections_name)
     except* ValueError as excgroup:
         status = 1
         exc_repr = "\n".join(str(e) for e in excgroup.exceptions)
         messages.append(
-            Message(f"Failed to validate {file}:\n{indent(exc_repr, '  ')}")
+            Message(f"Failed to validate {name}:\n{indent(exc_repr, '  ')}")
         )
     else:
-        messages.append(Message(f"Validated {file}"))
+        messages.append(Message(f"Validated {name}"))
 
     return TaskResults(status, messages)
 
@@ -174,6 +698,39 @@ def _validate_single_file(file: str, sections: SectionsArg) -> TaskResults:
     multiple=True,
     help="Extend the list of file names to exclude (as regular expressions). Multi-allowed.",
 )
+@click.option(
+    "--include",
+    multiple=True,
+    default=BUILTIN_INCLUDES,
+    help=(
+        "File name patterns (as globs) to look for when walking directories. Multi-allowed. "
+        f"Default: {BUILTIN_INCLUDES}"
+    ),
+)
+@click.option(
+    "--respect-gitignore",
+    is_flag=True,
+    help="Skip files and directories ignored by .gitignore files when walking directories",
+)
+@click.option(
+    "--files-from",
+    type=click.File("rb"),
+    help="Read additional file paths from a file, one per line ('-' for stdin).",
+)
+@click.option(
+    "-0",
+    "--null",
+    is_flag=True,
+    help="Paths in --files-from are separated by NUL characters instead of newlines",
+)
+@click.option(
+    "--changed-since",
+    metavar="REV",
+    help=(
+        "Only process files that changed since git revision REV, "
+        "or that are untracked (and not ignored)."
+    ),
+)
 @click.option(
     "--sections",
     type=click.Choice(SectionsArg, case_sensitive=True),
@@ -199,21 +756,81 @@ def _validate_single_file(file: str, sections: SectionsArg) -> TaskResults:
     is_flag=True,
     help="Skip validation step (formatting unvalidated data may lead to undefined behaviour)",
 )
+@click.option(
+    "--backend",
+    type=click.Choice(Backend, case_sensitive=True),
+    default="auto",
+    help=(
+        "Execution backend. "
+        "'auto' uses threads on free-threaded Python builds and processes otherwise."
+    ),
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of workers. Default: depends on the backend and the number of available CPUs.",
+)
+@click.option(
+    "--unordered",
+    is_flag=True,
+    help="Report results in completion order instead of input order",
+)
+@click.option(
+    "--watch",
+    is_flag=True,
+    help="Keep running after all files are processed, and process files again as they change",
+)
+@click.option(
+    "--stats",
+    is_flag=True,
+    help="Print a summary of time spent per phase, slowest files and worker utilization to stderr",
+)
+@click.option(
+    "--profile",
+    type=click.Path(dir_okay=False, writable=True),
+    default=None,
+    help="Write a cProfile file covering all workers to this path",
+)
 def format(
     files: list[str],
     exclude: list[str],
     extend_exclude: list[str],
+    include: list[str],
+    respect_gitignore: bool,
+    files_from: IO[bytes] | None,
+    null: bool,
+    changed_since: str | None,
     sections: SectionsArg,
     diff: bool,
     no_color: bool,
     report_noop: bool,
     skip_validation: bool,
+    backend: Backend,
+    jobs: int | None,
+    unordered: bool,
+    watch: bool,
+    stats: bool,
+    profile: str | None,
 ) -> None:
     """
     Format files.
+
+    Directories are searched recursively for files matching --include patterns.
+    Pass '-' to read data from stdin and write formatted data to stdout.
     """
-    files = filter_files(files, exclude=exclude + extend_exclude)
-    run_as_pool(
+    if _check_stdin_mode(files, files_from):
+        _format_stdin(
+            sections=sections,
+            diff=diff,
+            no_color=no_color,
+            report_noop=report_noop,
+            skip_validation=skip_validation,
+        )
+        return
+
+    run(
         partial(
             _format_single_file,
             sections=sections,
@@ -221,8 +838,23 @@ def format(
             no_color=no_color,
             report_noop=report_noop,
             skip_validation=skip_validation,
+            collect_stats=stats,
         ),
-        files,
+        partial(
+            discover_files,
+            files,
+            include=include,
+            exclude=exclude + extend_exclude,
+            respect_gitignore=respect_gitignore,
+            changed_since=changed_since,
+            files_from=_listed_files(files_from, null_separated=null, watch=watch),
+        ),
+        backend=backend,
+        jobs=jobs,
+        ordered=not unordered,
+        watch=watch,
+        stats=stats,
+        profile=profile,
     )
 
 
@@ -234,43 +866,138 @@ def _format_single_file(
     no_color: bool,
     report_noop: bool,
     skip_validation: bool,
+    collect_stats: bool = False,
 ) -> TaskResults:
-    status: Literal[0, 1] = 0
-    messages: list[Message] = []
-
     if not os.path.isfile(file):
-        status = 1
-        messages.append(Message(f"Error: could not find {file}"))
+        return TaskResults(1, [Message(f"Error: could not find {file}")])
+
+    stats = FileStats(file) if collect_stats else None
+    results = _format_file(
+        file,
+        sections=sections,
+        diff=diff,
+        no_color=no_color,
+        report_noop=report_noop,
+        skip_validation=skip_validation,
+        stats=stats,
+    )
+    if stats is None:
+        return results
+    return replace(results, stats=stats)
+
+
+def _format_file(
+    file: str,
+    *,
+    sections: SectionsArg,
+    diff: bool,
+    no_color: bool,
+    report_noop: bool,
+    skip_validation: bool,
+    stats: FileStats | None,
+) -> TaskResults:
+    with phase(stats, "read"), open(file, mode="rb") as fh:
+        data = fh.read()
+    if stats is not None:
+        stats.bytes_read = len(data)
+
+    results, fmted_data = _format_data(
+        data,
+        name=file,
+        sections=sections,
+        diff=diff,
+        no_color=no_color,
+        report_noop=report_noop,
+        skip_validation=skip_validation,
+        stats=stats,
+    )
+    if fmted_data is None:
+        return results
+
+    status: Literal[0, 1] = 1
+    messages = [*results.messages, Message(f"Fixing {file}")]
+    if not os.access(file, os.W_OK):
+        messages.append(
+            Message(f"Error: could not write to {file} (permission denied)")
+        )
         return TaskResults(status, messages)
 
+    from tempfile import TemporaryDirectory
+
+    with (
+        phase(stats, "write"),
+        TemporaryDirectory(dir=os.path.dirname(file)) as tmpdir,
+    ):
+        tmpfile = os.path.join(tmpdir, "ini")
+        with open(tmpfile, "wb") as bfh:
+            written = bfh.write(fmted_data.encode("utf-8"))
+        if stats is not None:
+            stats.bytes_written = written
+
+        # this may still raise an error in the unlikely case of a race condition
+        # (if permissions are changed between the look and the leap), but we
+        # won't try to catch it unless it happens in production, because it is
+        # difficult to test systematically.
+        os.replace(tmpfile, file)
+
+    return TaskResults(status, messages)
+
+
+def _format_data(
+    data: bytes,
+    /,
+    *,
+    name: str,
+    sections: SectionsArg,
+    diff: bool,
+    no_color: bool,
+    report_noop: bool,
+    skip_validation: bool,
+    stats: FileStats | None = None,
+) -> tuple[TaskResults, str | None]:
+    """
+    Format data in memory.
+
+    Return results, along with formatted data if it needs to be written back,
+    or None if data is invalid, already formatted, or in diff mode.
+    """
+    status: Literal[0, 1] = 0
+    messages: list[Message] = []
+
     validate_baseline: AnyConfig = {}
     if not skip_validation:
         # mypy struggles to infer sections.name
         sections_name = cast("Literal['allow', 'forbid', 'require']", sections.name)  # pyright: ignore[reportUnnecessaryCast] # ty: ignore[redundant-cast]
         try:
-            validate_baseline = inifix.load(file, sections=sections_name)
+            # parsing and validating are done separately so they can be timed
+            with phase(stats, "parse"):
+                validate_baseline = inifix.load(
+                    _NamedBytesIO(data, name=name), skip_validation=True
+                )
+            with phase(stats, "validate"):
+                inifix.validate_inifile_schema(
+                    validate_baseline, sections=sections_name
+                )
         except* ValueError as excgroup:
             status = 1
             exc_repr = "\n".join(str(e) for e in excgroup.exceptions)
             messages.append(
-                Message(f"Failed to format {file}:\n{indent(exc_repr, '  ')}")
+                Message(f"Failed to format {name}:\n{indent(exc_repr, '  ')}")
             )
         if status != 0:
-            return TaskResults(status, messages)
-
-    with open(file, mode="rb") as fh:
-        data = fh.read().decode("utf-8")
+            return TaskResults(status, messages), None
 
     # make sure newlines are always decoded as \n, even on windows
-    data = data.replace("\r\n", "\n")
+    str_data = data.decode("utf-8").replace("\r\n", "\n")
 
-    fmted_data = inifix.format_string(data)
+    with phase(stats, "format"):
+        fmted_data = inifix.format_string(str_data)
 
-    if fmted_data == data:
+    if fmted_data == str_data:
         if report_noop:
             # printing to stderr so that we can pipe into cdiff in --diff mode
-            messages.append(Message(f"{file} is already formatted"))
-        return TaskResults(status, messages)
+            messages.append(Message(f"{name} is already formatted"))
+        return TaskResults(status, messages), None
 
     if diff:
         if sys.version_info >= (3, 15) and not no_color:
@@ -281,46 +1008,323 @@ def _format_single_file(
         diff_ = "\n".join(
             line.removesuffix("\n")
             for line in unified_diff(
-                data.splitlines(),
+                str_data.splitlines(),
                 fmted_data.splitlines(),
-                fromfile=file,
+                fromfile=name,
                 **diff_kwargs,  # pyright: ignore[reportArgumentType] # pyrefly: ignore[bad-argument-type]
             )
         )
         assert diff_
         status = 1
         messages.append(Message(diff_))
-    else:
+        return TaskResults(status, messages), None
+
+    with phase(stats, "validate"):
+        roundtrip_ok = skip_validation or inifix.loads(fmted_data) == validate_baseline
+    if not roundtrip_ok:  # pragma: no cover
         status = 1
-        messages.append(Message(f"Fixing {file}"))
-        if not os.access(file, os.W_OK):
-            messages.append(
-                Message(f"Error: could not write to {file} (permission denied)")
+        messages.append(
+            Message(
+                f"Error: failed to format {name}: "
+                "formatted data compares unequal to unformatted data",
             )
-            return TaskResults(status, messages)
-
-        from tempfile import TemporaryDirectory
-
-        with TemporaryDirectory(dir=os.path.dirname(file)) as tmpdir:
-            tmpfile = os.path.join(tmpdir, "ini")
-            with open(tmpfile, "wb") as bfh:
-                _ = bfh.write(fmted_data.encode("utf-8"))
-
-            if (
-                not skip_validation and inifix.load(tmpfile) != validate_baseline
-            ):  # pragma: no cover
-                messages.append(
-                    Message(
-                        f"Error: failed to format {file}: "
-                        "formatted data compares unequal to unformatted data",
-                    )
-                )
-                return TaskResults(status, messages)
+        )
+        return TaskResults(status, messages), None
 
-            # this may still raise an error in the unlikely case of a race condition
-            # (if permissions are changed between the look and the leap), but we
-            # won't try to catch it unless it happens in production, because it is
-            # difficult to test systematically.
-            os.replace(tmpfile, file)
+    return TaskResults(status, messages), fmted_data
 
-    return TaskResults(status, messages)
+
+def _format_stdin(
+    *,
+    sections: SectionsArg,
+    diff: bool,
+    no_color: bool,
+    report_noop: bool,
+    skip_validation: bool,
+) -> None:
+    data = click.get_binary_stream("stdin").read()
+    results, fmted_data = _format_data(
+        data,
+        name="<stdin>",
+        sections=sections,
+        diff=diff,
+        no_color=no_color,
+        report_noop=report_noop,
+        skip_validation=skip_validation,
+    )
+    # in diff mode, stdout is reserved for diffs, otherwise for formatted data
+    for message in results.messages:
+        click.echo(message, err=not diff)
+    if results.status == 0 and not diff:
+        stdout = click.get_binary_stream("stdout")
+        stdout.write(data if fmted_data is None else fmted_data.encode("utf-8"))
+        stdout.flush()
+    if results.status:
+        raise Exit()
+
+
+@app.command()
+@click.argument("reference", type=click.Path(exists=True, dir_okay=False))
+@click.argument("files", nargs=-1, required=True, type=click.Path())
+@click.option(
+    "--name-only",
+    is_flag=True,
+    help="Only print the names of files that differ from the reference",
+)
+def diff(reference: str, files: list[str], name_only: bool) -> None:
+    """
+    Compare files to a reference file, parameter by parameter.
+
+    Directories are searched recursively for files matching default patterns.
+    The exit status is 1 if any file differs from the reference, or can't be read.
+    """
+    ref, messages = _load_frozen(reference)
+    if ref is None:
+        for message in messages:
+            click.echo(message, err=True)
+        raise Exit()
+
+    status = 0
+    for file in discover_files(
+        files,
+        include=BUILTIN_INCLUDES,
+        exclude=BUILTIN_EXCLUDES,
+        respect_gitignore=False,
+    ):
+        # identical sections of frozen configs are shared, and skipped
+        conf, messages = _load_frozen(file)
+        if conf is None:
+            for message in messages:
+                click.echo(message, err=True)
+            status = 1
+        elif differences := inifix.diff(ref, conf):
+            status = 1
+            if name_only:
+                click.echo(file)
+            else:
+                click.echo(f"--- {reference}\n+++ {file}\n{differences.format()}")
+
+    if status:
+        raise Exit()
+
+
+def _load_frozen(file: str, /) -> "tuple[FrozenConfig | None, list[Message]]":
+    if not os.path.isfile(file):
+        return None, [Message(f"Error: could not find {file}")]
+
+    conf: FrozenConfig | None = None
+    messages: list[Message] = []
+    try:
+        conf = inifix.load(file, frozen=True)
+    except* ValueError as excgroup:
+        exc_repr = "\n".join(str(e) for e in excgroup.exceptions)
+        messages.append(Message(f"Failed to load {file}:\n{indent(exc_repr, '  ')}"))
+    return conf, messages
+
+
+@app.command()
+@click.argument("database", type=click.Path(dir_okay=False))
+@click.argument("paths", nargs=-1, type=click.Path())
+@click.option(
+    "--query",
+    "-q",
+    "conditions",
+    multiple=True,
+    metavar="[SECTION]KEY=VALUES",
+    help=(
+        "Print indexed files where KEY holds exactly VALUES (in SECTION, if specified, "
+        "or in any section otherwise). Multi-allowed: files must match all conditions."
+    ),
+)
+@click.option(
+    "--no-prune",
+    is_flag=True,
+    help="Keep previously indexed files that are not found in PATHS",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of workers. Default: depends on the number of available CPUs.",
+)
+def index(
+    database: str,
+    paths: list[str],
+    conditions: list[str],
+    no_prune: bool,
+    jobs: int | None,
+) -> None:
+    """
+    Index parameters from files into a SQLite DATABASE, and query it.
+
+    Directories in PATHS are searched recursively for files matching default
+    patterns. Only files that changed since they were last indexed are parsed.
+    The exit status is 1 if any file couldn't be parsed, or if no indexed file
+    matches all conditions.
+    """
+    if not paths and not conditions:
+        raise click.UsageError("Expected PATHS to index, --query conditions, or both")
+
+    query = _parse_conditions(conditions)
+    status = 0
+    with inifix.Index(database) as idx:
+        if paths:
+            files = discover_files(
+                paths,
+                include=BUILTIN_INCLUDES,
+                exclude=BUILTIN_EXCLUDES,
+                respect_gitignore=False,
+            )
+            backend = resolve_backend(Backend.auto, jobs=jobs, file_count=None)
+            with ExitStack() as stack:
+                executor: Executor | None
+                match backend:
+                    case Backend.serial:
+                        executor = None
+                    case Backend.threads:
+                        executor = stack.enter_context(
+                            ThreadPoolExecutor(jobs or get_default_jobs(backend))
+                        )
+                    case Backend.processes:
+                        executor = stack.enter_context(
+                            ProcessPoolExecutor(jobs or get_default_jobs(backend))
+                        )
+                    case Backend.auto:
+                        raise RuntimeError
+                    case _ as unreachable:
+                        assert_never(unreachable)
+                update = idx.update(files, executor=executor, prune=not no_prune)
+
+            for file, error in update.errors.items():
+                click.echo(f"Failed to index {file}:\n{indent(error, '  ')}", err=True)
+                status = 1
+            click.echo(
+                f"Indexed {len(idx)} files ({update.added} added, "
+                f"{update.updated} updated, {update.unchanged} unchanged, "
+                f"{update.removed} removed)",
+                err=True,
+            )
+
+        if conditions:
+            matches = idx.query(query)
+            for file in matches:
+                click.echo(file)
+            if not matches:
+                status = 1
+
+    if status:
+        raise Exit()
+
+
+def _parse_conditions(conditions: Iterable[str], /) -> "dict[str, Any]":
+    query: dict[str, Any] = {}
+    for condition in conditions:
+        section: str | None = None
+        text = condition
+        if text.startswith("["):
+            section, sep, text = text[1:].partition("]")
+            if not sep:
+                text = ""
+        key, sep, values = text.partition("=")
+        if not sep or not key.strip() or not values.strip():
+            raise click.BadParameter(
+                f"expected [SECTION]KEY=VALUES, got {condition!r}",
+                param_hint="'--query'",
+            )
+        # values are parsed exactly as they would be in a file
+        try:
+            parsed = inifix.loads(f"{key.strip()} {values}", sections="forbid")
+        except* ValueError as excgroup:
+            raise click.BadParameter(
+                "; ".join(str(e) for e in excgroup.exceptions), param_hint="'--query'"
+            ) from None
+        if section is None:
+            query.update(parsed)
+        else:
+            query.setdefault(section, {}).update(parsed)
+    return query
+
+
+@app.command()
+@click.option(
+    "--stdio",
+    is_flag=True,
+    help="Exchange messages over stdin and stdout instead of a Unix socket",
+)
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(),
+    default=None,
+    help=(
+        "Path to the Unix socket to listen on. "
+        "Default: $INIFIX_SOCKET, or a per-user socket in $XDG_RUNTIME_DIR or /tmp"
+    ),
+)
+def serve(stdio: bool, socket_path: str | None) -> None:
+    """
+    Answer validate, format and load requests from a long-running process.
+
+    Requests are JSON-RPC 2.0 messages, one per line. Results for files that
+    didn't change since they were last processed are cached.
+    """
+    from inifix_cli._client import default_socket_path
+    from inifix_cli._server import Server, serve_stdio
+
+    server = Server()
+    if stdio:
+        serve_stdio(server)
+        return
+
+    if sys.platform == "win32":
+        raise click.UsageError(
+            "Unix sockets are not supported on this platform. Use --stdio instead."
+        )
+
+    from inifix_cli._server import serve_socket
+
+    path = socket_path or default_socket_path()
+    try:
+        serve_socket(
+            server,
+            path,
+            ready=lambda _: click.echo(f"Listening on {path}", err=True),
+        )
+    except KeyboardInterrupt:
+        pass
+    except OSError as exc:
+        raise click.ClickException(str(exc)) from None
+
+
+@app.command(context_settings={"ignore_unknown_options": True})
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(),
+    default=None,
+    help="Path to the server's Unix socket. Default: same as inifix serve",
+)
+@click.argument("command", type=click.Choice(["validate", "format"]))
+@click.argument("args", nargs=-1, type=click.UNPROCESSED)
+def client(socket_path: str | None, command: str, args: tuple[str, ...]) -> None:
+    """
+    Forward a command to a running server (see inifix serve).
+
+    Commands run in-process if no server is reachable, or if they
+    use options that only make sense locally (e.g., directories or --watch).
+    """
+    from inifix_cli._client import ServerError, default_socket_path, forward
+
+    cmd = validate if command == "validate" else format
+    with cmd.make_context(
+        command, list(args), parent=click.get_current_context()
+    ) as ctx:
+        try:
+            status = forward(socket_path or default_socket_path(), command, ctx.params)
+        except ServerError as exc:
+            raise click.ClickException(str(exc)) from None
+        if status is None:
+            cmd.invoke(ctx)
+        elif status:
+            raise Exit()
@@ -0,0 +1,173 @@
+"""
+A thin client forwarding validate and format commands to a running server.
+"""
+
+__all__ = [
+    "ServerError",
+    "default_socket_path",
+    "forward",
+    "request",
+]
+
+import json
+import os
+import socket
+from collections.abc import Iterable
+from threading import Thread
+from typing import Any
+
+
+class ServerError(Exception):
+    """The server answered with an error, or stopped answering."""
+
+
+def default_socket_path() -> str:
+    if (path := os.environ.get("INIFIX_SOCKET")) is not None:
+        return path
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or "/tmp"
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    return os.path.join(runtime_dir, f"inifix-{uid}.sock")
+
+
+def _connect(path: str, /, *, timeout: float) -> socket.socket | None:
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(path)
+    except OSError:
+        sock.close()
+        return None
+    # only the connection is subject to a short timeout,
+    # processing files may take arbitrarily long
+    sock.settimeout(None)
+    return sock
+
+
+def request(
+    path: str,
+    /,
+    calls: Iterable[tuple[str, dict[str, Any]]],
+    *,
+    timeout: float = 0.1,
+) -> list[Any] | None:
+    """
+    Send method calls to the server listening on path, and return results
+    in the same order, or None if no server is reachable.
+
+    Requests are pipelined over a single connection.
+
+    Raises
+    ------
+    ServerError: if the server answers any request with an error, or doesn't
+      answer all of them
+    """
+    if (sock := _connect(path, timeout=timeout)) is None:
+        return None
+
+    sent = 0
+    send_error: OSError | None = None
+
+    def send() -> None:
+        nonlocal sent, send_error
+        try:
+            for request_id, (method, params) in enumerate(calls, start=1):
+                message = {
+                    "jsonrpc": "2.0",
+                    "id": request_id,
+                    "method": method,
+                    "params": params,
+                }
+                wstream.write(json.dumps(message).encode("utf-8") + b"\n")
+                sent = request_id
+            wstream.flush()
+            sock.shutdown(socket.SHUT_WR)
+        except OSError as exc:
+            # e.g., the server closed the connection
+            send_error = exc
+
+    with sock, sock.makefile("rb") as rstream, sock.makefile("wb") as wstream:
+        # send requests from a separate thread, so that neither end can be
+        # blocked writing while the other one is waiting to be read from
+        sender = Thread(target=send)
+        sender.start()
+        try:
+            responses = [json.loads(line) for line in rstream]
+        except OSError as exc:
+            raise ServerError(f"Lost connection to server: {exc}") from None
+        finally:
+            sender.join()
+    if send_error is not None:
+        raise ServerError(f"Lost connection to server: {send_error}")
+
+    results: dict[int, Any] = {}
+    for response in responses:
+        if "error" in response:
+            raise ServerError(f"Server error: {response['error']['message']}")
+        request_id = response.get("id")
+        if not isinstance(request_id, int) or not 1 <= request_id <= sent:
+            raise ServerError(f"Unexpected response from server: {response!r}")
+        results[request_id] = response["result"]
+    if missing := sent - len(results):
+        raise ServerError(
+            f"No response to {missing} request(s), the server may have stopped"
+        )
+    return [results[request_id] for request_id in range(1, sent + 1)]
+
+
+# command parameters that are forwarded to the server as is
+_FORWARDED_PARAMS: dict[str, tuple[str, ...]] = {
+    "validate": ("sections",),
+    "format": ("sections", "diff", "no_color", "report_noop", "skip_validation"),
+}
+
+
+def forward(
+    path: str,
+    /,
+    command: str,
+    params: dict[str, Any],
+    *,
+    timeout: float = 0.1,
+) -> int | None:
+    """
+    Run a validate or format command through the server listening on path,
+    and return its exit status, or None if the command cannot be forwarded.
+
+    Only explicit lists of files can be forwarded (without --stats or --profile,
+    which measure local runs), and they are reported by
+    absolute path, since the server doesn't share the client's working directory.
+    """
+    if (
+        params["files_from"] is not None
+        or params["changed_since"] is not None
+        or params["watch"]
+        or params["stats"]
+        or params["profile"] is not None
+        or any(file == "-" or os.path.isdir(file) for file in params["files"])
+    ):
+        return None
+
+    # this import is deferred since the _discovery module isn't lightweight
+    from inifix_cli._discovery import compile_excludes
+
+    exclude = compile_excludes([*params["exclude"], *params["extend_exclude"]])
+    files = sorted(f for f in params["files"] if not exclude.search(f))
+    options = {name: params[name] for name in _FORWARDED_PARAMS[command]}
+    options["sections"] = options["sections"].name
+
+    results = request(
+        path,
+        ((command, {"path": os.path.abspath(f), **options}) for f in files),
+        timeout=timeout,
+    )
+    if results is None:
+        return None
+
+    status = 0
+    for result in results:
+        for message in result["messages"]:
+            print(message, flush=True)
+        status |= result["status"]
+    return status
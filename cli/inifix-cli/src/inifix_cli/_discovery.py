@@ -0,0 +1,352 @@
+__all__ = [
+    "GitIgnore",
+    "Matcher",
+    "compile_excludes",
+    "compile_includes",
+    "git_changed_files",
+    "git_toplevel",
+    "iter_changed_files",
+    "iter_files",
+    "walk",
+]
+
+import os
+import re
+import subprocess
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from fnmatch import translate
+from typing import Protocol
+
+# an expression that cannot match anything
+_NEVER = re.compile(r"(?!)")
+
+
+class Matcher(Protocol):
+    def search(self, string: str, /) -> object: ...
+
+
+@dataclass(frozen=True, slots=True)
+class _AnyPattern:
+    patterns: tuple[re.Pattern[str], ...]
+
+    def search(self, string: str, /) -> re.Match[str] | None:
+        for pattern in self.patterns:
+            if (match := pattern.search(string)) is not None:
+                return match
+        return None
+
+
+def compile_excludes(exclude: Iterable[str], /) -> Matcher:
+    # raises re.error if any pattern is invalid
+    compiled = [re.compile(p) for p in exclude]
+    if not compiled:
+        return _NEVER
+    if len(compiled) == 1:
+        return compiled[0]
+    # merge patterns into a single regular expression, so that each path is
+    # scanned once, regardless of the number of patterns. This is only safe
+    # for patterns without groups (which backreferences refer to by number)
+    # and without inline global flags
+    if all(p.groups == 0 and p.flags == re.UNICODE for p in compiled):
+        return re.compile("|".join(f"(?:{p.pattern})" for p in compiled))
+    return _AnyPattern(tuple(compiled))
+
+
+def compile_includes(include: Iterable[str], /) -> re.Pattern[str]:
+    patterns = [translate(p) for p in include]
+    if not patterns:
+        return _NEVER
+    return re.compile("|".join(patterns))
+
+
+def _translate_gitignore_glob(pattern: str) -> str:
+    i = 0
+    n = len(pattern)
+    res: list[str] = []
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            res.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == n:
+            res.append("/.*")
+            i += 3
+        elif c == "*":
+            res.append("[^/]*")
+            i += 1
+        elif c == "?":
+            res.append("[^/]")
+            i += 1
+        elif c == "[" and (j := pattern.find("]", i + 2)) != -1:
+            body = pattern[i + 1 : j]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            res.append(f"[{body}]")
+            i = j + 1
+        elif c == "\\" and i + 1 < n:
+            res.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            res.append(re.escape(c))
+            i += 1
+    return "".join(res)
+
+
+@dataclass(frozen=True, slots=True)
+class _GitIgnoreRule:
+    regexp: re.Pattern[str]
+    negated: bool
+    directory_only: bool
+
+
+@dataclass(frozen=True, slots=True)
+class GitIgnore:
+    """
+    A matcher for the rules of a single .gitignore file.
+
+    This supports the commonly used subset of gitignore syntax: comments,
+    negation, anchored and directory-only patterns, and '*', '?', '**' and
+    character class wildcards.
+    """
+
+    base: str
+    rules: tuple[_GitIgnoreRule, ...]
+
+    @classmethod
+    def from_lines(cls, base: str, lines: Iterable[str]) -> "GitIgnore":
+        rules: list[_GitIgnoreRule] = []
+        for raw_line in lines:
+            line = raw_line.rstrip("\n")
+            if not line.endswith("\\ "):
+                line = line.rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negated = line.startswith("!")
+            if negated:
+                line = line[1:]
+            directory_only = line.endswith("/")
+            line = line.rstrip("/")
+            if not line:
+                continue
+            # patterns with a slash anywhere but at the end are relative
+            # to the .gitignore file, others can match at any depth
+            if "/" in line:
+                regexp = _translate_gitignore_glob(line.lstrip("/"))
+            else:
+                regexp = "(?:.*/)?" + _translate_gitignore_glob(line)
+            rules.append(_GitIgnoreRule(re.compile(regexp), negated, directory_only))
+        return cls(base, tuple(rules))
+
+    @classmethod
+    def from_file(cls, file: str) -> "GitIgnore":
+        with open(file, encoding="utf-8", errors="replace") as fh:
+            return cls.from_lines(os.path.dirname(file), fh)
+
+    def match(self, path: str, *, is_dir: bool) -> bool | None:
+        """
+        Return True if path is ignored, False if it is explicitly re-included,
+        and None if no rule applies to it.
+        """
+        rel = os.path.relpath(path, self.base).replace(os.sep, "/")
+        if rel.startswith("../"):
+            return None
+        for rule in reversed(self.rules):
+            if rule.directory_only and not is_dir:
+                continue
+            if rule.regexp.fullmatch(rel):
+                return not rule.negated
+        return None
+
+
+def _is_ignored(path: str, *, is_dir: bool, ignores: list[GitIgnore]) -> bool:
+    # rules from deeper .gitignore files take precedence
+    for ignore in reversed(ignores):
+        if (res := ignore.match(path, is_dir=is_dir)) is not None:
+            return res
+    return False
+
+
+def _collect_parent_ignores(directory: str, /) -> list[GitIgnore]:
+    # collect rules from parent directories, up to the repository root
+    parents: list[str] = []
+    parent = directory
+    while not os.path.exists(os.path.join(parent, ".git")):
+        if (grand_parent := os.path.dirname(parent)) == parent:
+            # not within a git repository
+            return []
+        parent = grand_parent
+        parents.append(parent)
+
+    ignores: list[GitIgnore] = []
+    for parent in reversed(parents):
+        if os.path.isfile(gitignore := os.path.join(parent, ".gitignore")):
+            ignores.append(GitIgnore.from_file(gitignore))
+    return ignores
+
+
+def walk(
+    root: str,
+    /,
+    *,
+    include: re.Pattern[str],
+    exclude: Matcher,
+    respect_gitignore: bool = False,
+) -> Iterator[str]:
+    """
+    Lazily yield files under root with names matching include patterns,
+    in a deterministic order.
+    """
+    root_abs = os.path.abspath(root)
+    ignores = _collect_parent_ignores(root_abs) if respect_gitignore else []
+
+    stack: list[tuple[str, str, list[GitIgnore]]] = [(root, root_abs, ignores)]
+    while stack:
+        directory, directory_abs, ignores = stack.pop()
+        if respect_gitignore and os.path.isfile(
+            gitignore := os.path.join(directory_abs, ".gitignore")
+        ):
+            ignores = [*ignores, GitIgnore.from_file(gitignore)]
+
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            continue
+
+        subdirectories: list[tuple[str, str, list[GitIgnore]]] = []
+        for entry in entries:
+            entry_abs = os.path.join(directory_abs, entry.name)
+            if entry.is_dir(follow_symlinks=False):
+                if (
+                    entry.name == ".git"
+                    or exclude.search(entry.path + "/")
+                    or (
+                        respect_gitignore
+                        and _is_ignored(entry_abs, is_dir=True, ignores=ignores)
+                    )
+                ):
+                    continue
+                subdirectories.append((entry.path, entry_abs, ignores))
+            elif (
+                include.match(entry.name)
+                and entry.is_file()
+                and not exclude.search(entry.path)
+                and not (
+                    respect_gitignore
+                    and _is_ignored(entry_abs, is_dir=False, ignores=ignores)
+                )
+            ):
+                yield entry.path
+
+        # depth-first traversal, visiting subdirectories in alphabetical order
+        stack.extend(reversed(subdirectories))
+
+
+def iter_files(
+    paths: Iterable[str],
+    /,
+    *,
+    include: re.Pattern[str],
+    exclude: Matcher,
+    respect_gitignore: bool = False,
+) -> Iterator[str]:
+    """
+    Yield explicitly listed files (in alphabetical order) and then
+    files discovered in listed directories, skipping excluded paths.
+
+    Explicit files are not matched against include patterns, and are
+    yielded even if they do not exist, so they can be reported as missing.
+    """
+    files: list[str] = []
+    directories: list[str] = []
+    for path in paths:
+        if os.path.isdir(path):
+            directories.append(path)
+        elif not exclude.search(path):
+            files.append(path)
+
+    yield from sorted(files)
+    for directory in sorted(directories):
+        yield from walk(
+            directory,
+            include=include,
+            exclude=exclude,
+            respect_gitignore=respect_gitignore,
+        )
+
+
+def _run_git(*args: str, cwd: str | None) -> str:
+    # raises subprocess.CalledProcessError, or OSError if git isn't available
+    return subprocess.run(
+        ["git", *args],
+        cwd=cwd,
+        capture_output=True,
+        check=True,
+        encoding="utf-8",
+    ).stdout
+
+
+def git_toplevel(cwd: str | None = None, /) -> str:
+    """Return the root of the git repository containing cwd."""
+    return _run_git("rev-parse", "--show-toplevel", cwd=cwd).strip()
+
+
+def git_changed_files(rev: str, /, *, cwd: str | None = None) -> list[str]:
+    """
+    Return absolute paths to files that changed since rev, according to git,
+    including untracked files that are not ignored. Deleted files are omitted.
+    """
+    toplevel = git_toplevel(cwd)
+    # compare the working tree to rev, so that staged and unstaged
+    # changes are both accounted for
+    changed = _run_git(
+        "diff", "--name-only", "-z", "--diff-filter=d", rev, "--", cwd=toplevel
+    )
+    untracked = _run_git(
+        "ls-files", "--others", "--exclude-standard", "-z", cwd=toplevel
+    )
+    names = {name for name in (changed + untracked).split("\0") if name}
+    return sorted(os.path.join(toplevel, name) for name in names)
+
+
+def _walk_order_key(relpath: str, /) -> tuple[tuple[int, str], ...]:
+    # sort paths in the same order as walk() would yield them:
+    # a directory's own files first, then its subdirectories
+    *parents, name = relpath.split(os.sep)
+    return (*((1, parent) for parent in parents), (0, name))
+
+
+def iter_changed_files(
+    paths: Iterable[str],
+    /,
+    *,
+    changed: Iterable[str],
+    include: re.Pattern[str],
+    exclude: Matcher,
+) -> Iterator[str]:
+    """
+    Same as iter_files, but only yield files from a known set of
+    changed files (as absolute paths), without walking directories.
+    """
+    changed_real = {os.path.realpath(file): file for file in changed}
+    files: list[str] = []
+    directories: list[tuple[str, str]] = []
+    for path in paths:
+        if os.path.isdir(path):
+            directories.append((path, os.path.realpath(path)))
+        elif os.path.realpath(path) in changed_real and not exclude.search(path):
+            files.append(path)
+
+    yield from sorted(files)
+    for directory, directory_real in sorted(directories):
+        prefix = os.path.join(directory_real, "")
+        relpaths = [
+            os.path.relpath(real, directory_real)
+            for real, file in changed_real.items()
+            if real.startswith(prefix) and include.match(os.path.basename(file))
+        ]
+        for relpath in sorted(relpaths, key=_walk_order_key):
+            path = os.path.join(directory, relpath)
+            if not exclude.search(path):
+                yield path
@@ -0,0 +1,366 @@
+"""
+A long-running server answering validate, format and load requests.
+
+Requests and responses are JSON-RPC 2.0 messages, one per line,
+exchanged over stdio or a Unix socket.
+"""
+
+__all__ = [
+    "Server",
+    "serve_socket",
+    "serve_stdio",
+]
+
+import json
+import os
+import socketserver
+import sys
+from collections import OrderedDict
+from collections.abc import Callable
+from threading import Lock
+from typing import IO, Any, ClassVar, Literal, cast, final
+
+import inifix
+from inifix_cli import (
+    SectionsArg,
+    TaskResults,
+    _format_data,
+    _format_single_file,
+    _validate_data,
+    _validate_single_file,
+)
+from inifix_cli._watch import _stat_key
+
+JSON = Any
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+
+class RequestError(Exception):
+    def __init__(self, code: int, message: str) -> None:
+        super().__init__(message)
+        self.code = code
+
+
+# JSON names of parameter types, for error messages
+_TYPE_NAMES: dict[type, str] = {str: "a string", bool: "a boolean"}
+
+
+def _error(request_id: JSON, code: int, message: str) -> JSON:
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "error": {"code": code, "message": message},
+    }
+
+
+@final
+class Server:
+    """
+    Dispatch requests, caching results for files that didn't change
+    since they were last processed.
+    """
+
+    def __init__(self, *, cache_size: int = 4096) -> None:
+        self.cache_size = cache_size
+        self._cache: OrderedDict[tuple[Any, ...], Any] = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _cached(
+        self, path: str, key: tuple[Any, ...], compute: Callable[[], Any]
+    ) -> Any:
+        before = _stat_key(path)
+        cache_key = (path, before, *key)
+        if before is not None:
+            with self._lock:
+                if cache_key in self._cache:
+                    self._cache.move_to_end(cache_key)
+                    self.hits += 1
+                    return self._cache[cache_key]
+
+        result = compute()
+        with self._lock:
+            self.misses += 1
+            # results are only reusable if computing them didn't modify the file
+            if before is not None and _stat_key(path) == before:
+                self._cache[cache_key] = result
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return result
+
+    def handle(self, request: JSON) -> JSON:
+        """Return a response to a single request, or None for notifications."""
+        request_id = request.get("id") if isinstance(request, dict) else None
+        try:
+            if (
+                not isinstance(request, dict)
+                or request.get("jsonrpc") != "2.0"
+                or not isinstance(method := request.get("method"), str)
+            ):
+                raise RequestError(INVALID_REQUEST, "Invalid Request")
+            params = request.get("params", {})
+            if not isinstance(params, dict):
+                raise RequestError(INVALID_PARAMS, "params must be an object")
+            result = self.dispatch(method, params)
+        except RequestError as exc:
+            return _error(request_id, exc.code, str(exc))
+        except Exception as exc:  # noqa: BLE001
+            # a single failing request must not bring the server down
+            return _error(request_id, INTERNAL_ERROR, f"{type(exc).__name__}: {exc}")
+        if "id" not in request:
+            return None
+        return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+    def dispatch(self, method: str, params: dict[str, Any]) -> JSON:
+        match method:
+            case "validate":
+                return self.validate(**self._check_params(params, method))
+            case "format":
+                return self.format(**self._check_params(params, method))
+            case "load":
+                return self.load(**self._check_params(params, method))
+            case "stats":
+                return {"hits": self.hits, "misses": self.misses}
+            case _:
+                raise RequestError(METHOD_NOT_FOUND, f"Unknown method {method!r}")
+
+    # parameters of each method, with their types
+    _PARAMS: ClassVar[dict[str, dict[str, type]]] = {
+        "validate": {"path": str, "text": str, "name": str, "sections": str},
+        "format": {
+            "path": str,
+            "text": str,
+            "name": str,
+            "sections": str,
+            "diff": bool,
+            "no_color": bool,
+            "report_noop": bool,
+            "skip_validation": bool,
+        },
+        "load": {
+            "path": str,
+            "text": str,
+            "sections": str,
+            "parse_scalars_as_lists": bool,
+            "integer_casting": str,
+        },
+    }
+
+    def _check_params(self, params: dict[str, Any], method: str) -> dict[str, Any]:
+        types = self._PARAMS[method]
+        if unknown := params.keys() - types.keys():
+            raise RequestError(
+                INVALID_PARAMS, f"Unknown parameter(s): {', '.join(sorted(unknown))}"
+            )
+        for name, value in params.items():
+            if not isinstance(value, types[name]):
+                raise RequestError(
+                    INVALID_PARAMS,
+                    f"Invalid value for {name}: expected {_TYPE_NAMES[types[name]]}, "
+                    f"got {json.dumps(value)}",
+                )
+        if ("path" in params) == ("text" in params):
+            raise RequestError(
+                INVALID_PARAMS, "Exactly one of 'path' or 'text' is required"
+            )
+        if params.get("integer_casting", "stable") not in ("stable", "aggressive"):
+            raise RequestError(
+                INVALID_PARAMS,
+                f"Invalid value for integer_casting: {params['integer_casting']!r}",
+            )
+        if "sections" in params:
+            try:
+                params = {**params, "sections": SectionsArg[params["sections"]]}
+            except KeyError:
+                raise RequestError(
+                    INVALID_PARAMS,
+                    f"Invalid value for sections: {params['sections']!r}",
+                ) from None
+        return params
+
+    @staticmethod
+    def _results(results: TaskResults, **kwargs: Any) -> JSON:
+        return {"status": results.status, "messages": list(results.messages), **kwargs}
+
+    def validate(
+        self,
+        *,
+        path: str | None = None,
+        text: str | None = None,
+        name: str = "<text>",
+        sections: SectionsArg = SectionsArg.allow,
+    ) -> JSON:
+        if path is None:
+            assert text is not None
+            data = text.encode("utf-8")
+            return self._results(_validate_data(data, name=name, sections=sections))
+
+        return self._cached(
+            path,
+            ("validate", sections),
+            lambda: self._results(_validate_single_file(path, sections=sections)),
+        )
+
+    def format(
+        self,
+        *,
+        path: str | None = None,
+        text: str | None = None,
+        name: str = "<text>",
+        sections: SectionsArg = SectionsArg.allow,
+        diff: bool = False,
+        no_color: bool = True,
+        report_noop: bool = False,
+        skip_validation: bool = False,
+    ) -> JSON:
+        options: dict[str, Any] = {
+            "sections": sections,
+            "diff": diff,
+            "no_color": no_color,
+            "report_noop": report_noop,
+            "skip_validation": skip_validation,
+        }
+        if path is None:
+            assert text is not None
+            results, fmted_data = _format_data(
+                text.encode("utf-8"), name=name, **options
+            )
+            if results.status == 0 and not diff:
+                return self._results(
+                    results, text=text if fmted_data is None else fmted_data
+                )
+            return self._results(results)
+
+        return self._cached(
+            path,
+            ("format", *options.values()),
+            lambda: self._results(_format_single_file(path, **options)),
+        )
+
+    def load(
+        self,
+        *,
+        path: str | None = None,
+        text: str | None = None,
+        sections: SectionsArg = SectionsArg.allow,
+        parse_scalars_as_lists: bool = False,
+        integer_casting: Literal["stable", "aggressive"] = "stable",
+    ) -> JSON:
+        # mypy struggles to infer sections.name
+        sections_name = cast("Literal['allow', 'forbid', 'require']", sections.name)  # pyright: ignore[reportUnnecessaryCast] # ty: ignore[redundant-cast]
+
+        kwargs: dict[str, Any] = {
+            "sections": sections_name,
+            "parse_scalars_as_lists": parse_scalars_as_lists,
+            "integer_casting": integer_casting,
+        }
+
+        def compute() -> JSON:
+            messages: list[str] = []
+            try:
+                if path is None:
+                    assert text is not None
+                    data = inifix.loads(text, **kwargs)
+                else:
+                    data = inifix.load(path, **kwargs)
+            except* (ValueError, OSError) as excgroup:
+                messages.extend(str(e) for e in excgroup.exceptions)
+            if messages:
+                return {"status": 1, "messages": messages}
+            return {"status": 0, "messages": messages, "data": data}
+
+        if path is None:
+            return compute()
+        return self._cached(
+            path,
+            ("load", sections, parse_scalars_as_lists, integer_casting),
+            compute,
+        )
+
+    def handle_line(self, line: bytes | str) -> str | None:
+        try:
+            request = json.loads(line)
+        except ValueError:
+            response = _error(None, PARSE_ERROR, "Parse error")
+        else:
+            if (response := self.handle(request)) is None:
+                return None
+        return json.dumps(response)
+
+
+def serve_stdio(
+    server: Server,
+    rfile: IO[bytes] | None = None,
+    wfile: IO[str] | None = None,
+) -> None:
+    if rfile is None:
+        rfile = sys.stdin.buffer
+    if wfile is None:
+        wfile = sys.stdout
+    for line in rfile:
+        if not line.strip():
+            continue
+        if (response := server.handle_line(line)) is not None:
+            wfile.write(response + "\n")
+            wfile.flush()
+
+
+if sys.platform != "win32":
+
+    class _Handler(socketserver.StreamRequestHandler):
+        server: "_UnixServer"
+
+        def handle(self) -> None:
+            for line in self.rfile:
+                if not line.strip():
+                    continue
+                if (response := self.server.app.handle_line(line)) is not None:
+                    self.wfile.write(response.encode("utf-8") + b"\n")
+                    self.wfile.flush()
+
+    class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+        def __init__(self, path: str, app: Server) -> None:
+            self.app = app
+            super().__init__(path, _Handler)
+
+    def serve_socket(
+        server: Server,
+        path: str,
+        *,
+        ready: Callable[[socketserver.BaseServer], None] | None = None,
+    ) -> None:
+        if os.path.lexists(path):
+            import socket
+            import stat
+
+            # never remove anything but a stale socket
+            if not stat.S_ISSOCK(os.lstat(path).st_mode):
+                raise FileExistsError(f"{path} exists and is not a socket")
+
+            # refuse to take over the socket of a running server,
+            # but clean up after a dead one
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                try:
+                    sock.connect(path)
+                except OSError:
+                    os.unlink(path)
+                else:
+                    raise OSError(f"Another server is already listening on {path}")
+
+        with _UnixServer(path, server) as unix_server:
+            os.chmod(path, 0o600)
+            if ready is not None:
+                ready(unix_server)
+            try:
+                unix_server.serve_forever()
+            finally:
+                os.unlink(path)
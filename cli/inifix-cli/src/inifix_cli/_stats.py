@@ -0,0 +1,188 @@
+__all__ = [
+    "FileStats",
+    "RunStats",
+    "format_report",
+    "phase",
+    "profile_run",
+    "run_batch_profiled",
+    "timed_iter",
+]
+
+import cProfile
+import os
+import sys
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any
+
+# phases are listed in the order they are reported in
+PHASES = ("discovery", "read", "parse", "validate", "format", "write")
+SLOWEST_FILES = 10
+
+
+@dataclass(slots=True)
+class FileStats:
+    file: str
+    worker: str = field(
+        default_factory=lambda: f"{os.getpid()}:{threading.current_thread().name}"
+    )
+    bytes_read: int = 0
+    bytes_written: int = 0
+    time: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def elapsed(self) -> float:
+        return sum(self.time.values())
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        tstart = perf_counter()
+        try:
+            yield
+        finally:
+            self.time[name] = self.time.get(name, 0.0) + perf_counter() - tstart
+
+
+def phase(stats: FileStats | None, name: str, /) -> AbstractContextManager[None]:
+    return nullcontext() if stats is None else stats.phase(name)
+
+
+@dataclass(slots=True)
+class RunStats:
+    backend: str = ""
+    jobs: int = 1
+    wall_time: float = 0.0
+    discovery_time: float = 0.0
+    files: list[FileStats] = field(default_factory=list)
+
+
+def timed_iter(it: Iterable[str], stats: RunStats, /) -> Iterator[str]:
+    # account for time spent producing items, e.g., walking directories
+    it = iter(it)
+    while True:
+        tstart = perf_counter()
+        item = next(it, None)
+        stats.discovery_time += perf_counter() - tstart
+        if item is None:
+            return
+        yield item
+
+
+def _format_bytes(size: int) -> str:
+    value = float(size)
+    for unit in ("B", "KiB", "MiB"):
+        if value < 1024:
+            return f"{value:.1f} {unit}" if unit != "B" else f"{size} B"
+        value /= 1024
+    return f"{value:.1f} GiB"
+
+
+def format_report(stats: RunStats, /, *, slowest: int = SLOWEST_FILES) -> str:
+    lines = [
+        "Summary",
+        f"  files processed  {len(stats.files)}",
+        f"  bytes read       {_format_bytes(sum(f.bytes_read for f in stats.files))}",
+        f"  bytes written    {_format_bytes(sum(f.bytes_written for f in stats.files))}",
+        f"  wall time        {stats.wall_time:.3f} s",
+        "",
+        "Time per phase (summed over workers)",
+    ]
+    phase_times = {name: 0.0 for name in PHASES}
+    phase_times["discovery"] = stats.discovery_time
+    for file_stats in stats.files:
+        for name, elapsed in file_stats.time.items():
+            phase_times[name] += elapsed
+    width = max(len(name) for name in PHASES)
+    lines.extend(
+        f"  {name:<{width}}  {elapsed:.3f} s" for name, elapsed in phase_times.items()
+    )
+
+    if stats.files:
+        lines.extend(["", f"Slowest files (top {slowest})"])
+        by_time = sorted(stats.files, key=lambda f: f.elapsed, reverse=True)
+        lines.extend(f"  {f.elapsed:.3f} s  {f.file}" for f in by_time[:slowest])
+
+    busy: dict[str, tuple[int, float]] = {}
+    for file_stats in stats.files:
+        count, elapsed = busy.get(file_stats.worker, (0, 0.0))
+        busy[file_stats.worker] = (count + 1, elapsed + file_stats.elapsed)
+    lines.extend(["", f"Workers (backend: {stats.backend}, jobs: {stats.jobs})"])
+    for index, (count, elapsed) in enumerate(busy.values(), start=1):
+        lines.append(f"  worker {index:<3} {count:>6} files  {elapsed:.3f} s busy")
+    if stats.wall_time > 0:
+        utilization = sum(e for _, e in busy.values()) / (stats.jobs * stats.wall_time)
+        lines.append(f"  utilization  {utilization:.0%}")
+    return "\n".join(lines)
+
+
+# cProfile only profiles the thread it's enabled in, so each worker thread
+# (or process) gets its own profiler, and they are all merged in the end
+_local = threading.local()
+_thread_profilers: list[cProfile.Profile] = []
+
+
+def _worker_profiler() -> cProfile.Profile:
+    if (prof := getattr(_local, "profiler", None)) is None:
+        prof = _local.profiler = cProfile.Profile()
+        _thread_profilers.append(prof)
+    return prof
+
+
+def run_batch_profiled(
+    closure: Callable[[str], Any], files: list[str], *, directory: str | None
+) -> list[Any]:
+    prof = _worker_profiler()
+    prof.enable()
+    try:
+        return [closure(file) for file in files]
+    finally:
+        prof.disable()
+        if directory is not None:
+            # worker processes don't outlive the pool, so their profiles are
+            # saved after each batch, to be merged by the parent process
+            prof.dump_stats(os.path.join(directory, f"{os.getpid()}.prof"))
+
+
+@contextmanager
+def profile_run(
+    output: str, /, *, backend: str
+) -> Iterator[Callable[..., list[Any]] | None]:
+    """
+    Profile a run into output, including all workers.
+
+    Yield a function to run batches of files with in workers,
+    or None if workers don't need to be profiled separately.
+    """
+    import pstats
+    import tempfile
+    from functools import partial
+
+    main = cProfile.Profile()
+    with tempfile.TemporaryDirectory() as directory:
+        run_batch: Callable[..., list[Any]] | None
+        match backend:
+            case "processes":
+                run_batch = partial(run_batch_profiled, directory=directory)
+            case "threads" if sys.version_info < (3, 12):
+                run_batch = partial(run_batch_profiled, directory=None)
+            case _:
+                # since Python 3.12, cProfile relies on sys.monitoring, which
+                # covers all threads, but only allows one profiler at a time
+                run_batch = None
+
+        n_thread_profilers = len(_thread_profilers)
+        main.enable()
+        try:
+            yield run_batch
+        finally:
+            main.disable()
+            stats = pstats.Stats(main)
+            for prof in _thread_profilers[n_thread_profilers:]:
+                stats.add(prof)
+            del _thread_profilers[n_thread_profilers:]
+            for name in sorted(os.listdir(directory)):
+                stats.add(os.path.join(directory, name))
+            stats.dump_stats(output)
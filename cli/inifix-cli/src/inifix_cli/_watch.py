@@ -0,0 +1,243 @@
+__all__ = [
+    "InotifyWatcher",
+    "PollingWatcher",
+    "Watcher",
+    "get_watcher",
+    "watch",
+]
+
+import os
+import sys
+import time
+from collections.abc import Callable, Collection, Iterable
+from threading import Event
+from typing import TYPE_CHECKING, Protocol, final
+
+if TYPE_CHECKING:
+    from inifix_cli import TaskResults
+
+StatKey = tuple[int, int, int]
+
+# how long to wait for more events to come in after a first one was received,
+# so that editors writing files in several steps trigger a single update
+SETTLE_TIME = 0.01
+
+
+def _stat_key(path: str) -> StatKey | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _directories(files: Iterable[str]) -> set[str]:
+    return {os.path.dirname(file) for file in files}
+
+
+class Watcher(Protocol):
+    def update(self, files: Collection[str], /) -> None:
+        """Set the files to be watched, along with their parent directories."""
+        ...
+
+    def wait(self, timeout: float, /) -> set[str]:
+        """
+        Block until some watched paths may have changed, or timeout is reached.
+        Return paths to files or directories which may have changed.
+        """
+        ...
+
+    def close(self) -> None: ...
+
+
+@final
+class PollingWatcher:
+    # stat-ing every watched file is costly on large trees. Passing a
+    # max_interval larger than interval spaces polls out exponentially while
+    # nothing changes, at the cost of detecting changes up to max_interval late.
+    # This is opt-in: by default, changes are picked up within interval.
+
+    def __init__(
+        self, *, interval: float = 0.1, max_interval: float | None = None
+    ) -> None:
+        self.interval = interval
+        self.max_interval = (
+            interval if max_interval is None else max(interval, max_interval)
+        )
+        self._state: dict[str, StatKey | None] = {}
+        self._delay = interval
+        self._next_poll = time.monotonic() + interval
+
+    def update(self, files: Collection[str], /) -> None:
+        paths = [*files, *_directories(files)]
+        self._state = {
+            path: self._state[path] if path in self._state else _stat_key(path)
+            for path in paths
+        }
+
+    def _poll(self) -> set[str]:
+        changed: set[str] = set()
+        for path, key in self._state.items():
+            if (new_key := _stat_key(path)) != key:
+                self._state[path] = new_key
+                changed.add(path)
+        if changed:
+            self._delay = self.interval
+        else:
+            self._delay = min(2 * self._delay, self.max_interval)
+        self._next_poll = time.monotonic() + self._delay
+        return changed
+
+    def wait(self, timeout: float, /) -> set[str]:
+        # polls are scheduled independently of timeout, so that frequent
+        # calls with short timeouts don't poll more often
+        deadline = time.monotonic() + timeout
+        while True:
+            now = time.monotonic()
+            if now >= self._next_poll:
+                if (changed := self._poll()) or time.monotonic() >= deadline:
+                    return changed
+            elif now >= deadline:
+                return set()
+            else:
+                time.sleep(min(self._next_poll, deadline) - now)
+
+    def close(self) -> None: ...
+
+
+# from <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_ONLYDIR = 0x01000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0)
+
+_WATCH_MASK = (
+    IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_ONLYDIR
+)
+
+
+@final
+class InotifyWatcher:
+    # this is only available on Linux, via ctypes
+
+    def __init__(self) -> None:
+        import ctypes
+        import ctypes.util
+
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd: int = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self._wd_to_dirs: dict[int, set[str]] = {}
+        self._dir_to_wd: dict[str, int] = {}
+        self._files: Collection[str] = ()
+
+    def update(self, files: Collection[str], /) -> None:
+        self._files = files
+        for directory in _directories(files) - self._dir_to_wd.keys():
+            wd: int = self._libc.inotify_add_watch(
+                self._fd, os.fsencode(directory or os.curdir), _WATCH_MASK
+            )
+            if wd < 0:
+                # the directory may have been removed in the meantime
+                continue
+            self._dir_to_wd[directory] = wd
+            self._wd_to_dirs.setdefault(wd, set()).add(directory)
+
+    def _read_events(self) -> set[str]:
+        import struct
+
+        changed: set[str] = set()
+        header = struct.Struct("iIII")
+        while True:
+            try:
+                buffer = os.read(self._fd, 65536)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(buffer):
+                wd, mask, _cookie, length = header.unpack_from(buffer, offset)
+                offset += header.size
+                name = os.fsdecode(buffer[offset : offset + length].rstrip(b"\0"))
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    # some events were lost, assume everything changed
+                    changed.update(self._files)
+                    changed.update(_directories(self._files))
+                    continue
+                for directory in self._wd_to_dirs.get(wd, ()):
+                    changed.add(os.path.join(directory, name))
+
+    def wait(self, timeout: float, /) -> set[str]:
+        import select
+
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        time.sleep(SETTLE_TIME)
+        return self._read_events()
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+def get_watcher(*, interval: float = 0.1, max_interval: float | None = None) -> Watcher:
+    if sys.platform == "linux":
+        try:
+            return InotifyWatcher()
+        except (OSError, AttributeError):
+            # inotify isn't available (e.g., the limit of instances was reached)
+            pass
+    return PollingWatcher(interval=interval, max_interval=max_interval)
+
+
+def watch(
+    closure: "Callable[[str], TaskResults]",
+    discover: Callable[[], Iterable[str]],
+    /,
+    *,
+    watcher: Watcher | None = None,
+    stop: Event | None = None,
+    timeout: float = 0.1,
+) -> None:
+    """
+    Run closure on files as they change, until stop is set.
+
+    Files are re-discovered only when paths that aren't known files change,
+    e.g., when a file is created in a watched directory.
+    """
+    if watcher is None:
+        watcher = get_watcher()
+    seen: dict[str, StatKey | None] = {file: _stat_key(file) for file in discover()}
+    watcher.update(seen.keys())
+    try:
+        while stop is None or not stop.is_set():
+            if not (candidates := watcher.wait(timeout)):
+                continue
+
+            if not candidates.issubset(seen):
+                files = set(discover())
+                for file in seen.keys() - files:
+                    del seen[file]
+                for file in files - seen.keys():
+                    # new files are always processed
+                    seen[file] = None
+                    candidates.add(file)
+                watcher.update(seen.keys())
+
+            for file in sorted(candidates.intersection(seen)):
+                if (key := _stat_key(file)) is None or key == seen[file]:
+                    continue
+                for message in closure(file).messages:
+                    print(message, flush=True)
+                # record the state *after* running closure,
+                # so that files rewritten by closure aren't processed again
+                seen[file] = _stat_key(file)
+    finally:
+        watcher.close()
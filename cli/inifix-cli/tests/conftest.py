@@ -1,5 +1,7 @@
 from _pytest.fixtures import SubRequest
+from collections.abc import Generator
 from pathlib import Path
+import shutil
 
 import pytest
 
@@ -8,6 +10,7 @@ INIFILES_PATHS = list(DATA_DIR.glob("*.ini")) + list(DATA_DIR.glob("*.cfg"))
 INIFILES_IDS = [inifile.name[:-4] for inifile in INIFILES_PATHS]
 
 INIFILES: dict[Path, str] = dict(zip(INIFILES_PATHS, INIFILES_IDS, strict=True))
+N_FILES = 257
 
 
 @pytest.fixture()
@@ -21,3 +24,17 @@ def datadir_root() -> Path:
 @pytest.fixture(params=list(INIFILES.keys()), ids=list(INIFILES.values()))
 def inifile_root(request: SubRequest) -> Path:
     return Path(request.param)
+
+
+@pytest.fixture
+def unformatted_files(
+    datadir_root: Path, tmp_path: Path
+) -> Generator[list[Path], None, None]:
+    in_file = datadir_root / "format-in.ini"
+    files = []
+    for file_no in range(N_FILES):
+        new_file = tmp_path / f"{file_no}.ini"
+        shutil.copy(in_file, new_file)
+        files.append(new_file.resolve())
+
+    yield files
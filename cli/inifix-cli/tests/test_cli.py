@@ -1,37 +1,25 @@
 from typing import Generator
 from _pytest.fixtures import SubRequest
-from collections.abc import Iterable
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
 import os
 import shutil
+import subprocess
 import textwrap
 from difflib import unified_diff
+from io import BytesIO
 from pathlib import Path
 from stat import S_IREAD
-from uuid import uuid4
 
 import click.testing
 import pytest
 
 import inifix
 import inifix_cli
-from inifix_cli import BUILTIN_EXCLUDES, app
+from inifix_cli import Backend, app
+from inifix_cli._discovery import git_changed_files
 
 runner: click.testing.CliRunner = click.testing.CliRunner()
-N_FILES = 257
-
-
-@pytest.fixture
-def unformatted_files(
-    datadir_root: Path, tmp_path: Path
-) -> Generator[list[Path], None, None]:
-    in_file = datadir_root / "format-in.ini"
-    files = []
-    for file_no in range(N_FILES):
-        new_file = tmp_path / f"{file_no}.ini"
-        shutil.copy(in_file, new_file)
-        files.append(new_file.resolve())
-
-    yield files
 
 
 @pytest.fixture(
@@ -69,39 +57,74 @@ def assert_text_includes(actual: str, desired: str) -> None:
     assert wrap(desired) in wrap(desired)
 
 
-def test_filter_files_default(tmp_path: Path) -> None:
-    target = tmp_path / str(uuid4())
-    target.touch()
-    assert inifix_cli.filter_files([str(target)]) == [str(target)]
-
-
 @pytest.mark.parametrize(
-    "names, exclude, expected_names",
+    "backend, jobs, file_count, gil_enabled, expected",
     [
-        pytest.param(["a.ini"], ["a.*"], [], id="exclude-only-files"),
-        pytest.param(["a.ini", "b.cfg"], [r"\.ini$"], ["b.cfg"], id="exclude-partial"),
-        pytest.param(
-            ["pytest.ini", "tox.ini"], BUILTIN_EXCLUDES, [], id="default-excludes"
-        ),
+        pytest.param(Backend.threads, None, 10, True, Backend.threads, id="explicit"),
+        pytest.param(Backend.auto, None, 1, True, Backend.serial, id="single-file"),
+        pytest.param(Backend.auto, 1, 10, True, Backend.serial, id="single-job"),
+        pytest.param(Backend.auto, None, 10, True, Backend.processes, id="gil"),
+        pytest.param(Backend.auto, None, 10, False, Backend.threads, id="nogil"),
     ],
 )
-def test_filter_files_exclude(
-    names: list[str],
-    exclude: list[str],
-    expected_names: list[str],
-    tmp_path: Path,
+def test_resolve_backend(
+    backend: Backend,
+    jobs: int | None,
+    file_count: int,
+    gil_enabled: bool,
+    expected: Backend,
+    monkeypatch: pytest.MonkeyPatch,
 ) -> None:
-    targets = [tmp_path / name for name in names]
-    for t in targets:
-        t.touch()
-
-    expected = [str(t) for t in targets if t.name in expected_names]
-    assert len(expected) == len(expected_names)
+    monkeypatch.setattr(inifix_cli, "is_gil_enabled", lambda: gil_enabled)
     assert (
-        inifix_cli.filter_files([str(t) for t in targets], exclude=exclude) == expected
+        inifix_cli.resolve_backend(backend, jobs=jobs, file_count=file_count)
+        is expected
     )
 
 
+@pytest.mark.parametrize(
+    "file_count, jobs, expected",
+    [(0, 4, 1), (10, 4, 1), (1000, 4, 62), (100_000, 4, 64)],
+)
+def test_get_chunksize(file_count: int, jobs: int, expected: int) -> None:
+    assert inifix_cli.get_chunksize(file_count, jobs) == expected
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+@pytest.mark.parametrize("chunksize", [1, 3])
+def test_iter_results_bounded_window(ordered: bool, chunksize: int) -> None:
+    window = 4
+    consumed: list[str] = []
+
+    def files() -> Generator[str, None, None]:
+        for i in range(100):
+            consumed.append(str(i))
+            yield str(i)
+
+    def closure(file: str) -> inifix_cli.TaskResults:
+        return inifix_cli.TaskResults(0, [inifix_cli.Message(file)])
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = inifix_cli.iter_results(
+            closure,
+            files(),
+            executor=executor,
+            chunksize=chunksize,
+            window=window,
+            ordered=ordered,
+        )
+        first = next(results)
+        # files are only pulled from the input as slots free up
+        assert len(consumed) <= (window + 1) * chunksize
+        messages = [*first.messages, *(m for r in results for m in r.messages)]
+
+    expected = [str(i) for i in range(100)]
+    if ordered:
+        assert messages == expected
+    else:
+        assert sorted(messages) == sorted(expected)
+
+
 class TestValidate:
     def test_empty_file(self, tmp_path: Path) -> None:
         target = tmp_path / "invalid_file"
@@ -129,8 +152,55 @@ class TestValidate:
         assert result.stderr == ""
         assert result.exit_code == 0
 
-    def test_concurrency(self, unformatted_files: Iterable[Path]) -> None:
-        result = runner.invoke(app, ["validate", *(str(f) for f in unformatted_files)])
+    @pytest.mark.parametrize("backend", [b.name for b in Backend])
+    def test_concurrency(self, backend: str, unformatted_files: Iterable[Path]) -> None:
+        result = runner.invoke(
+            app,
+            [
+                "validate",
+                "--backend",
+                backend,
+                *(str(f) for f in unformatted_files),
+            ],
+        )
+        assert result.exit_code == 0
+        assert result.stderr == ""
+
+        # results are reported in (sorted) input order
+        out_lines = result.stdout.splitlines()
+        assert out_lines == [
+            f"Validated {file}" for file in sorted(str(f) for f in unformatted_files)
+        ]
+
+    def test_directory(self, unformatted_files: list[Path], tmp_path: Path) -> None:
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "tox.ini").write_text("invalid", encoding="utf-8")
+        (tmp_path / "sub" / "notes.txt").write_text("invalid", encoding="utf-8")
+        result = runner.invoke(app, ["validate", str(tmp_path)])
+        assert result.exit_code == 0
+        assert result.stderr == ""
+        assert set(result.stdout.splitlines()) == {
+            f"Validated {file}" for file in unformatted_files
+        }
+
+    def test_directory_include(self, tmp_path: Path) -> None:
+        (tmp_path / "a.ini").write_text("invalid", encoding="utf-8")
+        (tmp_path / "b.toml").write_text("a 1", encoding="utf-8")
+        result = runner.invoke(app, ["validate", "--include", "*.toml", str(tmp_path)])
+        assert result.exit_code == 0
+        assert result.stdout == f"Validated {tmp_path / 'b.toml'}\n"
+
+    def test_unordered(self, unformatted_files: Iterable[Path]) -> None:
+        result = runner.invoke(
+            app,
+            [
+                "validate",
+                "--backend",
+                "threads",
+                "--unordered",
+                *(str(f) for f in unformatted_files),
+            ],
+        )
         assert result.exit_code == 0
         assert result.stderr == ""
 
@@ -280,6 +350,26 @@ class TestFormat:
         assert result.stderr == ""
         assert result.stdout == ""
 
+    @pytest.mark.parametrize("cmd", ["validate", "format"])
+    def test_extend_exclude_flags(self, cmd: str, tmp_path: Path) -> None:
+        # inline global flags are supported, alongside builtin excludes
+        target = tmp_path / "SKIPPED.ini"
+        target.write_text("Invalid data, should be ignored", encoding="utf-8")
+        result = runner.invoke(
+            app, [cmd, str(tmp_path), "--extend-exclude", "(?i)skipped"]
+        )
+        assert result.exit_code == 0
+        assert result.stdout == ""
+
+    @pytest.mark.parametrize("cmd", ["validate", "format"])
+    def test_invalid_exclude(self, cmd: str, tmp_path: Path) -> None:
+        result = runner.invoke(
+            app, [cmd, str(tmp_path), "--extend-exclude", "(unclosed"]
+        )
+        assert result.exit_code == 2
+        assert "Invalid value for '--exclude' / '--extend-exclude'" in result.stderr
+        assert "invalid regular expression '(unclosed'" in result.stderr
+
     def test_diff_stdout(self, inifile_root: Path, tmp_path: Path) -> None:
         target = tmp_path / inifile_root.name
         shutil.copy(inifile_root, target)
@@ -333,19 +423,501 @@ class TestFormat:
         monkeypatch.setattr(inifix_cli, "get_cpu_count", lambda: 1)
         runner.invoke(app, ["format", str(target)])
 
+    @pytest.mark.parametrize("jobs", ["0", "-1"])
+    def test_invalid_jobs(self, jobs: str, tmp_path: Path) -> None:
+        target = tmp_path / "spaces.ini"
+        target.touch()
+        result = runner.invoke(app, ["format", "--jobs", jobs, str(target)])
+        assert result.exit_code == 2
+
+    def test_explicit_jobs(
+        self,
+        datadir_root: Path,
+        unformatted_files: Iterable[Path],
+    ) -> None:
+        result = runner.invoke(
+            app,
+            [
+                "format",
+                "--backend",
+                "processes",
+                "--jobs",
+                "2",
+                *(str(f) for f in unformatted_files),
+            ],
+        )
+        assert result.exit_code != 0
+
+        expected = (datadir_root / "format-out.ini").read_text(encoding="utf-8")
+        for file in unformatted_files:
+            assert file.read_text(encoding="utf-8") == expected
+
+    @pytest.mark.parametrize("backend", [b.name for b in Backend])
     def test_concurrency(
         self,
+        backend: str,
         datadir_root: Path,
         unformatted_files: Iterable[Path],
     ) -> None:
-        result = runner.invoke(app, ["format", *(str(f) for f in unformatted_files)])
+        result = runner.invoke(
+            app,
+            [
+                "format",
+                "--backend",
+                backend,
+                *(str(f) for f in unformatted_files),
+            ],
+        )
         assert result.exit_code != 0
 
-        # order of lines doesn't matter and is not guaranteed
+        # results are reported in (sorted) input order
         err_lines = result.stdout.splitlines()
-        assert set(err_lines) == {f"Fixing {file}" for file in unformatted_files}
+        assert err_lines == [
+            f"Fixing {file}" for file in sorted(str(f) for f in unformatted_files)
+        ]
 
         expected = (datadir_root / "format-out.ini").read_text(encoding="utf-8")
         for file in unformatted_files:
             body = file.read_text(encoding="utf-8")
             assert body == expected
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git is not available")
+class TestChangedSince:
+    @pytest.fixture
+    def repo(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+        def git(*args: str) -> None:
+            subprocess.run(
+                [
+                    "git",
+                    "-c",
+                    "user.name=inifix",
+                    "-c",
+                    "user.email=inifix@example.com",
+                    *args,
+                ],
+                cwd=tmp_path,
+                check=True,
+                capture_output=True,
+            )
+
+        git("init", "-q")
+        for name in ["unchanged.ini", "modified.ini", "deleted.ini", "sub/b.ini"]:
+            (tmp_path / name).parent.mkdir(exist_ok=True)
+            (tmp_path / name).write_text("a 1\n", encoding="utf-8")
+        (tmp_path / ".gitignore").write_text("ignored.ini\n", encoding="utf-8")
+        git("add", ".")
+        git("commit", "-q", "-m", "initial commit")
+
+        (tmp_path / "modified.ini").write_text("a 2\n", encoding="utf-8")
+        (tmp_path / "sub" / "b.ini").write_text("b 1\n", encoding="utf-8")
+        (tmp_path / "deleted.ini").unlink()
+        (tmp_path / "untracked.ini").write_text("a 1\n", encoding="utf-8")
+        (tmp_path / "ignored.ini").write_text("a 1\n", encoding="utf-8")
+        (tmp_path / "notes.txt").write_text("a 1\n", encoding="utf-8")
+
+        monkeypatch.chdir(tmp_path)
+        return tmp_path
+
+    def test_git_changed_files(self, repo: Path) -> None:
+        changed = git_changed_files("HEAD")
+        assert {os.path.relpath(f, repo) for f in changed} == {
+            "modified.ini",
+            "notes.txt",
+            os.path.join("sub", "b.ini"),
+            "untracked.ini",
+        }
+
+    def test_directory(self, repo: Path) -> None:
+        result = runner.invoke(app, ["validate", "--changed-since", "HEAD", "."])
+        assert result.exit_code == 0
+        assert result.stdout.splitlines() == [
+            f"Validated {os.path.join('.', 'modified.ini')}",
+            f"Validated {os.path.join('.', 'untracked.ini')}",
+            f"Validated {os.path.join('.', 'sub', 'b.ini')}",
+        ]
+
+    def test_explicit_files(self, repo: Path) -> None:
+        result = runner.invoke(
+            app,
+            [
+                "validate",
+                "--changed-since",
+                "HEAD",
+                "unchanged.ini",
+                "modified.ini",
+            ],
+        )
+        assert result.exit_code == 0
+        assert result.stdout == "Validated modified.ini\n"
+
+    def test_outside_repo(
+        self,
+        repo: Path,
+        tmp_path_factory: pytest.TempPathFactory,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        # git runs in the repository containing paths, not in the cwd
+        monkeypatch.chdir(tmp_path_factory.mktemp("elsewhere"))
+        result = runner.invoke(
+            app,
+            [
+                "validate",
+                "--changed-since",
+                "HEAD",
+                str(repo / "unchanged.ini"),
+                str(repo / "sub"),
+            ],
+        )
+        assert result.exit_code == 0
+        assert result.stdout == f"Validated {repo / 'sub' / 'b.ini'}\n"
+
+    def test_invalid_rev(self, repo: Path) -> None:
+        result = runner.invoke(
+            app, ["format", "--changed-since", "not-a-rev", "--diff", "."]
+        )
+        assert result.exit_code == 2
+        assert "Invalid value for '--changed-since'" in result.stderr
+
+
+class TestStdin:
+    def test_format(self, datadir_root: Path) -> None:
+        body = (datadir_root / "format-in.ini").read_bytes()
+        result = runner.invoke(app, ["format", "-"], input=body)
+        assert result.exit_code == 0
+        assert result.stdout == (datadir_root / "format-out.ini").read_text(
+            encoding="utf-8"
+        )
+        assert result.stderr == ""
+
+    def test_format_noop(self, datadir_root: Path) -> None:
+        body = (datadir_root / "format-out.ini").read_bytes()
+        result = runner.invoke(app, ["format", "-", "--report-noop"], input=body)
+        assert result.exit_code == 0
+        assert result.stdout_bytes == body
+        assert result.stderr == "<stdin> is already formatted\n"
+
+    def test_format_diff(self, datadir_root: Path) -> None:
+        body = (datadir_root / "format-in.ini").read_bytes()
+        result = runner.invoke(app, ["format", "-", "--diff"], input=body)
+        assert result.exit_code != 0
+        assert result.stdout.startswith("--- <stdin>\n")
+
+    @pytest.mark.parametrize("cmd", ["validate", "format"])
+    def test_invalid(self, cmd: str) -> None:
+        result = runner.invoke(app, [cmd, "-"], input="a\n")
+        assert result.exit_code != 0
+        assert "<stdin>" in result.output
+        if cmd == "format":
+            assert result.stdout == ""
+
+    def test_validate(self, datadir_root: Path) -> None:
+        body = (datadir_root / "format-in.ini").read_bytes()
+        result = runner.invoke(app, ["validate", "-"], input=body)
+        assert result.exit_code == 0
+        assert result.stdout == "Validated <stdin>\n"
+
+    @pytest.mark.parametrize("cmd", ["validate", "format"])
+    def test_mixed_arguments(self, cmd: str, tmp_path: Path) -> None:
+        result = runner.invoke(app, [cmd, "-", str(tmp_path)])
+        assert result.exit_code == 2
+
+
+class TestFilesFrom:
+    @pytest.mark.parametrize(
+        "args, separator",
+        [pytest.param((), "\n", id="newlines"), pytest.param(("-0",), "\0", id="nul")],
+    )
+    def test_validate(
+        self,
+        args: tuple[str, ...],
+        separator: str,
+        unformatted_files: list[Path],
+    ) -> None:
+        listed = [str(f) for f in unformatted_files]
+        result = runner.invoke(
+            app,
+            ["validate", "--files-from", "-", *args],
+            input=separator.join(listed) + separator,
+        )
+        assert result.exit_code == 0
+        # listed files are processed in the order they are given
+        assert result.stdout.splitlines() == [f"Validated {f}" for f in listed]
+
+    def test_format(
+        self,
+        datadir_root: Path,
+        unformatted_files: list[Path],
+        tmp_path: Path,
+    ) -> None:
+        file_list = tmp_path / "files.txt"
+        file_list.write_text(
+            "\n".join(str(f) for f in unformatted_files), encoding="utf-8"
+        )
+        result = runner.invoke(app, ["format", "--files-from", str(file_list)])
+        assert result.exit_code != 0
+
+        expected = (datadir_root / "format-out.ini").read_text(encoding="utf-8")
+        for file in unformatted_files:
+            assert file.read_text(encoding="utf-8") == expected
+
+    def test_exclude(self, tmp_path: Path) -> None:
+        target = tmp_path / "tox.ini"
+        target.write_text("invalid", encoding="utf-8")
+        result = runner.invoke(
+            app, ["validate", "--files-from", "-"], input=f"{target}\n"
+        )
+        assert result.exit_code == 0
+        assert result.stdout == ""
+
+    def test_watch(
+        self,
+        unformatted_files: list[Path],
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        discovered: list[list[str]] = []
+
+        def watch_files(
+            closure: Callable[[str], inifix_cli.TaskResults],
+            discover: Callable[[], Iterable[str]],
+        ) -> None:
+            discovered.append(list(discover()))
+
+        monkeypatch.setattr(inifix_cli, "watch_files", watch_files)
+        listed = [str(f) for f in unformatted_files[:2]]
+        file_list = tmp_path / "files.txt"
+        file_list.write_text("\n".join(listed), encoding="utf-8")
+        result = runner.invoke(
+            app, ["validate", "--files-from", str(file_list), "--watch"]
+        )
+        assert result.exit_code == 0
+        # files are discovered again when watching
+        assert discovered == [listed]
+
+    def test_watch_stdin(self, unformatted_files: list[Path]) -> None:
+        result = runner.invoke(
+            app,
+            ["validate", "--files-from", "-", "--watch"],
+            input=f"{unformatted_files[0]}\n",
+        )
+        assert result.exit_code == 2
+        assert "cannot be combined with --watch" in result.stderr
+
+
+def test_read_file_list_chunks() -> None:
+    # paths may be split across chunks
+    paths = [f"{'a' * 1000}{i}.ini" for i in range(200)]
+    fh = BytesIO("\0".join(paths).encode())
+    assert list(inifix_cli.read_file_list(fh, null_separated=True)) == paths
+
+
+class TestStats:
+    @pytest.mark.parametrize("backend", ["serial", "threads", "processes"])
+    def test_validate(self, backend: str, unformatted_files: list[Path]) -> None:
+        files = [str(f) for f in unformatted_files[:8]]
+        result = runner.invoke(
+            app, ["validate", "--stats", "--backend", backend, "-j", "2", *files]
+        )
+        assert result.exit_code == 0
+        # stdout is unaffected
+        assert result.stdout.splitlines() == [f"Validated {f}" for f in files]
+        assert "files processed  8" in result.stderr
+        assert "bytes written    0 B" in result.stderr
+        assert f"Workers (backend: {backend}, jobs: 2)" in result.stderr
+        assert "utilization" in result.stderr
+        for phase in ("discovery", "read", "parse", "validate"):
+            assert f"  {phase} " in result.stderr
+
+    def test_format(self, unformatted_files: list[Path]) -> None:
+        files = [str(f) for f in unformatted_files[:3]]
+        result = runner.invoke(app, ["format", "--stats", *files])
+        assert result.exit_code != 0
+        assert "files processed  3" in result.stderr
+        assert "bytes written    0 B" not in result.stderr
+        assert "Slowest files (top 10)" in result.stderr
+        slowest = result.stderr.split("Slowest files (top 10)\n")[1].split("\n\n")[0]
+        assert sorted(line.split()[-1] for line in slowest.splitlines()) == sorted(
+            files
+        )
+
+    def test_stats_from_single_file(self, tmp_path: Path) -> None:
+        target = tmp_path / "a.ini"
+        target.write_text("a 1\n", encoding="utf-8")
+        result = inifix_cli._validate_single_file(
+            str(target), inifix_cli.SectionsArg.allow, collect_stats=True
+        )
+        assert result.stats is not None
+        assert result.stats.bytes_read == 4
+        assert set(result.stats.time) == {"read", "parse", "validate"}
+        assert (
+            inifix_cli._validate_single_file(
+                str(target), inifix_cli.SectionsArg.allow
+            ).stats
+            is None
+        )
+
+    @pytest.mark.parametrize("backend", ["serial", "threads", "processes"])
+    def test_profile(
+        self, backend: str, unformatted_files: list[Path], tmp_path: Path
+    ) -> None:
+        import pstats
+
+        output = tmp_path / "out.prof"
+        files = [str(f) for f in unformatted_files[:8]]
+        result = runner.invoke(
+            app,
+            [
+                "format",
+                "--profile",
+                str(output),
+                "--backend",
+                backend,
+                "-j",
+                "2",
+                *files,
+            ],
+        )
+        assert result.exit_code != 0
+        stats = pstats.Stats(str(output))
+        functions = {name for (_, _, name) in stats.stats}  # type: ignore[attr-defined]
+        # work done in workers is included
+        assert "_format_file" in functions
+        assert "format_string" in functions
+
+
+class TestDiff:
+    REFERENCE = "[Grid]\nnx 64\nny 64\n\n[Hydro]\nsolver hllc\ngamma 1.4\n"
+
+    def test_identical(self, tmp_path: Path) -> None:
+        ref = tmp_path / "ref.ini"
+        ref.write_text(self.REFERENCE)
+        other = tmp_path / "other.ini"
+        other.write_text(self.REFERENCE.replace("  ", " "))
+        result = runner.invoke(app, ["diff", str(ref), str(other)])
+        assert result.exit_code == 0
+        assert result.stdout == ""
+
+    def test_differences(self, tmp_path: Path) -> None:
+        ref = tmp_path / "ref.ini"
+        ref.write_text(self.REFERENCE)
+        other = tmp_path / "other.ini"
+        other.write_text(
+            self.REFERENCE.replace("ny 64\n", "nz 32\n").replace("hllc", "roe")
+        )
+        result = runner.invoke(app, ["diff", str(ref), str(other)])
+        assert result.exit_code != 0
+        assert result.stdout.splitlines() == [
+            f"--- {ref}",
+            f"+++ {other}",
+            "[Grid]",
+            "- ny  64",
+            "+ nz  32",
+            "[Hydro]",
+            "~ solver  hllc  ->  roe",
+        ]
+
+    def test_directory(self, tmp_path: Path) -> None:
+        ref = tmp_path / "ref.ini"
+        ref.write_text(self.REFERENCE)
+        runs = tmp_path / "runs"
+        runs.mkdir()
+        for i in range(4):
+            (runs / f"run{i}.ini").write_text(
+                self.REFERENCE.replace("1.4", f"1.{i}") if i % 2 else self.REFERENCE
+            )
+        result = runner.invoke(app, ["diff", "--name-only", str(ref), str(runs)])
+        assert result.exit_code != 0
+        assert result.stdout.splitlines() == [
+            str(runs / "run1.ini"),
+            str(runs / "run3.ini"),
+        ]
+
+    def test_invalid_file(self, tmp_path: Path) -> None:
+        ref = tmp_path / "ref.ini"
+        ref.write_text(self.REFERENCE)
+        invalid = tmp_path / "invalid.ini"
+        invalid.write_text("a\n")
+        result = runner.invoke(
+            app, ["diff", str(ref), str(invalid), str(tmp_path / "missing.ini")]
+        )
+        assert result.exit_code != 0
+        assert result.stdout == ""
+        assert f"Failed to load {invalid}" in result.stderr
+        assert f"Error: could not find {tmp_path / 'missing.ini'}" in result.stderr
+
+
+class TestIndex:
+    RUN = "[Hydro]\nsolver hllc\ngamma {gamma}\n\n[Grid]\nX1-grid 1 0.0 {nx} u 1.0\n"
+
+    @pytest.fixture
+    def runs(self, tmp_path: Path) -> Path:
+        runs = tmp_path / "runs"
+        runs.mkdir()
+        for i, gamma in enumerate(["1.4", "1.6", "1.4"]):
+            (runs / f"run{i}.ini").write_text(self.RUN.format(gamma=gamma, nx=64 * i))
+        return runs
+
+    def test_index_and_query(self, tmp_path: Path, runs: Path) -> None:
+        db = str(tmp_path / "index.db")
+        result = runner.invoke(app, ["index", db, str(runs), "-j", "1"])
+        assert result.exit_code == 0
+        assert result.stdout == ""
+        assert result.stderr == (
+            "Indexed 3 files (3 added, 0 updated, 0 unchanged, 0 removed)\n"
+        )
+
+        result = runner.invoke(app, ["index", db, "-q", "[Hydro]gamma=1.4"])
+        assert result.exit_code == 0
+        assert result.stdout.splitlines() == [
+            str(runs / "run0.ini"),
+            str(runs / "run2.ini"),
+        ]
+
+        result = runner.invoke(
+            app, ["index", db, "-q", "gamma=1.4", "-q", "X1-grid=1 0.0 128 u 1.0"]
+        )
+        assert result.exit_code == 0
+        assert result.stdout.splitlines() == [str(runs / "run2.ini")]
+
+        # no match
+        result = runner.invoke(app, ["index", db, "-q", "gamma=1"])
+        assert result.exit_code != 0
+        assert result.stdout == ""
+
+    def test_reindex(self, tmp_path: Path, runs: Path) -> None:
+        db = str(tmp_path / "index.db")
+        runner.invoke(app, ["index", db, str(runs), "-j", "1"])
+        (runs / "run0.ini").unlink()
+        (runs / "run1.ini").write_text(self.RUN.format(gamma="1.4", nx=1))
+        result = runner.invoke(
+            app, ["index", db, str(runs), "-j", "1", "-q", "gamma=1.4"]
+        )
+        assert result.exit_code == 0
+        assert result.stderr == (
+            "Indexed 2 files (0 added, 1 updated, 1 unchanged, 1 removed)\n"
+        )
+        assert result.stdout.splitlines() == [
+            str(runs / "run1.ini"),
+            str(runs / "run2.ini"),
+        ]
+
+    def test_invalid_file(self, tmp_path: Path, runs: Path) -> None:
+        (runs / "invalid.ini").write_text("a\n")
+        result = runner.invoke(
+            app, ["index", str(tmp_path / "index.db"), str(runs), "-j", "1"]
+        )
+        assert result.exit_code != 0
+        assert f"Failed to index {runs / 'invalid.ini'}" in result.stderr
+
+    @pytest.mark.parametrize("condition", ["gamma", "=1.4", "gamma=", "[Hydro=1"])
+    def test_invalid_query(self, tmp_path: Path, condition: str) -> None:
+        result = runner.invoke(
+            app, ["index", str(tmp_path / "index.db"), "-q", condition]
+        )
+        assert result.exit_code == 2
+        assert "expected [SECTION]KEY=VALUES" in result.stderr
+
+    def test_nothing_to_do(self, tmp_path: Path) -> None:
+        result = runner.invoke(app, ["index", str(tmp_path / "index.db")])
+        assert result.exit_code == 2
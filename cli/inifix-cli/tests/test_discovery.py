@@ -0,0 +1,190 @@
+import re
+from pathlib import Path
+from typing import TypedDict
+from uuid import uuid4
+
+import pytest
+
+from inifix_cli import BUILTIN_EXCLUDES
+from inifix_cli._discovery import (
+    GitIgnore,
+    Matcher,
+    compile_excludes,
+    compile_includes,
+    iter_files,
+)
+
+INCLUDE = compile_includes(["*.ini", "*.cfg"])
+NO_EXCLUDE = compile_excludes([])
+
+
+class PatternKwargs(TypedDict):
+    include: re.Pattern[str]
+    exclude: Matcher
+
+
+def make_tree(root: Path, names: list[str]) -> None:
+    for name in names:
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.touch()
+
+
+def test_compile_excludes() -> None:
+    regexp = compile_excludes([r"pytest\.ini$", r"tox\.ini$"])
+    assert regexp.search("a/pytest.ini")
+    assert regexp.search("tox.ini")
+    assert not regexp.search("idefix.ini")
+
+
+@pytest.mark.parametrize(
+    "extra",
+    [
+        pytest.param([], id="single"),
+        pytest.param([r"tox\.ini$"], id="combined"),
+    ],
+)
+@pytest.mark.parametrize(
+    "pattern, matching, not_matching",
+    [
+        pytest.param("(?i)pytest", "a/PyTest.ini", "a/pytst.ini", id="global-flags"),
+        pytest.param(r"(a)\1\.ini$", "aa.ini", "ab.ini", id="backreference"),
+        pytest.param(r"(?P<c>.)(?P=c)\.ini$", "bb.ini", "ab.ini", id="named-group"),
+    ],
+)
+def test_compile_excludes_independent_patterns(
+    pattern: str, matching: str, not_matching: str, extra: list[str]
+) -> None:
+    # patterns behave as if they were matched separately
+    regexp = compile_excludes([*extra, pattern, *extra])
+    assert regexp.search(matching)
+    assert not regexp.search(not_matching)
+    if extra:
+        assert regexp.search("a/tox.ini")
+
+
+def test_compile_excludes_invalid() -> None:
+    with pytest.raises(re.error) as excinfo:
+        compile_excludes([r"\.ini$", "(unclosed"])
+    assert excinfo.value.pattern == "(unclosed"
+
+
+def test_compile_empty() -> None:
+    assert not compile_excludes([]).search("")
+    assert not compile_includes([]).match("a.ini")
+
+
+def test_iter_files_explicit(tmp_path: Path) -> None:
+    # explicit files are not matched against include patterns
+    target = tmp_path / str(uuid4())
+    target.touch()
+    assert list(iter_files([str(target)], include=INCLUDE, exclude=NO_EXCLUDE)) == [
+        str(target)
+    ]
+
+
+@pytest.mark.parametrize(
+    "names, exclude, expected_names",
+    [
+        pytest.param(["a.ini"], ["a.*"], [], id="exclude-only-files"),
+        pytest.param(["a.ini", "b.cfg"], [r"\.ini$"], ["b.cfg"], id="exclude-partial"),
+        pytest.param(
+            ["pytest.ini", "tox.ini"], BUILTIN_EXCLUDES, [], id="default-excludes"
+        ),
+    ],
+)
+def test_iter_files_explicit_exclude(
+    names: list[str],
+    exclude: list[str],
+    expected_names: list[str],
+    tmp_path: Path,
+) -> None:
+    targets = [tmp_path / name for name in names]
+    for t in targets:
+        t.touch()
+
+    expected = [str(t) for t in targets if t.name in expected_names]
+    assert len(expected) == len(expected_names)
+    files = iter_files(
+        [str(t) for t in targets], include=INCLUDE, exclude=compile_excludes(exclude)
+    )
+    assert list(files) == expected
+
+
+@pytest.mark.parametrize(
+    "lines, path, is_dir, expected",
+    [
+        pytest.param(["*.ini"], "a/b.ini", False, True, id="basename-glob"),
+        pytest.param(["*.ini", "!b.ini"], "a/b.ini", False, False, id="negation"),
+        pytest.param(["build/"], "a/build", True, True, id="directory-only-dir"),
+        pytest.param(["build/"], "a/build", False, None, id="directory-only-file"),
+        pytest.param(["/b.ini"], "a/b.ini", False, None, id="anchored-miss"),
+        pytest.param(["/b.ini"], "b.ini", False, True, id="anchored-hit"),
+        pytest.param(["a/**/c.ini"], "a/b/b/c.ini", False, True, id="double-star"),
+        pytest.param(["**/c.ini"], "a/c.ini", False, True, id="leading-double-star"),
+        pytest.param(["b?.ini"], "b1.ini", False, True, id="question-mark"),
+        pytest.param(["b[!0-9].ini"], "b1.ini", False, None, id="char-class"),
+        pytest.param(["# b.ini", ""], "b.ini", False, None, id="comments"),
+    ],
+)
+def test_gitignore_match(
+    lines: list[str], path: str, is_dir: bool, expected: bool | None
+) -> None:
+    ignore = GitIgnore.from_lines("/root", lines)
+    assert ignore.match(f"/root/{path}", is_dir=is_dir) is expected
+
+
+def test_iter_files_order(tmp_path: Path) -> None:
+    make_tree(tmp_path, ["b/z.ini", "b/a/y.cfg", "a.ini", "c/x.txt", "d.ini"])
+    files = list(
+        iter_files(
+            [str(tmp_path / "d.ini"), str(tmp_path)],
+            include=INCLUDE,
+            exclude=NO_EXCLUDE,
+        )
+    )
+    # explicit files come first, then each directory's own files,
+    # then its subdirectories
+    assert files == [
+        str(tmp_path / "d.ini"),
+        str(tmp_path / "a.ini"),
+        str(tmp_path / "d.ini"),
+        str(tmp_path / "b" / "z.ini"),
+        str(tmp_path / "b" / "a" / "y.cfg"),
+    ]
+
+
+def test_iter_files_exclude_directory(tmp_path: Path) -> None:
+    make_tree(tmp_path, ["keep/a.ini", "skip/b.ini"])
+    files = list(
+        iter_files(
+            [str(tmp_path)],
+            include=INCLUDE,
+            exclude=compile_excludes([r"skip/$"]),
+        )
+    )
+    assert files == [str(tmp_path / "keep" / "a.ini")]
+
+
+def test_iter_files_gitignore(tmp_path: Path) -> None:
+    make_tree(
+        tmp_path,
+        ["a.ini", "build/b.ini", "sub/c.ini", "sub/d.ini", "sub/e.ini"],
+    )
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".gitignore").write_text("build/\n*.ini\n", encoding="utf-8")
+    (tmp_path / "sub" / ".gitignore").write_text("!*.ini\nd.ini\n", encoding="utf-8")
+    kwargs: PatternKwargs = {"include": INCLUDE, "exclude": NO_EXCLUDE}
+
+    assert len(list(iter_files([str(tmp_path)], **kwargs))) == 5
+    assert list(iter_files([str(tmp_path)], respect_gitignore=True, **kwargs)) == [
+        str(tmp_path / "sub" / "c.ini"),
+        str(tmp_path / "sub" / "e.ini"),
+    ]
+    # rules from parent directories still apply when walking a subdirectory
+    assert list(
+        iter_files([str(tmp_path / "sub")], respect_gitignore=True, **kwargs)
+    ) == [str(tmp_path / "sub" / "c.ini"), str(tmp_path / "sub" / "e.ini")]
+    assert not list(
+        iter_files([str(tmp_path / "build")], respect_gitignore=True, **kwargs)
+    )
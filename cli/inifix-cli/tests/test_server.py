@@ -0,0 +1,353 @@
+import json
+import shutil
+import socketserver
+import sys
+import tempfile
+from collections.abc import Generator
+from io import BytesIO, StringIO
+from pathlib import Path
+from threading import Event, Thread
+from typing import Any
+
+import click.testing
+import pytest
+
+from inifix_cli import app
+from inifix_cli._client import ServerError, request
+from inifix_cli._server import (
+    INTERNAL_ERROR,
+    INVALID_PARAMS,
+    INVALID_REQUEST,
+    METHOD_NOT_FOUND,
+    PARSE_ERROR,
+    Server,
+    serve_stdio,
+)
+
+runner: click.testing.CliRunner = click.testing.CliRunner()
+
+
+def call(server: Server, method: str, **params: Any) -> dict[str, Any]:
+    response = server.handle(
+        {"jsonrpc": "2.0", "id": 1, "method": method, "params": params}
+    )
+    assert response["id"] == 1
+    result: dict[str, Any] = response.get("result", response.get("error"))
+    return result
+
+
+def test_stdio() -> None:
+    lines = [
+        {"jsonrpc": "2.0", "id": 1, "method": "validate", "params": {"text": "a 1"}},
+        # notifications don't get a response
+        {"jsonrpc": "2.0", "method": "validate", "params": {"text": "a 1"}},
+        {"jsonrpc": "2.0", "id": 2, "method": "load", "params": {"text": "a 1 2"}},
+    ]
+    rfile = BytesIO(b"\n".join(json.dumps(line).encode() for line in lines) + b"\n")
+    wfile = StringIO()
+    serve_stdio(Server(), rfile, wfile)
+    assert [json.loads(line) for line in wfile.getvalue().splitlines()] == [
+        {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "result": {"status": 0, "messages": ["Validated <text>"]},
+        },
+        {
+            "jsonrpc": "2.0",
+            "id": 2,
+            "result": {"status": 0, "messages": [], "data": {"a": [1, 2]}},
+        },
+    ]
+
+
+def test_format_text(datadir_root: Path) -> None:
+    body = (datadir_root / "format-in.ini").read_text(encoding="utf-8")
+    expected = (datadir_root / "format-out.ini").read_text(encoding="utf-8")
+    result = call(Server(), "format", text=body)
+    assert result == {"status": 0, "messages": [], "text": expected}
+
+
+def test_invalid_text() -> None:
+    result = call(Server(), "validate", text="a", name="<buffer>")
+    assert result["status"] == 1
+    assert result["messages"][0].startswith("Failed to validate <buffer>")
+
+    result = call(Server(), "load", text="a")
+    assert result["status"] == 1
+    assert "data" not in result
+
+
+def test_cache(tmp_path: Path, datadir_root: Path) -> None:
+    target = tmp_path / "a.ini"
+    shutil.copy(datadir_root / "format-in.ini", target)
+    server = Server()
+
+    for _ in range(3):
+        result = call(server, "load", path=str(target), sections="require")
+        assert result["status"] == 0
+    assert call(server, "stats") == {"hits": 2, "misses": 1}
+
+    # files written by the server are not cached
+    result = call(server, "format", path=str(target))
+    assert result == {"status": 1, "messages": [f"Fixing {target}"]}
+    result = call(server, "format", path=str(target))
+    assert result == {"status": 0, "messages": []}
+    result = call(server, "format", path=str(target))
+    assert result == {"status": 0, "messages": []}
+    assert call(server, "stats") == {"hits": 3, "misses": 3}
+
+    # changes invalidate cached results
+    target.write_text("a\n", encoding="utf-8")
+    result = call(server, "validate", path=str(target))
+    assert result["status"] == 1
+
+
+@pytest.mark.parametrize(
+    "line, code",
+    [
+        pytest.param("{", PARSE_ERROR, id="parse-error"),
+        pytest.param("[]", INVALID_REQUEST, id="not-an-object"),
+        pytest.param('{"jsonrpc": "2.0", "id": 1}', INVALID_REQUEST, id="no-method"),
+        pytest.param(
+            '{"jsonrpc": "2.0", "id": 1, "method": "spam"}',
+            METHOD_NOT_FOUND,
+            id="unknown-method",
+        ),
+        pytest.param(
+            '{"jsonrpc": "2.0", "id": 1, "method": "load", "params": {}}',
+            INVALID_PARAMS,
+            id="missing-params",
+        ),
+        pytest.param(
+            '{"jsonrpc": "2.0", "id": 1, "method": "load", "params": {"text": "", "eggs": 1}}',
+            INVALID_PARAMS,
+            id="unknown-params",
+        ),
+        pytest.param(
+            '{"jsonrpc": "2.0", "id": 1, "method": "load", "params": {"text": "", "sections": "eggs"}}',
+            INVALID_PARAMS,
+            id="invalid-sections",
+        ),
+    ],
+)
+def test_errors(line: str, code: int) -> None:
+    response = Server().handle_line(line)
+    assert response is not None
+    assert json.loads(response)["error"]["code"] == code
+
+
+@pytest.mark.parametrize(
+    "method, params",
+    [
+        pytest.param("validate", {"text": 5}, id="text"),
+        pytest.param("validate", {"text": "a 1", "sections": ["x"]}, id="sections"),
+        pytest.param("load", {"path": 3}, id="path"),
+        pytest.param("format", {"text": "a 1", "diff": 1}, id="flag"),
+        pytest.param(
+            "load", {"text": "a 1", "integer_casting": "x"}, id="integer-casting"
+        ),
+    ],
+)
+def test_invalid_params(method: str, params: dict[str, Any]) -> None:
+    # invalid requests are answered, and don't stop the server
+    lines = [
+        {"jsonrpc": "2.0", "id": 1, "method": method, "params": params},
+        {"jsonrpc": "2.0", "id": 2, "method": "validate", "params": {"text": "a 1"}},
+    ]
+    rfile = BytesIO(b"\n".join(json.dumps(line).encode() for line in lines) + b"\n")
+    wfile = StringIO()
+    serve_stdio(Server(), rfile, wfile)
+    first, second = (json.loads(line) for line in wfile.getvalue().splitlines())
+    assert first["id"] == 1
+    assert first["error"]["code"] == INVALID_PARAMS
+    assert first["error"]["message"].startswith("Invalid value for")
+    assert second["result"] == {"status": 0, "messages": ["Validated <text>"]}
+
+
+def test_internal_error() -> None:
+    # unexpected errors are reported, and don't stop the server
+    server = Server()
+    result = call(server, "load", path="a\0b")
+    assert result["code"] == INTERNAL_ERROR
+    assert result["message"] == "ValueError: embedded null byte"
+    assert call(server, "validate", text="a 1")["status"] == 0
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="requires Unix sockets")
+class TestSocket:
+    @pytest.fixture
+    def socket_path(self) -> Generator[str, None, None]:
+        # socket paths are limited to about a hundred characters,
+        # which pytest's tmp_path may exceed
+        tmpdir = tempfile.mkdtemp(prefix="inifix-")
+        yield str(Path(tmpdir) / "inifix.sock")
+        shutil.rmtree(tmpdir)
+
+    @pytest.fixture
+    def running(self, socket_path: str) -> Generator[Server, None, None]:
+        from inifix_cli._server import serve_socket
+
+        server = Server()
+        ready = Event()
+        unix_servers: list[socketserver.BaseServer] = []
+
+        def on_ready(unix_server: socketserver.BaseServer) -> None:
+            unix_servers.append(unix_server)
+            ready.set()
+
+        thread = Thread(
+            target=serve_socket, args=(server, socket_path), kwargs={"ready": on_ready}
+        )
+        thread.start()
+        assert ready.wait(timeout=5)
+        yield server
+        unix_servers[0].shutdown()
+        thread.join()
+        assert not Path(socket_path).exists()
+
+    def test_request(self, running: Server, socket_path: str) -> None:
+        calls = [("validate", {"text": f"a {i}"}) for i in range(1000)]
+        results = request(socket_path, calls)
+        assert results is not None
+        assert len(results) == 1000
+        assert all(
+            r == {"status": 0, "messages": ["Validated <text>"]} for r in results
+        )
+
+    def test_no_server(self, socket_path: str) -> None:
+        assert request(socket_path, [("validate", {"text": "a 1"})]) is None
+
+    def test_client(
+        self,
+        running: Server,
+        socket_path: str,
+        unformatted_files: list[Path],
+        datadir_root: Path,
+    ) -> None:
+        args = ["client", "--socket", socket_path, "format"]
+        result = runner.invoke(app, [*args, *(str(f) for f in unformatted_files)])
+        assert result.exit_code != 0
+        assert result.stdout.splitlines() == [
+            f"Fixing {f.resolve()}" for f in sorted(unformatted_files, key=str)
+        ]
+        assert running.misses == len(unformatted_files)
+
+        expected = (datadir_root / "format-out.ini").read_text(encoding="utf-8")
+        for file in unformatted_files:
+            assert file.read_text(encoding="utf-8") == expected
+
+        result = runner.invoke(app, [*args, *(str(f) for f in unformatted_files)])
+        assert result.exit_code == 0
+        assert result.stdout == ""
+
+    def test_client_fallback(
+        self, socket_path: str, unformatted_files: list[Path]
+    ) -> None:
+        # no server is running
+        result = runner.invoke(
+            app,
+            ["client", "--socket", socket_path, "validate", str(unformatted_files[0])],
+        )
+        assert result.exit_code == 0
+        assert result.stdout == f"Validated {unformatted_files[0]}\n"
+
+    def test_client_local_options(
+        self, running: Server, socket_path: str, unformatted_files: list[Path]
+    ) -> None:
+        # directories are not forwarded
+        result = runner.invoke(
+            app,
+            [
+                "client",
+                "--socket",
+                socket_path,
+                "validate",
+                str(unformatted_files[0].parent),
+            ],
+        )
+        assert result.exit_code == 0
+        assert running.misses == 0
+
+    def test_client_server_error(
+        self,
+        running: Server,
+        socket_path: str,
+        unformatted_files: list[Path],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        def fail(**kwargs: Any) -> None:
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(running, "validate", fail)
+        result = runner.invoke(
+            app,
+            ["client", "--socket", socket_path, "validate", str(unformatted_files[0])],
+        )
+        assert result.exit_code == 1
+        assert result.stderr == "Error: Server error: RuntimeError: boom\n"
+
+    def test_missing_responses(self, socket_path: str) -> None:
+        import socket
+
+        # a server that stops after answering the first of all requests
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(socket_path)
+        listener.listen()
+
+        def answer_once() -> None:
+            conn, _ = listener.accept()
+            with conn, conn.makefile("rb") as rstream:
+                request_id = json.loads(rstream.readlines()[0])["id"]
+                response = {"jsonrpc": "2.0", "id": request_id, "result": {}}
+                conn.sendall(json.dumps(response).encode() + b"\n")
+
+        thread = Thread(target=answer_once)
+        thread.start()
+        try:
+            with pytest.raises(ServerError, match="No response to 2 request"):
+                request(socket_path, [("validate", {"text": "a 1"})] * 3)
+        finally:
+            thread.join()
+            listener.close()
+
+    def test_already_running(self, running: Server, socket_path: str) -> None:
+        result = runner.invoke(app, ["serve", "--socket", socket_path])
+        assert result.exit_code == 1
+        assert result.stderr == (
+            f"Error: Another server is already listening on {socket_path}\n"
+        )
+
+    def test_not_a_socket(self, socket_path: str) -> None:
+        path = Path(socket_path)
+        path.write_text("a 1\n", encoding="utf-8")
+        result = runner.invoke(app, ["serve", "--socket", socket_path])
+        assert result.exit_code == 1
+        assert result.stderr == f"Error: {socket_path} exists and is not a socket\n"
+        assert path.read_text(encoding="utf-8") == "a 1\n"
+
+    def test_stale_socket(self, socket_path: str) -> None:
+        import socket
+
+        from inifix_cli._server import serve_socket
+
+        # a socket file left behind by a server that is gone
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.bind(socket_path)
+
+        ready = Event()
+        unix_servers: list[socketserver.BaseServer] = []
+
+        def on_ready(unix_server: socketserver.BaseServer) -> None:
+            unix_servers.append(unix_server)
+            ready.set()
+
+        thread = Thread(
+            target=serve_socket,
+            args=(Server(), socket_path),
+            kwargs={"ready": on_ready},
+        )
+        thread.start()
+        assert ready.wait(timeout=5)
+        assert request(socket_path, [("validate", {"text": "a 1"})]) is not None
+        unix_servers[0].shutdown()
+        thread.join()
@@ -0,0 +1,155 @@
+import sys
+import time
+from collections.abc import Callable, Generator
+from pathlib import Path
+from threading import Event, Thread
+
+import pytest
+from _pytest.fixtures import SubRequest
+
+from inifix_cli import Message, TaskResults, _watch
+from inifix_cli._watch import (
+    InotifyWatcher,
+    PollingWatcher,
+    StatKey,
+    Watcher,
+    watch,
+)
+
+
+def fast_polling_watcher() -> Watcher:
+    # without backing off, so that changes are noticed quickly
+    return PollingWatcher(interval=0.005, max_interval=0.005)
+
+
+WATCHERS: list[Callable[[], Watcher]] = [fast_polling_watcher]
+if sys.platform == "linux":
+    WATCHERS.append(InotifyWatcher)
+
+
+@pytest.fixture(params=WATCHERS, ids=lambda w: w.__name__)
+def watcher(request: SubRequest) -> Watcher:
+    factory: Callable[[], Watcher] = request.param
+    return factory()
+
+
+def wait_until(predicate: Callable[[], bool], timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:  # pragma: no cover
+            raise TimeoutError
+        time.sleep(0.005)
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    def __call__(self, file: str) -> TaskResults:
+        self.calls.append(file)
+        return TaskResults(0, [Message(f"Processed {file}")])
+
+
+@pytest.fixture
+def tree(tmp_path: Path) -> list[Path]:
+    files = [tmp_path / "a.ini", tmp_path / "sub" / "b.ini"]
+    for file in files:
+        file.parent.mkdir(exist_ok=True)
+        file.write_text("a 1\n", encoding="utf-8")
+    return files
+
+
+@pytest.fixture
+def running(
+    watcher: Watcher, tree: list[Path], tmp_path: Path
+) -> Generator[Recorder, None, None]:
+    recorder = Recorder()
+    stop = Event()
+
+    def discover() -> list[str]:
+        return sorted(str(p) for p in tmp_path.rglob("*.ini"))
+
+    thread = Thread(
+        target=watch,
+        args=(recorder, discover),
+        kwargs={"watcher": watcher, "stop": stop, "timeout": 0.01},
+    )
+    thread.start()
+    # give the watcher a chance to take its initial snapshot
+    time.sleep(0.05)
+    yield recorder
+    stop.set()
+    thread.join()
+
+
+def test_modified_file(running: Recorder, tree: list[Path]) -> None:
+    tree[1].write_text("a 2\n", encoding="utf-8")
+    wait_until(lambda: running.calls == [str(tree[1])])
+
+
+def test_new_file(running: Recorder, tmp_path: Path) -> None:
+    new_file = tmp_path / "sub" / "c.ini"
+    new_file.write_text("a 1\n", encoding="utf-8")
+    wait_until(lambda: running.calls == [str(new_file)])
+
+
+def test_untouched_files(running: Recorder, tree: list[Path]) -> None:
+    time.sleep(0.1)
+    assert running.calls == []
+
+
+def test_files_rewritten_by_closure(watcher: Watcher, tree: list[Path]) -> None:
+    # files rewritten by the closure itself shouldn't trigger another pass
+    stop = Event()
+    calls: list[str] = []
+
+    def closure(file: str) -> TaskResults:
+        calls.append(file)
+        Path(file).write_text("a 3\n", encoding="utf-8")
+        return TaskResults(0, [])
+
+    thread = Thread(
+        target=watch,
+        args=(closure, lambda: [str(tree[0])]),
+        kwargs={"watcher": watcher, "stop": stop, "timeout": 0.01},
+    )
+    thread.start()
+    time.sleep(0.05)
+    tree[0].write_text("a 2\n", encoding="utf-8")
+    wait_until(lambda: calls == [str(tree[0])])
+    time.sleep(0.1)
+    stop.set()
+    thread.join()
+    assert calls == [str(tree[0])]
+
+
+def test_polling_backoff(tree: list[Path], monkeypatch: pytest.MonkeyPatch) -> None:
+    polls: list[str] = []
+    stat_key = _watch._stat_key
+
+    def spy(path: str) -> StatKey | None:
+        polls.append(path)
+        return stat_key(path)
+
+    monkeypatch.setattr(_watch, "_stat_key", spy)
+    watcher = PollingWatcher(interval=0.01, max_interval=0.04)
+    watcher.update([str(tree[0])])
+    polls.clear()
+    for _ in range(20):
+        assert watcher.wait(0.01) == set()
+    # without backing off, every call would poll the file and its directory
+    assert len(polls) <= 2 * 10
+
+    # changes reset the interval
+    tree[0].write_text("a 2\n", encoding="utf-8")
+    assert str(tree[0]) in watcher.wait(1.0)
+    assert watcher._delay == 0.01
+
+
+def test_polling_no_backoff_by_default(tree: list[Path]) -> None:
+    watcher = PollingWatcher()
+    watcher.update([str(tree[0])])
+    for _ in range(5):
+        assert watcher.wait(0.15) == set()
+    # latency stays bounded by interval while files are left untouched
+    assert watcher._delay == watcher.interval == 0.1
@@ -0,0 +1,451 @@
+"""
+A standalone benchmark runner for inifix and inifix-cli.
+
+Run from the root of the repository, within an environment where both
+packages are installed, e.g.
+
+    uv run --all-packages python scripts/benchmark.py --output results.json
+
+Results are written as JSON, and can be compared to a baseline
+
+    uv run --all-packages python scripts/benchmark.py --compare baseline.json
+
+in which case the exit status is 1 if any benchmark regressed by more
+than the given threshold.
+
+Memory footprints of loaded configurations are measured with tracemalloc,
+in bytes per parameter, with and without compact=True.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator, Mapping
+from dataclasses import asdict, dataclass, replace
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import inifix
+from inifix._corpus import PRESETS, CorpusSpec, Sample, generate
+from inifix._testing import assert_mapping_equal
+from inifix._typing import AnyConfig
+
+ROOT = Path(__file__).parents[1]
+DATA_DIR = ROOT / "tests" / "data"
+SAMPLE_FILES = ["idefix-khi.ini", "pluto-DiskPlanet.ini", "fargo_planet.cfg"]
+DEFAULT_SIZES = ["1KB", "10KB", "100KB", "1MB", "10MB", "100MB"]
+# pathological shapes, benchmarked at their preset scale
+# memory is measured over many copies of each input, up to this total size
+MEMORY_SAMPLE_SIZE = 1024**2
+DEFAULT_PRESETS = ["giant-section", "many-tiny-sections", "long-lists"]
+UNITS = {"B": 1, "KB": 1024, "MB": 1024**2, "GB": 1024**3}
+
+
+def parse_size(s: str, /) -> int:
+    s = s.strip().upper()
+    for unit, factor in sorted(UNITS.items(), key=lambda kv: -len(kv[0])):
+        if s.endswith(unit):
+            return int(float(s.removesuffix(unit)) * factor)
+    return int(s)
+
+
+def format_size(size: int, /) -> str:
+    for unit, factor in sorted(UNITS.items(), key=lambda kv: -kv[1]):
+        if size >= factor and size % factor == 0:
+            return f"{size // factor}{unit}"
+    return f"{size}B"
+
+
+# measurements
+
+
+@dataclass(frozen=True, slots=True)
+class Stats:
+    rounds: int
+    min: float
+    max: float
+    mean: float
+    median: float
+    stdev: float
+
+
+@dataclass(frozen=True, slots=True)
+class Result:
+    name: str
+    group: str
+    input: str
+    size: int
+    stats: Stats
+
+
+@dataclass(frozen=True, slots=True)
+class MemoryResult:
+    name: str
+    group: str
+    input: str
+    copies: int
+    parameters: int
+    bytes: int
+    bytes_per_parameter: float
+
+
+def measure(
+    func: Callable[[], object],
+    /,
+    *,
+    setup: Callable[[], object] | None = None,
+    min_time: float,
+    min_rounds: int,
+    max_rounds: int,
+) -> Stats:
+    # run at least min_rounds, and keep going until min_time is spent,
+    # so that fast benchmarks get enough rounds to be statistically meaningful
+    timings: list[float] = []
+    spent = 0.0
+    while len(timings) < max_rounds and (len(timings) < min_rounds or spent < min_time):
+        if setup is not None:
+            setup()
+        tstart = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - tstart
+        timings.append(elapsed)
+        spent += elapsed
+    return Stats(
+        rounds=len(timings),
+        min=min(timings),
+        max=max(timings),
+        mean=statistics.fmean(timings),
+        median=statistics.median(timings),
+        stdev=statistics.stdev(timings) if len(timings) > 1 else 0.0,
+    )
+
+
+def count_parameters(data: AnyConfig, /) -> int:
+    return sum(
+        len(value) if isinstance(value, Mapping) else 1 for value in data.values()
+    )
+
+
+def measure_memory(text: str, /, *, copies: int, compact: bool) -> int:
+    """Return the number of bytes retained by copies of a loaded configuration."""
+    # load once beforehand, so that lazy imports and caches aren't accounted for
+    inifix.loads(text, compact=compact)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        configs = [inifix.loads(text, compact=compact) for _ in range(copies)]
+        gc.collect()
+        retained, _peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del configs
+    return retained
+
+
+def schema_of(data: AnyConfig, /) -> inifix.Schema:
+    """Return a schema declaring the types found in data."""
+
+    def spec(value: Any) -> Any:
+        return [type(v) for v in value] if isinstance(value, list) else type(value)
+
+    return inifix.Schema(
+        {
+            key: {k: spec(v) for k, v in value.items()}
+            if isinstance(value, Mapping)
+            else spec(value)
+            for key, value in data.items()
+        }
+    )
+
+
+def _run_cli(*args: str) -> None:
+    subprocess.run(
+        [sys.executable, "-m", "inifix_cli", *args],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        check=False,
+    )
+
+
+def iter_benchmarks(
+    name: str, file: Path, workdir: Path, *, cli: bool
+) -> Iterator[tuple[str, Callable[[], object], Callable[[], object] | None]]:
+    """Yield (group, function, setup) triplets for a single input file."""
+    text = file.read_text(encoding="utf-8")
+    data = inifix.loads(text)
+    out = workdir / f"{name}.out"
+    copy = workdir / f"{name}.copy"
+
+    def reset_copy() -> None:
+        shutil.copyfile(file, copy)
+
+    yield "load", lambda: inifix.load(file), None
+    # snapshots are written on the first round, and read afterwards
+    yield "load-snapshot", lambda: inifix.load(file, snapshot=True), None
+    yield "loads", lambda: inifix.loads(text), None
+    schema = schema_of(data)
+    yield "loads-schema", lambda: inifix.loads(text, schema=schema), None
+    yield "dump", lambda: inifix.dump(data, out), None
+    yield "dumps", lambda: inifix.dumps(data), None
+    yield "validate", lambda: inifix.validate_inifile_schema(data), None
+    yield "format", lambda: inifix.format_string(text), None
+
+    # override a single parameter, as is typical when preparing runs
+    key, value = next(iter(data.items()))
+    updates: dict[str, Any] = (
+        {key: dict.fromkeys(list(value)[:1], "patched")}
+        if isinstance(value, Mapping)
+        else {key: "patched"}
+    )
+    yield "patch", lambda: inifix.patch(copy, updates), reset_copy
+    # combine the same override with a base file, as an alternative to patching
+    yield "overlay", lambda: inifix.overlay(updates, data).flatten(), None
+
+    # re-parse a single line, as editors do on every keystroke
+    parser = inifix.IncrementalParser(text)
+    lines = text.splitlines(keepends=True)
+    middle = len(lines) // 2
+    line = lines[middle] if lines else ""
+    yield "edit", lambda: parser.edit(middle, min(middle + 1, len(lines)), line), None
+    if cli:
+        yield "cli-validate", lambda: _run_cli("validate", str(file)), None
+        yield "cli-format", lambda: _run_cli("format", str(copy)), reset_copy
+
+
+def run(
+    *,
+    sizes: list[int],
+    presets: list[str],
+    select: str | None,
+    cli: bool,
+    seed: int,
+    min_time: float,
+    min_rounds: int,
+    max_rounds: int,
+    memory: bool,
+) -> tuple[list[Result], list[MemoryResult]]:
+    results: list[Result] = []
+    memory_results: list[MemoryResult] = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        workdir = Path(tmpdir)
+        # keep snapshots out of the user's cache
+        os.environ["INIFIX_CACHE_DIR"] = str(workdir / "cache")
+        inputs: list[tuple[str, Path]] = [(f, DATA_DIR / f) for f in SAMPLE_FILES]
+        samples: list[tuple[str, Sample]] = [
+            (
+                f"synthetic-{format_size(size)}",
+                generate(CorpusSpec(seed=seed).scaled(size)),
+            )
+            for size in sizes
+        ]
+        samples.extend(
+            (preset, generate(replace(PRESETS[preset], seed=seed)))
+            for preset in presets
+        )
+        for name, sample in samples:
+            # check correctness before measuring speed
+            assert sample.expected is not None
+            assert_mapping_equal(inifix.loads(sample.text), sample.expected)
+            file = workdir / f"{name}.ini"
+            file.write_text(sample.text, encoding="utf-8")
+            inputs.append((name, file))
+
+        for input_name, file in inputs:
+            for group, func, setup in iter_benchmarks(
+                input_name, file, workdir, cli=cli
+            ):
+                name = f"{group}[{input_name}]"
+                if select is not None and select not in name:
+                    continue
+                stats = measure(
+                    func,
+                    setup=setup,
+                    min_time=min_time,
+                    min_rounds=min_rounds,
+                    max_rounds=max_rounds,
+                )
+                print(
+                    f"{name:<40} {stats.min * 1e3:>12.3f} ms (min of {stats.rounds})",
+                    flush=True,
+                )
+                results.append(
+                    Result(name, group, input_name, file.stat().st_size, stats)
+                )
+
+            if not memory:
+                continue
+            text = file.read_text(encoding="utf-8")
+            parameters = count_parameters(inifix.loads(text))
+            copies = max(1, MEMORY_SAMPLE_SIZE // len(text))
+            for group, compact in [("memory", False), ("memory-compact", True)]:
+                name = f"{group}[{input_name}]"
+                if select is not None and select not in name:
+                    continue
+                retained = measure_memory(text, copies=copies, compact=compact)
+                per_parameter = retained / (copies * parameters)
+                print(f"{name:<40} {per_parameter:>12.1f} B/parameter", flush=True)
+                memory_results.append(
+                    MemoryResult(
+                        name,
+                        group,
+                        input_name,
+                        copies,
+                        copies * parameters,
+                        retained,
+                        per_parameter,
+                    )
+                )
+    return results, memory_results
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            check=True,
+            encoding="utf-8",
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def to_json(
+    results: list[Result], memory_results: list[MemoryResult]
+) -> dict[str, Any]:
+    return {
+        "machine_info": {
+            "python_implementation": platform.python_implementation(),
+            "python_version": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "inifix_version": inifix.__version__,
+        "commit": _git_revision(),
+        "datetime": datetime.now(UTC).isoformat(),
+        "benchmarks": [asdict(r) for r in results],
+        "memory": [asdict(r) for r in memory_results],
+    }
+
+
+def compare(
+    results: dict[str, Any], baseline: dict[str, Any], *, threshold: float
+) -> bool:
+    """
+    Print a comparison table and return True if any benchmark regressed,
+    comparing the best timings (and memory footprints) of each benchmark
+    found in both sets.
+    """
+    reference = {b["name"]: b["stats"]["min"] for b in baseline["benchmarks"]}
+    regressed = False
+    print(f"\n{'benchmark':<40} {'baseline':>12} {'current':>12} {'ratio':>8}")
+    for bench in results["benchmarks"]:
+        if (ref := reference.get(bench["name"])) is None:
+            continue
+        ratio = bench["stats"]["min"] / ref
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  REGRESSION"
+            regressed = True
+        print(
+            f"{bench['name']:<40} {ref * 1e3:>9.3f} ms {bench['stats']['min'] * 1e3:>9.3f} ms"
+            f" {ratio:>8.2f}{flag}"
+        )
+
+    reference = {
+        b["name"]: b["bytes_per_parameter"] for b in baseline.get("memory", [])
+    }
+    for bench in results["memory"]:
+        if (ref := reference.get(bench["name"])) is None:
+            continue
+        ratio = bench["bytes_per_parameter"] / ref
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  REGRESSION"
+            regressed = True
+        print(
+            f"{bench['name']:<40} {ref:>10.1f} B {bench['bytes_per_parameter']:>10.1f} B"
+            f" {ratio:>8.2f}{flag}"
+        )
+    return regressed
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "-o", "--output", type=Path, help="write results to a JSON file"
+    )
+    parser.add_argument(
+        "--compare", type=Path, metavar="BASELINE", help="compare to baseline results"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="relative slowdown above which a benchmark is considered a regression (default: 0.1)",
+    )
+    parser.add_argument(
+        "--sizes",
+        default=",".join(DEFAULT_SIZES),
+        help=f"comma-separated sizes of synthetic inputs (default: {','.join(DEFAULT_SIZES)})",
+    )
+    parser.add_argument(
+        "--presets",
+        default=",".join(DEFAULT_PRESETS),
+        help=f"comma-separated corpus presets (default: {','.join(DEFAULT_PRESETS)})",
+    )
+    parser.add_argument(
+        "-k", "--select", help="only run benchmarks whose name contains this string"
+    )
+    parser.add_argument("--no-cli", action="store_true", help="skip CLI benchmarks")
+    parser.add_argument(
+        "--no-memory", action="store_true", help="skip memory benchmarks"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.5,
+        help="minimal time to spend on each benchmark, in seconds (default: 0.5)",
+    )
+    parser.add_argument("--min-rounds", type=int, default=3)
+    parser.add_argument("--max-rounds", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    sizes = [parse_size(s) for s in args.sizes.split(",") if s]
+    results = to_json(
+        *run(
+            sizes=sizes,
+            presets=[p for p in args.presets.split(",") if p],
+            select=args.select,
+            cli=not args.no_cli,
+            seed=args.seed,
+            min_time=args.min_time,
+            min_rounds=args.min_rounds,
+            max_rounds=args.max_rounds,
+            memory=not args.no_memory,
+        )
+    )
+    if args.output is not None:
+        args.output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        if compare(results, baseline, threshold=args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
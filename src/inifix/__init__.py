@@ -1,15 +1,123 @@
-from ._io import dump, dumps, load, loads
-from ._validation import validate_inifile_schema
-from ._format import format_string
-from ._version import *
-
 __all__ = [
+    "Document",
+    "IncrementalParser",
+    "Index",
+    "Overlay",
+    "Schema",
+    "SharedConfig",
     "dump",
+    "dump_from",
     "dumps",
     "load",
+    "load_columns",
+    "load_into",
     "loads",
     "validate_inifile_schema",
     "format_string",
+    "profile_load",
+    "diff",
+    "patch",
+    "overlay",
+    "share",
     "__version__",
     "__version_tuple__",
 ]
+
+# avoid importing typing at runtime
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from ._document import Document
+    from ._incremental import IncrementalParser
+    from ._index import Index
+    from ._binding import dump_from, load_into
+    from ._columns import load_columns
+    from ._io import dump, dumps, load, loads
+    from ._validation import validate_inifile_schema
+    from ._format import format_string
+    from ._profiling import profile_load
+    from ._diff import diff
+    from ._patch import patch
+    from ._schema import Schema
+    from ._shared import SharedConfig, share
+    from ._overlay import Overlay, overlay
+    from ._version import __version__, __version_tuple__
+
+
+# public attributes are loaded on first access, so that importing inifix
+# stays cheap for applications that only use parts of the library
+def __getattr__(name: str) -> object:
+    match name:
+        case "Document":
+            from inifix import _document
+
+            value = getattr(_document, name)
+        case "IncrementalParser":
+            from inifix import _incremental
+
+            value = getattr(_incremental, name)
+        case "Index":
+            from inifix import _index
+
+            value = getattr(_index, name)
+        case "dump" | "dumps" | "load" | "loads":
+            from inifix import _io
+
+            value = getattr(_io, name)
+        case "dump_from" | "load_into":
+            from inifix import _binding
+
+            value = getattr(_binding, name)
+        case "load_columns":
+            from inifix import _columns
+
+            value = getattr(_columns, name)
+        case "validate_inifile_schema":
+            from inifix import _validation
+
+            value = getattr(_validation, name)
+        case "format_string":
+            from inifix import _format
+
+            value = getattr(_format, name)
+        case "profile_load":
+            from inifix import _profiling
+
+            value = getattr(_profiling, name)
+        case "diff":
+            from inifix import _diff
+
+            value = getattr(_diff, name)
+        case "patch":
+            from inifix import _patch
+
+            value = getattr(_patch, name)
+        case "Schema":
+            from inifix import _schema
+
+            value = getattr(_schema, name)
+        case "SharedConfig" | "share":
+            from inifix import _shared
+
+            value = getattr(_shared, name)
+        case "Overlay" | "overlay":
+            from inifix import _overlay
+
+            value = getattr(_overlay, name)
+        case "_compact" | "_frozen" | "_schema":
+            # referred to in annotations of the IO API, but only imported
+            # when needed
+            from importlib import import_module
+
+            value = import_module(f"{__name__}.{name}")
+        case "__version__" | "__version_tuple__":
+            from inifix import _version
+
+            value = getattr(_version, name)
+        case _:
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
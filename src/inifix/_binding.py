@@ -0,0 +1,348 @@
+__all__ = [
+    "dump_from",
+    "load_into",
+]
+
+import dataclasses
+import os
+import types
+import typing
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import reduce
+from io import IOBase
+from operator import or_
+from threading import Lock
+from typing import IO, Any, AnyStr, TypeVar, final
+from weakref import WeakKeyDictionary
+
+from inifix._io import _normalize_data, _parse_error, _section_regexp, split_tokens
+from inifix._schema import _compile_values, _describe
+from inifix._validation import collect_exceptions_for_elementary_item
+
+T = TypeVar("T")
+
+
+@final
+@dataclass(frozen=True, slots=True)
+class _Field:
+    name: str
+    # the key in files
+    key: str
+    required: bool
+    # parameters only: tokens to value
+    cast: Callable[[list[str]], Any] | None = None
+    # sections only
+    binding: "_Binding | None" = None
+
+
+@final
+@dataclass(frozen=True, slots=True)
+class _Binding:
+    cls: type
+    # fields, by key. A class either binds sections, or parameters
+    fields: dict[str, _Field]
+    has_sections: bool
+
+    def build(self, kwargs: dict[str, Any], /, *, section: str | None) -> Any:
+        if missing := [
+            f.key for f in self.fields.values() if f.required and f.name not in kwargs
+        ]:
+            where = "" if section is None else f" in section {section!r}"
+            raise ValueError(
+                f"Missing required parameter(s){where}: {', '.join(map(repr, missing))}"
+            )
+        return self.cls(**kwargs)
+
+
+_bindings: WeakKeyDictionary[type, _Binding] = WeakKeyDictionary()
+_bindings_lock = Lock()
+
+
+def _get_binding(cls: type, /) -> _Binding:
+    with _bindings_lock:
+        if (binding := _bindings.get(cls)) is None:
+            binding = _bindings[cls] = _compile(cls, nested=False)
+        return binding
+
+
+def _is_dataclass_type(tp: Any, /) -> bool:
+    return isinstance(tp, type) and dataclasses.is_dataclass(tp)
+
+
+def _strip_optional(tp: Any, /) -> Any:
+    # optional fields default to None, which can't be parsed
+    args = typing.get_args(tp)
+    if typing.get_origin(tp) in (types.UnionType, typing.Union) and (
+        type(None) in args
+    ):
+        return reduce(or_, (a for a in args if a is not type(None)))
+    return tp
+
+
+def _compile_converter(tp: Any, /) -> Callable[[list[str]], Any]:
+    # convert a field type to a Schema specification, and parse results to
+    # the field's shape
+    origin = typing.get_origin(tp)
+    args = typing.get_args(tp)
+    if origin is list:
+        return _compile_values(types.GenericAlias(list, args))
+    if origin is tuple:
+        spec = [args[0], ...] if len(args) == 2 and args[1] is Ellipsis else [*args]
+        cast_list = _compile_values(spec)
+        return lambda raw: tuple(cast_list(raw))
+    if origin is typing.Union:
+        # typing.Union[int, str], as opposed to int | str
+        tp = reduce(or_, args)
+    cast_scalar = _compile_values(tp)
+    return lambda raw: cast_scalar(raw)[0]
+
+
+def _compile(cls: type, /, *, nested: bool) -> _Binding:
+    if not _is_dataclass_type(cls):
+        raise TypeError(f"Expected a dataclass, got {cls!r}")
+    hints = typing.get_type_hints(cls)
+    fields: dict[str, _Field] = {}
+    kinds: set[bool] = set()
+    for field in dataclasses.fields(cls):
+        if not field.init:
+            continue
+        key = field.metadata.get("inifix", field.name)
+        if exceptions := collect_exceptions_for_elementary_item(key, 0):
+            raise ValueError(
+                f"Invalid key for field {cls.__name__}.{field.name}"
+            ) from exceptions[0]
+        required = (
+            field.default is dataclasses.MISSING
+            and field.default_factory is dataclasses.MISSING
+        )
+        tp = _strip_optional(hints[field.name])
+        is_section = _is_dataclass_type(tp)
+        kinds.add(is_section)
+        if is_section:
+            if nested:
+                raise TypeError(
+                    f"Field {cls.__name__}.{field.name} has type {tp.__name__}, "
+                    "but sections can't be nested"
+                )
+            binding = _compile(tp, nested=True)
+            fields[key] = _Field(field.name, key, required, binding=binding)
+            continue
+        try:
+            cast = _compile_converter(tp)
+        except TypeError as exc:
+            raise TypeError(
+                f"Unsupported type {_describe(tp)} for field {cls.__name__}.{field.name}"
+            ) from exc
+        fields[key] = _Field(field.name, key, required, cast=cast)
+    if len(kinds) > 1:
+        raise TypeError(
+            f"{cls.__name__} mixes sections and parameters. "
+            "Expected either only dataclass fields (sections) or none"
+        )
+    return _Binding(cls, fields, has_sections=kinds == {True})
+
+
+def _read(source: str | os.PathLike[str] | IO[AnyStr], /) -> tuple[str, str]:
+    if isinstance(source, IOBase):
+        filename = str(getattr(source, "name", repr(source)))
+        data = source.read()
+    else:
+        filename = os.fspath(source)  # type: ignore[arg-type]
+        with open(filename, "rb") as fh:
+            data = fh.read()
+    if isinstance(data, bytes):
+        data = data.decode("utf-8")
+    return filename, data
+
+
+def load_into(
+    source: str | os.PathLike[str] | IO[AnyStr],
+    cls: type[T],
+    /,
+    *,
+    ignore_unknown: bool = False,
+) -> T:
+    """
+    Parse a file directly into a dataclass instance.
+
+    Each field of cls is bound to a parameter, or, if its type is a dataclass,
+    to a section. Parameters are bound to fields by name, unless a key is set
+    in the field's metadata, with the "inifix" entry, as in
+
+        x1_grid: list[int | float | str] = field(metadata={"inifix": "X1-grid"})
+
+    Supported field types are int, float, bool, str and unions of these,
+    list[T], tuple[T, ...], tuple[T1, T2, ...] and optional variants of any
+    of these (e.g., float | None). Tokens are cast directly to their field's
+    type, as with an inifix.Schema, without building an intermediate
+    configuration. Fields with a default may be missing from the file.
+
+    Bindings are compiled once per class, on first use.
+
+    Parameters
+    ----------
+    source: any of the following
+        - the name of a file to read from, (str or os.PathLike)
+        - a readable handle. Both text and binary file modes are supported,
+          though binary is preferred.
+          In binary mode, we assume UTF-8 encoding.
+
+    cls: a dataclass
+
+    ignore_unknown: bool (default: False)
+        if set to True, parameters and sections that are not bound to any field
+        are ignored. By default, they are parse errors.
+
+    Returns
+    -------
+    an instance of cls
+
+    Raises
+    ------
+    TypeError: if cls is not a dataclass, or has fields of unsupported types
+    ValueError: if the file is empty or can't be parsed, has values that can't
+      be cast to their field's type, or is missing required parameters or
+      sections
+
+    See Also
+    --------
+    inifix.dump_from
+
+    .. versionadded: 7.1.0
+    """
+    binding = _get_binding(cls)
+    filename, data = _read(source)
+    lines = _normalize_data(data)
+    if not "".join(lines):
+        raise ValueError(f"{filename!r} appears to be empty.")
+    is_section_header = _section_regexp().fullmatch
+
+    # keyword arguments of the current section (or of the top level
+    # binding, in sectionless files), by field name
+    kwargs: dict[str, Any] | None
+    section_kwargs: dict[str, dict[str, Any]] = {}
+    fields: dict[str, _Field]
+    if binding.has_sections:
+        # as with inifix.load, parameters found before the first section are
+        # ignored
+        kwargs = None
+        fields = {}
+    else:
+        kwargs = {}
+        fields = binding.fields
+
+    for lineno, line in enumerate(lines, start=1):
+        if not line:
+            continue
+        if match := is_section_header(line):
+            title = match["title"]
+            if not binding.has_sections:
+                raise _parse_error(
+                    line, lineno, filename, f"{cls.__name__} has no section fields"
+                )
+            section = binding.fields.get(title)
+            if section is None:
+                if not ignore_unknown:
+                    raise _parse_error(
+                        line, lineno, filename, f"unknown section {title!r}"
+                    )
+                kwargs = None
+                continue
+            assert section.binding is not None
+            fields = section.binding.fields
+            # as with inifix.load, a repeated section replaces the first one
+            kwargs = section_kwargs[title] = {}
+            continue
+        if kwargs is None:
+            continue
+
+        key, *raw_values = split_tokens(line)
+        if not raw_values:
+            raise _parse_error(line, lineno, filename)
+        if (field := fields.get(key)) is None:
+            if ignore_unknown:
+                continue
+            raise _parse_error(line, lineno, filename, f"unknown parameter {key!r}")
+        assert field.cast is not None
+        try:
+            kwargs[field.name] = field.cast(raw_values)
+        except ValueError as exc:
+            raise _parse_error(line, lineno, filename, f"{key!r}: {exc}") from None
+
+    if not binding.has_sections:
+        assert kwargs is not None
+        return binding.build(kwargs, section=None)  # type: ignore[no-any-return]
+
+    sections: dict[str, Any] = {}
+    for title, field in binding.fields.items():
+        assert field.binding is not None
+        if title in section_kwargs:
+            sections[field.name] = field.binding.build(
+                section_kwargs[title], section=title
+            )
+        elif field.required:
+            raise ValueError(f"Missing required section {title!r} in {filename}")
+    return binding.cls(**sections)  # type: ignore[no-any-return]
+
+
+def _to_section(binding: _Binding, obj: Any, /) -> dict[str, Any]:
+    section: dict[str, Any] = {}
+    for key, field in binding.fields.items():
+        value = getattr(obj, field.name)
+        if value is None:
+            # optional fields
+            continue
+        section[key] = list(value) if isinstance(value, tuple) else value
+    return section
+
+
+def dump_from(
+    obj: Any,
+    /,
+    file: str | os.PathLike[str] | IO[AnyStr],
+) -> None:
+    """
+    Write a dataclass instance to a file.
+
+    This is the reverse of inifix.load_into: fields are written as parameters,
+    or sections, with the same keys. Optional fields set to None are omitted.
+
+    Parameters
+    ----------
+    obj: a dataclass instance
+        fields must have types supported by inifix.load_into
+
+    file: any of the following
+        - the name of a file to write to (str or os.PathLike)
+        - a writable handle. Both text and binary file modes are supported,
+          though binary is preferred.
+          In binary mode, data is encoded as UTF-8.
+
+    Raises
+    ------
+    TypeError: if obj is not a dataclass instance, or has fields of
+      unsupported types
+    ValueError: if field values are not valid inifix values
+
+    See Also
+    --------
+    inifix.load_into
+
+    .. versionadded: 7.1.0
+    """
+    from inifix._io import dump
+
+    if isinstance(obj, type):
+        raise TypeError(f"Expected a dataclass instance, got {obj!r}")
+    binding = _get_binding(type(obj))
+    data: dict[str, Any]
+    if binding.has_sections:
+        data = {}
+        for key, field in binding.fields.items():
+            assert field.binding is not None
+            if (section := getattr(obj, field.name)) is not None:
+                data[key] = _to_section(field.binding, section)
+    else:
+        data = _to_section(binding, obj)
+    dump(data, file)
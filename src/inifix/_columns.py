@@ -0,0 +1,288 @@
+__all__ = [
+    "Column",
+    "ColumnTable",
+    "load_columns",
+]
+
+import os
+from array import array
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from functools import cache, lru_cache, partial
+from typing import TYPE_CHECKING, Any, Literal, final
+
+from inifix._compact import _INT64_MAX, _INT64_MIN
+from inifix._io import _get_caster, _normalize_data, _section_regexp, tokenize_line
+from inifix._typing import CasterFunction, Scalar
+from inifix._validation import collect_exceptions_for_elementary_item
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+    import pandas as pd
+
+# (section, key, values), with section set to None for sectionless files
+_Record = tuple[str | None, str, list[Scalar]]
+
+
+@cache
+def _cached_caster(
+    integer_casting: Literal["stable", "aggressive"], /
+) -> CasterFunction:
+    # values are mostly repeated across files of a same collection,
+    # and casting is pure, so results can be shared
+    return lru_cache(maxsize=65536)(_get_caster(integer_casting))
+
+
+@lru_cache(maxsize=4096)
+def _is_valid_key(key: str, /) -> bool:
+    return not collect_exceptions_for_elementary_item(key, 0)
+
+
+def _read_records(
+    path: str, /, *, integer_casting: Literal["stable", "aggressive"], validate: bool
+) -> list[_Record]:
+    # runs in worker processes. Same rules as inifix.load, but parameters
+    # are collected in a flat list rather than in nested dicts
+    with open(path, "rb") as fh:
+        lines = _normalize_data(fh.read())
+    if not "".join(lines):
+        raise ValueError(f"{path!r} appears to be empty.")
+    caster = _cached_caster(integer_casting)
+    is_section_header = _section_regexp().fullmatch
+    records: list[_Record] = []
+    section: str | None = None
+    seen: set[str] = set()
+    for lineno, line in enumerate(lines, start=1):
+        if not line:
+            continue
+        if match := is_section_header(line):
+            if section is None:
+                # as in inifix.load, parameters found before the first
+                # section are ignored
+                records.clear()
+            section = match["title"]
+            if section in seen:
+                # as in inifix.load, a repeated section replaces the first one
+                records = [r for r in records if r[0] != section]
+            seen.add(section)
+            continue
+        key, values = tokenize_line(
+            line, line_number=lineno, filename=path, caster=caster
+        )
+        records.append((section, key, values))
+
+    if validate:
+        # values are always valid, since they were just parsed
+        exceptions = [
+            exc
+            for _, key, values in records
+            if not _is_valid_key(key)
+            for exc in collect_exceptions_for_elementary_item(key, values)
+        ]
+        if exceptions:
+            raise ExceptionGroup(f"Invalid schema in {path}", exceptions)
+    return records
+
+
+@final
+@dataclass(frozen=True, slots=True)
+class Column:
+    """
+    Values of a parameter (or of a single position in lists of values)
+    across many files.
+
+    values: an array.array('q') of ints or array.array('d') of floats if all
+      values are of that type (and ints fit in 64 bits), otherwise a list.
+      Missing values are stored as 0 in int arrays, nan in float arrays,
+      and None in lists.
+    mask: one byte per file, set to 1 where the value is missing
+    """
+
+    values: "array[int] | array[float] | list[Scalar | None]"
+    mask: bytearray
+
+    def __len__(self) -> int:
+        return len(self.mask)
+
+
+def _build_column(n: int, rows: list[int], values: list[Scalar], /) -> Column:
+    mask = bytearray(b"\x01") * n
+    for row in rows:
+        mask[row] = 0
+
+    column: array[int] | array[float] | list[Scalar | None]
+    if all(type(v) is float for v in values):
+        column = array("d", [float("nan")]) * n
+    elif all(type(v) is int and _INT64_MIN <= v <= _INT64_MAX for v in values):
+        column = array("q", [0]) * n
+    else:
+        column = [None] * n
+    for row, value in zip(rows, values, strict=True):
+        column[row] = value  # type: ignore[assignment]
+    return Column(column, mask)
+
+
+@final
+class ColumnTable:
+    """
+    Parameters from many files, stored by column.
+
+    Parameters are named after their section and key (e.g., "Hydro.gamma"),
+    or only their key, if they're not in a section. Parameters holding more
+    than one value in any file are split into one column per position
+    (e.g., "Grid.X1-grid[0]", "Grid.X1-grid[1]", ...).
+
+    Attributes
+    ----------
+    paths: list[str]
+      the files, one per row
+
+    columns: dict[str, Column]
+      columns, in order of first appearance
+
+    .. versionadded: 7.1.0
+    """
+
+    __slots__ = ("columns", "paths")
+
+    def __init__(self, paths: list[str], columns: dict[str, Column], /) -> None:
+        self.paths = paths
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def __repr__(self) -> str:
+        return (
+            f"<{type(self).__name__} with {len(self.paths)} rows "
+            f"and {len(self.columns)} columns>"
+        )
+
+    def to_pandas(self) -> "pd.DataFrame":
+        """
+        Convert to a pandas.DataFrame, indexed by path.
+
+        int and float columns are converted to pandas' nullable Int64 and
+        Float64 types, so missing values are distinct from nan.
+
+        Raises
+        ------
+        ImportError: if pandas isn't installed
+        """
+        try:
+            import numpy as np
+            import pandas as pd
+        except ImportError as exc:
+            raise ImportError(
+                "ColumnTable.to_pandas requires pandas to be installed"
+            ) from exc
+
+        data: dict[str, Any] = {}
+        for name, column in self.columns.items():
+            mask = np.frombuffer(column.mask, dtype=np.bool_)
+            match column.values:
+                case array(typecode="q"):
+                    data[name] = pd.arrays.IntegerArray(
+                        np.frombuffer(column.values, dtype=np.int64), mask
+                    )
+                case array(typecode="d"):
+                    data[name] = pd.arrays.FloatingArray(
+                        np.frombuffer(column.values, dtype=np.float64), mask
+                    )
+                case _:
+                    data[name] = np.array(column.values, dtype=object)
+        return pd.DataFrame(data, index=pd.Index(self.paths, name="path"))
+
+
+def load_columns(
+    paths: Iterable[str | os.PathLike[str]],
+    /,
+    *,
+    integer_casting: Literal["stable", "aggressive"] = "stable",
+    skip_validation: bool = False,
+    executor: "Executor | None" = None,
+) -> ColumnTable:
+    """
+    Load many files into a table, with one row per file and one column per
+    parameter.
+
+    Files are parsed with the same rules as inifix.load, but parameters are
+    collected directly into columns, without building a dict per file.
+    Homogeneous columns of ints or floats are stored as array.array objects.
+
+    Parameters
+    ----------
+    paths: iterable of paths
+      the files to load
+
+    integer_casting: 'stable' (default) or 'aggressive'
+      see inifix.load
+
+    skip_validation: bool (default: False)
+      if set to True, parameter names are not validated
+
+    executor: concurrent.futures.Executor, optional
+      used to read and parse files in parallel.
+      By default, files are processed serially.
+
+    Returns
+    -------
+    ColumnTable
+      use its to_pandas() method to get a pandas.DataFrame
+
+    Raises
+    ------
+    ValueError: if any file is empty or can't be parsed
+    ExceptionGroup: if any file contains invalid parameter names
+
+    .. versionadded: 7.1.0
+    """
+    # validate this eagerly, rather than from workers
+    _get_caster(integer_casting)
+    files = [os.fspath(p) for p in paths]
+    read = partial(
+        _read_records, integer_casting=integer_casting, validate=not skip_validation
+    )
+    results: Iterator[list[_Record]]
+    if executor is None:
+        results = map(read, files)
+    else:
+        results = executor.map(read, files, chunksize=64)
+
+    # (section, key) -> rows and values, in order of first appearance
+    rows: dict[tuple[str | None, str], list[int]] = {}
+    values: dict[tuple[str | None, str], list[list[Scalar]]] = {}
+    for row, records in enumerate(results):
+        for section, key, vals in records:
+            param = (section, key)
+            if (param_rows := rows.get(param)) is None:
+                rows[param] = [row]
+                values[param] = [vals]
+            elif param_rows[-1] == row:
+                # as in inifix.load, the last occurrence of a key wins
+                values[param][-1] = vals
+            else:
+                param_rows.append(row)
+                values[param].append(vals)
+
+    n = len(files)
+    columns: dict[str, Column] = {}
+    for param, param_rows in rows.items():
+        section, key = param
+        name = key if section is None else f"{section}.{key}"
+        param_values = values[param]
+        size = max(map(len, param_values))
+        if size == 1:
+            columns[name] = _build_column(n, param_rows, [v[0] for v in param_values])
+            continue
+        for i in range(size):
+            present = [
+                (row, v[i])
+                for row, v in zip(param_rows, param_values, strict=True)
+                if len(v) > i
+            ]
+            columns[f"{name}[{i}]"] = _build_column(
+                n, [row for row, _ in present], [v for _, v in present]
+            )
+    return ColumnTable(files, columns)
@@ -0,0 +1,182 @@
+__all__ = [
+    "CompactMapping",
+    "compact",
+]
+
+import sys
+from array import array
+from collections.abc import Iterator, Mapping, Sequence
+from threading import Lock
+from typing import Any, final
+from weakref import WeakValueDictionary
+
+from inifix._typing import AnyConfig, Scalar
+
+# bounds of the 'q' typecode (signed 64-bit integers)
+_INT64_MIN = -(2**63)
+_INT64_MAX = 2**63 - 1
+
+
+@final
+class _Layout:
+    # keys and their positions, shared by all mappings with the same keys
+    __slots__ = ("__weakref__", "index", "keys")
+
+    def __init__(self, keys: tuple[str, ...], /) -> None:
+        self.keys = keys
+        # only built once the layout is shared, see _get_layout
+        self.index: dict[str, int] | None = None
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # layouts are shared within a process, and rebuilt on unpickling
+        return (_layout_from_keys, (self.keys,))
+
+
+# layouts are keyed by their own keys, so that these are only stored once
+_layouts: WeakValueDictionary[tuple[str, ...], _Layout] = WeakValueDictionary()
+_layouts_lock = Lock()
+
+
+def _get_layout(keys: tuple[str, ...], /) -> tuple[_Layout, bool]:
+    # return a layout, and whether it is shared with an existing mapping
+    with _layouts_lock:
+        if (layout := _layouts.get(keys)) is None:
+            # the first mapping with a layout holds its values in a dict, so
+            # neither interned keys nor an index are needed until it's reused
+            layout = _layouts[keys] = _Layout(keys)
+            return layout, False
+        if layout.index is None:
+            del _layouts[keys]
+            layout.keys = tuple(sys.intern(k) for k in keys)
+            # values are stored after the layout itself, hence the offset
+            layout.index = {key: i for i, key in enumerate(layout.keys, start=1)}
+            _layouts[layout.keys] = layout
+        return layout, True
+
+
+def _layout_from_keys(keys: tuple[str, ...], /) -> _Layout:
+    return _get_layout(keys)[0]
+
+
+@final
+class _Packed(tuple[Any, ...]):
+    # a layout, followed by values. Nested sections are stored in this form
+    # rather than as CompactMapping objects, which saves an object per section
+    __slots__ = ()
+
+
+@final
+class _Unshared(tuple[Any, ...]):
+    # a layout, followed by a dict of values. The first mapping with a given
+    # layout is stored in this form, so that data that is never shared doesn't
+    # cost more than plain dicts
+    __slots__ = ()
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        layout, values = self
+        return (_unshared, (layout, tuple(values.values())))
+
+
+def _unshared(layout: _Layout, values: tuple[Any, ...], /) -> _Unshared:
+    return _Unshared((layout, dict(zip(layout.keys, values, strict=True))))
+
+
+@final
+class CompactMapping(Mapping[str, Any]):
+    """
+    A read-only mapping with a small memory footprint.
+
+    Keys are interned, and key layouts are shared between all mappings
+    with the same keys, so each mapping only holds a tuple of values.
+    Savings depend on layouts being shared: the first mapping with a given
+    layout holds its values in a dict, as a plain mapping would, and its
+    strings are only interned once the layout is reused.
+    Homogeneous lists of ints or floats are stored as array.array objects,
+    which should not be mutated, other lists are stored as tuples.
+    """
+
+    __slots__ = ("_data",)
+
+    _data: _Packed | _Unshared
+
+    def __init__(self, data: Mapping[str, Any], /) -> None:
+        self._data = _pack(data)
+
+    def __getitem__(self, key: str, /) -> Any:
+        data = self._data
+        if type(data) is _Packed:
+            value = data[data[0].index[key]]
+        else:
+            value = data[1][key]
+        if type(value) is _Packed or type(value) is _Unshared:
+            return _wrap(value)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data[0].keys)
+
+    def __len__(self) -> int:
+        return len(self._data[0].keys)
+
+    def __contains__(self, key: object, /) -> bool:
+        data = self._data
+        if type(data) is _Packed:
+            return key in data[0].index
+        return key in data[1]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self.items())!r})"
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (_wrap, (self._data,))
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a plain, mutable copy, as returned by inifix.load."""
+        return {
+            key: value.to_dict()
+            if isinstance(value, CompactMapping)
+            else list(value)
+            if isinstance(value, (array, tuple))
+            else value
+            for key, value in self.items()
+        }
+
+
+def _wrap(data: _Packed | _Unshared, /) -> CompactMapping:
+    mapping = object.__new__(CompactMapping)
+    mapping._data = data
+    return mapping
+
+
+def _compact_value(value: Scalar | Sequence[Scalar], /, *, intern: bool) -> Any:
+    if isinstance(value, str):
+        return sys.intern(value) if intern else value
+    if not isinstance(value, Sequence):
+        return value
+    if value and all(type(v) is float for v in value):
+        return array("d", value)
+    if value and all(type(v) is int and _INT64_MIN <= v <= _INT64_MAX for v in value):
+        return array("q", value)
+    if not intern:
+        return tuple(value)
+    return tuple(sys.intern(v) if isinstance(v, str) else v for v in value)
+
+
+def _pack(data: Mapping[str, Any], /) -> _Packed | _Unshared:
+    layout, shared = _get_layout(tuple(data.keys()))
+    values = (
+        _pack(v) if isinstance(v, Mapping) else _compact_value(v, intern=shared)
+        for v in data.values()
+    )
+    if shared:
+        return _Packed((layout, *values))
+    return _Unshared((layout, dict(zip(layout.keys, values, strict=True))))
+
+
+def compact(data: AnyConfig, /) -> CompactMapping:
+    """
+    Convert a configuration to a read-only, memory-efficient mapping.
+    """
+    if isinstance(data, CompactMapping):
+        return data
+    return _wrap(_pack(data))
@@ -0,0 +1,195 @@
+"""
+Deterministic generation of synthetic inifiles, for scaling tests,
+benchmarks and fuzzing.
+"""
+
+__all__ = [
+    "PRESETS",
+    "CorpusSpec",
+    "Sample",
+    "generate",
+    "generate_corpus",
+]
+
+import math
+import random
+from dataclasses import dataclass, replace
+
+from inifix._typing import MutSection_ScalarsAllowed, Scalar
+
+_LETTERS = "abcdefghijklmnopqrstuvwxyz"
+_TRUTHY = ("true", "True", "TRUE", "yes", "Yes", "YES")
+_FALSY = ("false", "False", "FALSE", "no", "No", "NO")
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class CorpusSpec:
+    """
+    The shape of a synthetic inifile.
+
+    sections: number of sections, or 0 for a sectionless file
+    params_per_section: number of parameters in each section
+      (or in the whole file, if it has no sections)
+    values_per_param: inclusive bounds on the number of values per parameter
+    comment_ratio: fraction of lines followed or preceded by a comment
+    blank_ratio: fraction of parameter lines followed by a blank line
+    invalid_ratio: fraction of parameter lines replaced with invalid ones
+    seed: seed of the random generator, so output is reproducible
+    """
+
+    sections: int = 10
+    params_per_section: int = 10
+    values_per_param: tuple[int, int] = (1, 5)
+    comment_ratio: float = 0.1
+    blank_ratio: float = 0.05
+    invalid_ratio: float = 0.0
+    seed: int = 0
+
+    def scaled(self, size: int, /) -> "CorpusSpec":
+        """
+        Return a spec with the same shape, but more sections (or parameters,
+        for sectionless files) so that generated text is about size bytes long.
+        """
+        sample = generate(self)
+        if self.sections:
+            per_unit = len(sample.text) / self.sections
+            return replace(self, sections=max(1, math.ceil(size / per_unit)))
+        per_unit = len(sample.text) / max(1, self.params_per_section)
+        return replace(self, params_per_section=max(1, math.ceil(size / per_unit)))
+
+
+@dataclass(frozen=True, slots=True)
+class Sample:
+    """
+    A generated inifile, and the result of parsing it with default options.
+
+    expected is None if (and only if) invalid lines were inserted,
+    in which case inifix.loads is expected to raise a ValueError, or an
+    ExceptionGroup of ValueErrors.
+    """
+
+    spec: CorpusSpec
+    text: str
+    expected: dict[str, MutSection_ScalarsAllowed] | MutSection_ScalarsAllowed | None
+    invalid_lines: int
+
+
+PRESETS: dict[str, CorpusSpec] = {
+    "default": CorpusSpec(),
+    "sectionless": CorpusSpec(sections=0, params_per_section=100),
+    "giant-section": CorpusSpec(sections=1, params_per_section=100_000),
+    "many-tiny-sections": CorpusSpec(sections=10_000, params_per_section=1),
+    "long-lists": CorpusSpec(sections=5, values_per_param=(500, 1000)),
+    "comment-heavy": CorpusSpec(comment_ratio=0.9, blank_ratio=0.5),
+    "invalid": CorpusSpec(invalid_ratio=0.05),
+}
+
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choices(_LETTERS, k=rng.randrange(3, 10)))
+
+
+def _value(rng: random.Random) -> tuple[str, Scalar]:
+    # return a value as it should be written, along with its parsed counterpart
+    match rng.randrange(8):
+        case 0 | 1:
+            i = rng.randrange(-100_000, 100_000)
+            return str(i), i
+        case 2:
+            f = rng.uniform(-1e3, 1e3)
+            return repr(f), f
+        case 3:
+            s = f"{rng.uniform(1, 10):.3e}"
+            return s, float(s)
+        case 4:
+            if rng.random() < 0.5:
+                return rng.choice(_TRUTHY), True
+            return rng.choice(_FALSY), False
+        case 5:
+            # the numeric suffix prevents collisions with
+            # special strings such as 'nan', 'inf' or 'yes'
+            s = f"{_word(rng)}_{rng.randrange(100)}"
+            return s, s
+        case 6:
+            s = " ".join(_word(rng) for _ in range(rng.randrange(1, 4)))
+            return f"'{s}'", s
+        case _:
+            s = f"{_word(rng)}.{_word(rng)}"
+            return f'"{s}"', s
+
+
+def _invalid_line(rng: random.Random, key: str) -> str:
+    match rng.randrange(3):
+        case 0:
+            # a parameter without a value
+            return key
+        case 1:
+            # a key that doesn't start with a letter
+            return f"{rng.randrange(10)}{key}  1"
+        case _:
+            # a key with forbidden characters
+            return f"{key}!  1"
+
+
+def _section(
+    spec: CorpusSpec, rng: random.Random, lines: list[str]
+) -> tuple[MutSection_ScalarsAllowed, int]:
+    section: MutSection_ScalarsAllowed = {}
+    invalid_lines = 0
+    vmin, vmax = spec.values_per_param
+    for index in range(spec.params_per_section):
+        # keys are made unique with an index
+        key = f"{_word(rng)}{index}"
+        if rng.random() < spec.comment_ratio / 2:
+            lines.append(f"# {_word(rng)} {_word(rng)}")
+        if rng.random() < spec.invalid_ratio:
+            lines.append(_invalid_line(rng, key))
+            invalid_lines += 1
+            continue
+
+        raw_values: list[str] = []
+        values: list[Scalar] = []
+        for _ in range(rng.randint(vmin, vmax)):
+            raw, value = _value(rng)
+            raw_values.append(raw)
+            values.append(value)
+        sep = " " * rng.randint(1, 4)
+        line = sep.join([key, *raw_values])
+        if rng.random() < spec.comment_ratio / 2:
+            line += f"  # {_word(rng)}"
+        lines.append(line)
+        if rng.random() < spec.blank_ratio:
+            lines.append("")
+        section[key] = values[0] if len(values) == 1 else values
+    return section, invalid_lines
+
+
+def generate(spec: CorpusSpec, /) -> Sample:
+    """Generate a single inifile following spec."""
+    rng = random.Random(spec.seed)
+    lines: list[str] = []
+    expected: dict[str, MutSection_ScalarsAllowed] | MutSection_ScalarsAllowed
+    if spec.sections:
+        sections: dict[str, MutSection_ScalarsAllowed] = {}
+        invalid_lines = 0
+        for index in range(spec.sections):
+            title = f"{_word(rng).capitalize()}{index}"
+            lines.append(f"[{title}]")
+            sections[title], n = _section(spec, rng, lines)
+            invalid_lines += n
+            lines.append("")
+        expected = sections
+    else:
+        expected, invalid_lines = _section(spec, rng, lines)
+
+    return Sample(
+        spec=spec,
+        text="\n".join(lines) + "\n",
+        expected=None if invalid_lines else expected,
+        invalid_lines=invalid_lines,
+    )
+
+
+def generate_corpus(spec: CorpusSpec, /, n: int) -> list[Sample]:
+    """Generate n inifiles following spec, with consecutive seeds."""
+    return [generate(replace(spec, seed=spec.seed + i)) for i in range(n)]
@@ -0,0 +1,169 @@
+__all__ = [
+    "ConfigDiff",
+    "SectionDiff",
+    "diff",
+]
+
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+from math import isnan
+from typing import Any
+
+from inifix._typing import AnyConfig
+
+
+@dataclass(frozen=True, slots=True)
+class SectionDiff:
+    """
+    Differences between two sections, or between parameters found outside
+    of any section.
+
+    added: parameters only found in the second section
+    removed: parameters only found in the first section
+    changed: parameters found in both sections, with different values,
+      mapped to (old, new) pairs
+    """
+
+    added: dict[str, Any] = field(default_factory=dict)
+    removed: dict[str, Any] = field(default_factory=dict)
+    changed: dict[str, tuple[Any, Any]] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+
+@dataclass(frozen=True, slots=True)
+class ConfigDiff:
+    """
+    Differences between two configurations, by section.
+
+    sections: non-empty differences, by section name. Parameters found
+      outside of any section are grouped under None.
+    """
+
+    sections: dict[str | None, SectionDiff] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return bool(self.sections)
+
+    def format(self) -> str:
+        """
+        Return a human-readable representation of differences, with one
+        parameter per line, prefixed with '+' (added), '-' (removed),
+        or '~' (changed).
+        """
+        from inifix._io import _always_iterable, _encode
+
+        def encode(value: Any) -> str:
+            if isinstance(value, Mapping):
+                return "[...]"
+            return "  ".join(_encode(v) for v in _always_iterable(value))
+
+        lines: list[str] = []
+        for name, section in self.sections.items():
+            if name is not None:
+                lines.append(f"[{name}]")
+            lines.extend(f"- {k}  {encode(v)}" for k, v in section.removed.items())
+            lines.extend(f"+ {k}  {encode(v)}" for k, v in section.added.items())
+            lines.extend(
+                f"~ {k}  {encode(old)}  ->  {encode(new)}"
+                for k, (old, new) in section.changed.items()
+            )
+        return "\n".join(lines)
+
+
+def _scalar_equal(s1: object, s2: object, /) -> bool:
+    # same semantics as inifix._testing.assert_scalar_equal
+    if type(s1) is not type(s2):
+        return False
+    if type(s1) is float and isnan(s2):  # type: ignore[arg-type]
+        return isnan(s1)
+    return s1 == s2
+
+
+def _value_equal(v1: object, v2: object, /) -> bool:
+    if v1 is v2:
+        return True
+    # lists, tuples (frozen configs) and arrays (compact configs) compare
+    # equal if they hold equal values
+    seq1 = isinstance(v1, Sequence) and not isinstance(v1, str)
+    seq2 = isinstance(v2, Sequence) and not isinstance(v2, str)
+    if seq1 and seq2:
+        return len(v1) == len(v2) and all(  # type: ignore[arg-type]
+            map(_scalar_equal, v1, v2)  # type: ignore[call-overload]
+        )
+    if seq1 or seq2:
+        return False
+    return _scalar_equal(v1, v2)
+
+
+def _diff_section(s1: Mapping[str, Any], s2: Mapping[str, Any], /) -> SectionDiff:
+    retv = SectionDiff()
+    for key, v1 in s1.items():
+        if key not in s2:
+            retv.removed[key] = v1
+        elif not _value_equal(v1, v2 := s2[key]):
+            retv.changed[key] = (v1, v2)
+    for key, v2 in s2.items():
+        if key not in s1:
+            retv.added[key] = v2
+    return retv
+
+
+def diff(a: AnyConfig, b: AnyConfig, /) -> ConfigDiff:
+    """
+    Compute differences between two configurations.
+
+    Values are compared with the same semantics as
+    inifix._testing.assert_scalar_equal: types must match, and nan
+    compares equal to nan. Lists compare equal to tuples holding equal values.
+
+    Sections that are the same object are skipped without comparing their
+    contents. This is always the case for identical sections from frozen
+    configurations (see inifix.load), so comparing frozen configurations
+    costs time proportional to the number of differing sections.
+
+    Parameters
+    ----------
+    a, b: Mapping
+      the configurations to compare
+
+    Returns
+    -------
+    ConfigDiff
+      which evaluates to False if and only if a and b are equal
+
+    .. versionadded: 7.1.0
+    """
+    if a is b:
+        return ConfigDiff()
+
+    sections: dict[str | None, SectionDiff] = {}
+    params_a: dict[str, Any] = {}
+    params_b: dict[str, Any] = {}
+    for key, value in a.items():
+        if not isinstance(value, Mapping):
+            params_a[key] = value
+        elif key not in b:
+            sections[key] = SectionDiff(removed=dict(value))
+        elif isinstance(other := b[key], Mapping):
+            if other is value:
+                continue
+            if section_diff := _diff_section(value, other):
+                sections[key] = section_diff
+        else:
+            # a section was replaced with a parameter
+            params_a[key] = value
+
+    for key, value in b.items():
+        if not isinstance(value, Mapping):
+            params_b[key] = value
+        elif key not in a:
+            sections[key] = SectionDiff(added=dict(value))
+        elif not isinstance(a[key], Mapping):
+            params_b[key] = value
+
+    if (params_a or params_b) and (params_diff := _diff_section(params_a, params_b)):
+        # parameters outside of sections are listed first
+        return ConfigDiff({None: params_diff, **sections})
+    return ConfigDiff(sections)
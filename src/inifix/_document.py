@@ -0,0 +1,533 @@
+__all__ = [
+    "Document",
+    "DocumentSection",
+]
+
+import os
+import re
+from collections.abc import Iterator, Mapping, MutableMapping, Sequence
+from io import IOBase
+from typing import IO, Any, AnyStr, Literal, final
+
+from inifix._diff import _value_equal
+from inifix._format import PADDING_SIZE, _format_section
+from inifix._io import (
+    _always_iterable,
+    _encode,
+    _get_caster,
+    _section_regexp,
+    _write_atomically,
+    split_tokens,
+    tokenize_line,
+)
+from inifix._typing import CasterFunction, Scalar
+from inifix._validation import validate_inifile_schema
+
+# separator between values in new or previously single-valued lines,
+# same as inifix.dump
+_VALUES_SEP = "  "
+
+
+def _encode_values(values: Scalar | Sequence[Scalar], sep: str, /) -> str:
+    return sep.join(_encode(v) for v in _always_iterable(values))
+
+
+def _values_column(line: str, /) -> int:
+    # position of the first value in a parameter line
+    code = line.partition("#")[0]
+    key = code.split(maxsplit=1)[0]
+    head_end = code.index(key) + len(key)
+    return head_end + len(code[head_end:]) - len(code[head_end:].lstrip())
+
+
+def _new_line(
+    key: str, values: Scalar | Sequence[Scalar], column: int, eol: str
+) -> str:
+    # values are aligned to the given column, if possible
+    return f"{key.ljust(column - 1)} {_encode_values(values, _VALUES_SEP)}{eol}"
+
+
+def _splice(line: str, values: Scalar | Sequence[Scalar], /) -> str:
+    # replace values in a parameter line, keeping indentation, separators,
+    # comments and line ending
+    body = line.rstrip("\r\n")
+    eol = line[len(body) :]
+    code, hash_, comment = body.partition("#")
+    key, *tokens = split_tokens(code)
+
+    head_end = code.index(key) + len(key)
+    rest = code[head_end:]
+    values_and_trail = rest.lstrip()
+    sep = rest[: len(rest) - len(values_and_trail)]
+    old = values_and_trail.rstrip()
+    trail = values_and_trail[len(old) :]
+
+    if len(tokens) > 1:
+        # reuse the separator found between the first two values
+        after_first = old[len(tokens[0]) :]
+        values_sep = after_first[: len(after_first) - len(after_first.lstrip())]
+    else:
+        values_sep = _VALUES_SEP
+    new = _encode_values(values, values_sep)
+    if hash_ and trail.strip(" ") == "":
+        # keep comments aligned, if possible
+        trail = " " * max(1, len(trail) - len(new) + len(old))
+    return f"{code[:head_end]}{sep}{new}{trail}{hash_}{comment}{eol}"
+
+
+def _normalize_value(value: Any, /) -> Any:
+    if isinstance(value, str) or not isinstance(value, Sequence):
+        return value
+    return list(value)
+
+
+_UNPARSED: Any = object()
+
+
+@final
+class _Parser:
+    __slots__ = ("caster", "filename")
+
+    def __init__(self, caster: CasterFunction, filename: str | None, /) -> None:
+        self.caster = caster
+        self.filename = filename
+
+    def parse(self, line: str, lineno: int, /) -> Any:
+        _key, values = tokenize_line(
+            line.partition("#")[0].strip(),
+            line_number=lineno,
+            filename=self.filename,
+            caster=self.caster,
+        )
+        return values[0] if len(values) == 1 else values
+
+
+@final
+class _Header:
+    __slots__ = ("deleted", "name", "text")
+
+    def __init__(self, text: str, name: str, /) -> None:
+        self.text = text
+        self.name = name
+        self.deleted = False
+
+    def render(self) -> str:
+        return "" if self.deleted else self.text
+
+
+@final
+class _Param:
+    # a parameter line. Values are parsed on first access, and only
+    # re-rendered into text when modified
+    __slots__ = ("_values", "deleted", "dirty", "lineno", "parser", "text")
+
+    def __init__(
+        self,
+        text: str,
+        /,
+        *,
+        values: Any = _UNPARSED,
+        parser: "_Parser | None" = None,
+        lineno: int = 0,
+    ) -> None:
+        self.text = text
+        self._values = values
+        self.parser = parser
+        self.lineno = lineno
+        self.dirty = False
+        self.deleted = False
+
+    @property
+    def values(self) -> Any:
+        if self._values is _UNPARSED:
+            assert self.parser is not None
+            self._values = self.parser.parse(self.text, self.lineno)
+        return self._values
+
+    @values.setter
+    def values(self, values: Any) -> None:
+        self._values = values
+
+    def render(self) -> str:
+        if self.deleted:
+            return ""
+        if self.dirty:
+            self.text = _splice(self.text, self._values)
+            self.dirty = False
+        return self.text
+
+
+_Line = str | _Header | _Param
+
+
+@final
+class _Section:
+    __slots__ = ("header", "last", "params")
+
+    def __init__(self, header: _Header | None, /) -> None:
+        self.header = header
+        self.params: dict[str, _Param] = {}
+        # where new parameters are inserted
+        self.last: _Header | _Param | None = header
+
+
+@final
+class DocumentSection(MutableMapping[str, Any]):
+    """A live, mutable view of a section in a Document."""
+
+    __slots__ = ("_document", "_name")
+
+    def __init__(self, document: "Document", name: str, /) -> None:
+        self._document = document
+        self._name = name
+
+    def __getitem__(self, key: str, /) -> Any:
+        return self._document._section(self._name).params[key].values
+
+    def __setitem__(self, key: str, value: Any, /) -> None:
+        self._document._set(self._name, key, value)
+
+    def __delitem__(self, key: str, /) -> None:
+        self._document._delete(self._name, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._document._section(self._name).params)
+
+    def __len__(self) -> int:
+        return len(self._document._section(self._name).params)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self)!r})"
+
+
+@final
+class Document(MutableMapping[str, Any]):
+    """
+    A mutable configuration that keeps the original lines, comments and
+    layout of the text it was loaded from.
+
+    Documents behave as a dict of parsed values (or of sections, which are
+    live DocumentSection views). Changes are tracked, so that serializing
+    emits unchanged lines verbatim, and only re-renders modified lines.
+
+    Values are parsed on first access, so loading a Document with
+    skip_validation=True only costs splitting lines. Values returned by a
+    Document are not copies: mutating them in place (e.g., appending to a
+    list) isn't tracked. Assign new values instead.
+
+    .. versionadded: 7.1.0
+    """
+
+    __slots__ = ("_eol", "_lines", "_modified", "_sectioned", "_sections")
+
+    def __init__(self) -> None:
+        self._lines: list[_Line] = []
+        self._sections: dict[str | None, _Section] = {None: _Section(None)}
+        # None until the document contains either sections or parameters
+        self._sectioned: bool | None = None
+        self._modified: set[str | None] = set()
+        self._eol = "\n"
+
+    @classmethod
+    def loads(
+        cls,
+        source: str,
+        /,
+        *,
+        integer_casting: Literal["stable", "aggressive"] = "stable",
+        skip_validation: bool = False,
+        filename: str | None = None,
+    ) -> "Document":
+        """
+        Parse a Document from a string, with the same rules as inifix.loads.
+        """
+        self = cls()
+        parser = _Parser(_get_caster(integer_casting), filename)
+        lines = source.splitlines(keepends=True)
+        if lines and lines[0].endswith("\r\n"):
+            self._eol = "\r\n"
+        is_section_header = _section_regexp().fullmatch
+        section = self._sections[None]
+        for lineno, line in enumerate(lines, start=1):
+            code = line.partition("#")[0].strip()
+            if not code:
+                self._lines.append(line)
+                continue
+            if match := is_section_header(code):
+                header = _Header(line, match["title"])
+                # as in inifix.load, a repeated section replaces the first one
+                section = self._sections[header.name] = _Section(header)
+                self._lines.append(header)
+                continue
+
+            key, *rest = code.split(maxsplit=1)
+            if not rest:
+                # missing values, let the tokenizer report it
+                parser.parse(line, lineno)
+            param = _Param(line, parser=parser, lineno=lineno)
+            # as in inifix.load, a repeated key replaces the first one
+            section.params[key] = param
+            section.last = param
+            self._lines.append(param)
+
+        if len(self._sections) > 1:
+            # as in inifix.load, parameters found before the first section
+            # are ignored. Their lines are kept as is.
+            self._sections[None] = _Section(None)
+            self._sectioned = True
+        elif self._sections[None].params:
+            self._sectioned = False
+
+        if not skip_validation:
+            validate_inifile_schema(self.to_dict())
+        return self
+
+    @classmethod
+    def load(
+        cls,
+        source: str | os.PathLike[str] | IO[AnyStr],
+        /,
+        *,
+        integer_casting: Literal["stable", "aggressive"] = "stable",
+        skip_validation: bool = False,
+    ) -> "Document":
+        """
+        Parse a Document from a file, with the same rules as inifix.load.
+        """
+        data: str | bytes
+        if isinstance(source, IOBase):
+            filename = str(getattr(source, "name", repr(source)))
+            data = source.read()
+        else:
+            filename = os.fspath(source)  # type: ignore[arg-type]
+            with open(filename, "rb") as fh:
+                data = fh.read()
+        if isinstance(data, bytes):
+            data = data.decode("utf-8")
+        return cls.loads(
+            data,
+            integer_casting=integer_casting,
+            skip_validation=skip_validation,
+            filename=filename,
+        )
+
+    @property
+    def changed(self) -> bool:
+        """Whether any value was modified, added or deleted since loading."""
+        return bool(self._modified)
+
+    def dumps(self, *, reformat: bool = False) -> str:
+        """
+        Serialize to a string.
+
+        Unchanged lines are emitted verbatim, and only modified lines are
+        re-rendered, with their comments and alignment preserved when possible.
+
+        Parameters
+        ----------
+        reformat: bool (default: False)
+          if set to True, sections with modifications are re-aligned with
+          the same rules as inifix.format_string, while other sections are
+          still emitted verbatim.
+        """
+        if not reformat:
+            return "".join(
+                line if type(line) is str else line.render()  # type: ignore[union-attr]
+                for line in self._lines
+            )
+
+        chunks: list[str] = []
+        name: str | None = None
+        chunk: list[str] = []
+
+        def flush() -> None:
+            text = "".join(chunk)
+            if name not in self._modified or not text.strip():
+                chunks.append(text)
+                return
+            blank_lines = 0
+            for line in reversed(chunk):
+                if line.strip():
+                    break
+                blank_lines += 1
+            # same as inifix.format_string, blank lines are compressed
+            formatted = re.sub("\n+", "\n", _format_section(text))
+            formatted = formatted.replace("\n", self._eol)
+            chunks.append(formatted + self._eol * (1 + blank_lines))
+
+        for line in self._lines:
+            if isinstance(line, _Header) and not line.deleted:
+                flush()
+                name = line.name
+                chunk = []
+            chunk.append(line if type(line) is str else line.render())  # type: ignore[union-attr]
+        flush()
+        return "".join(chunks)
+
+    def dump(self, file: str | os.PathLike[str], /, *, reformat: bool = False) -> None:
+        """
+        Write to a file, atomically. See Document.dumps for details.
+        """
+        content = self.dumps(reformat=reformat).encode("utf-8")
+        _write_atomically(
+            file, lambda fh: fh.write(content), keep_mode=os.path.exists(file)
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a plain, mutable copy, as returned by inifix.load."""
+        if not self._sectioned:
+            return {k: p.values for k, p in self._sections[None].params.items()}
+        return {
+            name: {k: p.values for k, p in section.params.items()}
+            for name, section in self._sections.items()
+            if name is not None
+        }
+
+    # Mapping interface
+
+    def __getitem__(self, key: str, /) -> Any:
+        if self._sectioned:
+            if key not in self._sections or key is None:
+                raise KeyError(key)
+            return DocumentSection(self, key)
+        return self._sections[None].params[key].values
+
+    def __setitem__(self, key: str, value: Any, /) -> None:
+        if not isinstance(value, Mapping):
+            self._set(None, key, value)
+            return
+
+        self._check_layout(sectioned=True)
+        validate_inifile_schema({key: value}, sections="require")
+        if key not in self._sections:
+            self._add_section(key)
+        section = self._sections[key]
+        for old_key in [k for k in section.params if k not in value]:
+            self._delete(key, old_key)
+        for k, v in value.items():
+            self._set(key, k, v)
+
+    def __delitem__(self, key: str, /) -> None:
+        if not self._sectioned:
+            self._delete(None, key)
+            return
+        if key not in self._sections or key is None:
+            raise KeyError(key)
+
+        section = self._sections.pop(key)
+        # delete all lines from the header to the next section
+        assert section.header is not None
+        start = self._index(section.header)
+        section.header.deleted = True
+        for index in range(start + 1, len(self._lines)):
+            line = self._lines[index]
+            if isinstance(line, _Header) and not line.deleted:
+                break
+            if type(line) is str:
+                self._lines[index] = ""
+            else:
+                line.deleted = True  # type: ignore[union-attr]
+        self._modified.add(key)
+
+    def __iter__(self) -> Iterator[str]:
+        if self._sectioned:
+            return (k for k in self._sections if k is not None)
+        return iter(self._sections[None].params)
+
+    def __len__(self) -> int:
+        if self._sectioned:
+            return len(self._sections) - 1
+        return len(self._sections[None].params)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    # internals
+
+    def _check_layout(self, *, sectioned: bool) -> None:
+        if self._sectioned is None:
+            self._sectioned = sectioned
+        elif self._sectioned and not sectioned:
+            raise ValueError(
+                "Document has sections, so values are expected to be grouped by section"
+            )
+        elif not self._sectioned and sectioned:
+            raise ValueError(
+                "Document has no sections, "
+                "so values are not expected to be grouped by section"
+            )
+
+    def _section(self, name: str | None, /) -> _Section:
+        try:
+            return self._sections[name]
+        except KeyError:
+            raise KeyError(f"section {name!r} was deleted from the document") from None
+
+    def _index(self, line: _Header | _Param, /) -> int:
+        for index, candidate in enumerate(self._lines):
+            if candidate is line:
+                return index
+        raise RuntimeError  # pragma: no cover
+
+    def _ensure_final_eol(self) -> None:
+        if not self._lines:
+            return
+        last = self._lines[-1]
+        if type(last) is str:
+            if last.strip() and not last.endswith(("\n", "\r")):
+                self._lines[-1] = last + self._eol
+        elif not last.text.endswith(("\n", "\r")):  # type: ignore[union-attr]
+            last.text += self._eol  # type: ignore[union-attr]
+
+    def _add_section(self, name: str, /) -> None:
+        self._ensure_final_eol()
+        # separate sections with a blank line, unless the document already
+        # ends with one (deleted lines render as "")
+        for line in reversed(self._lines):
+            text = line if type(line) is str else line.render()  # type: ignore[union-attr]
+            if text:
+                if text.strip():
+                    self._lines.append(self._eol)
+                break
+        header = _Header(f"[{name}]{self._eol}", name)
+        self._lines.append(header)
+        self._sections[name] = _Section(header)
+        self._modified.add(name)
+
+    def _set(self, name: str | None, key: str, value: Any, /) -> None:
+        if name is None:
+            self._check_layout(sectioned=False)
+        validate_inifile_schema({key: value}, sections="forbid")
+        section = self._section(name)
+        value = _normalize_value(value)
+        if (param := section.params.get(key)) is not None:
+            if _value_equal(param.values, value):
+                return
+            param.values = value
+            param.dirty = True
+            self._modified.add(name)
+            return
+
+        anchor = section.last
+        if isinstance(anchor, _Param):
+            column = _values_column(anchor.text)
+        else:
+            # same spacing as inifix.format_string
+            column = len(key) + 2 * PADDING_SIZE
+        param = _Param(_new_line(key, value, column, self._eol), values=value)
+        if anchor is None or anchor is self._lines[-1]:
+            self._ensure_final_eol()
+            self._lines.append(param)
+        else:
+            if not anchor.text.endswith(("\n", "\r")):
+                anchor.text += self._eol
+            self._lines.insert(self._index(anchor) + 1, param)
+        section.params[key] = param
+        section.last = param
+        self._modified.add(name)
+
+    def _delete(self, name: str | None, key: str, /) -> None:
+        param = self._section(name).params.pop(key)
+        # deleted lines are kept as anchors for insertions, but render as ""
+        param.deleted = True
+        self._modified.add(name)
@@ -0,0 +1,150 @@
+__all__ = [
+    "FrozenConfig",
+    "freeze",
+]
+
+from collections.abc import Iterator, Mapping, Sequence
+from threading import Lock
+from typing import Any, final
+from weakref import WeakValueDictionary
+
+from inifix._typing import AnyConfig, Scalar
+
+# live frozen configs (and sections), by content, so that identical ones are
+# represented by a single object
+_interned: WeakValueDictionary[tuple[Any, ...], "FrozenConfig"] = WeakValueDictionary()
+_interned_lock = Lock()
+
+
+@final
+class FrozenConfig(Mapping[str, Any]):
+    """
+    An immutable, hashable mapping.
+
+    Lists are stored as tuples, and sections as FrozenConfig objects.
+    Identical configurations and sections that are alive at the same time
+    are represented by the same object, so configurations derived from a common
+    template share their unchanged sections. The hash is computed once, on
+    creation.
+    """
+
+    __slots__ = ("__weakref__", "_hash", "_index", "_items")
+
+    _items: tuple[tuple[str, Any], ...]
+    _index: dict[str, Any] | None
+    _hash: int
+
+    def __new__(cls, data: Mapping[str, Any], /) -> "FrozenConfig":
+        if isinstance(data, FrozenConfig):
+            return data
+        return _intern(
+            tuple(
+                (
+                    key,
+                    _freeze_value(value)
+                    if not isinstance(value, Mapping)
+                    else cls(value),
+                )
+                for key, value in data.items()
+            )
+        )
+
+    def __getitem__(self, key: str, /) -> Any:
+        if (index := self._index) is None:
+            # built on first lookup; concurrent builds produce equal dicts
+            index = self._index = dict(self._items)
+        return index[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return (key for key, _ in self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other: object, /) -> bool:
+        if self is other:
+            return True
+        if isinstance(other, FrozenConfig):
+            return self._hash == other._hash and self._items == other._items
+        return super().__eq__(other)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self._items)!r})"
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (type(self), (dict(self._items),))
+
+    def __copy__(self) -> "FrozenConfig":
+        return self
+
+    def __deepcopy__(self, memo: dict[int, Any], /) -> "FrozenConfig":
+        return self
+
+    def replace(self, updates: Mapping[str, Any], /) -> "FrozenConfig":
+        """
+        Return a copy with some parameters or sections replaced.
+
+        Sections found in both self and updates are merged, so a section
+        can be updated partially. Unchanged sections are shared with self.
+        """
+        items = dict(self._items)
+        for key, value in updates.items():
+            if isinstance(value, Mapping) and isinstance(
+                current := items.get(key), FrozenConfig
+            ):
+                items[key] = current.replace(value)
+            else:
+                items[key] = value
+        return type(self)(items)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a plain, mutable copy, as returned by inifix.load."""
+        return {
+            key: value.to_dict()
+            if isinstance(value, FrozenConfig)
+            else list(value)
+            if isinstance(value, tuple)
+            else value
+            for key, value in self._items
+        }
+
+
+def _freeze_value(value: Scalar | Sequence[Scalar], /) -> Any:
+    if isinstance(value, str) or not isinstance(value, Sequence):
+        return value
+    return tuple(value)
+
+
+def _identity_key(value: Any, /) -> Any:
+    # 1, 1.0 and True are equal, and so are 0.0 and -0.0, but they can't
+    # be substituted for one another
+    if isinstance(value, FrozenConfig):
+        # sections are interned first, and kept alive by their parent
+        return id(value)
+    if isinstance(value, tuple):
+        return (tuple, tuple(_identity_key(v) for v in value))
+    if isinstance(value, float):
+        return (float, value.hex())
+    return (type(value), value)
+
+
+def _intern(items: tuple[tuple[str, Any], ...], /) -> FrozenConfig:
+    key = tuple((k, _identity_key(v)) for k, v in items)
+    with _interned_lock:
+        if (config := _interned.get(key)) is None:
+            config = object.__new__(FrozenConfig)
+            config._items = items
+            config._index = None
+            config._hash = hash(items)
+            _interned[key] = config
+        return config
+
+
+def freeze(data: AnyConfig, /) -> FrozenConfig:
+    """
+    Convert a configuration to an immutable, hashable mapping.
+    """
+    return FrozenConfig(data)
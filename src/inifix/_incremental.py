@@ -0,0 +1,312 @@
+__all__ = [
+    "Diagnostic",
+    "IncrementalParser",
+    "ParseResult",
+]
+
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Any, Literal, final
+
+from inifix._io import _SPLIT_COMMENTS, _get_caster, _section_regexp, split_tokens
+from inifix._typing import AnyMutConfig, CasterFunction
+from inifix._validation import collect_exceptions_for_elementary_item
+
+
+@dataclass(frozen=True, slots=True)
+class Diagnostic:
+    """
+    A problem found on a line.
+
+    lineno: the line number, starting from 1
+    message: a description of the problem
+    """
+
+    lineno: int
+    message: str
+
+
+@dataclass(frozen=True, slots=True)
+class ParseResult:
+    """
+    The state of an IncrementalParser after an edit.
+
+    config: the parsed configuration. Lines that can't be parsed are skipped,
+      but parameters that fail validation (e.g., invalid keys) are kept, as
+      with skip_validation=True.
+    diagnostics: problems found, sorted by line number
+    """
+
+    config: AnyMutConfig
+    diagnostics: list[Diagnostic]
+
+
+class _LineInfo:
+    # the parse result for a single line. Depending on the line's content,
+    # it's either a section header (name is the section's title), a
+    # parameter (name is its key), or neither (name is empty).
+    __slots__ = ("counts", "errors", "is_header", "name", "section", "values")
+
+    def __init__(
+        self,
+        name: str = "",
+        values: Any = None,
+        *,
+        is_header: bool = False,
+        errors: tuple[str, ...] = (),
+    ) -> None:
+        self.name = name
+        self.values = values
+        self.is_header = is_header
+        self.errors = errors
+        if is_header:
+            # the section's content, and how many times each key is found in it
+            self.section: dict[str, Any] = {}
+            self.counts: dict[str, int] = {}
+
+    @property
+    def is_param(self) -> bool:
+        return bool(self.name) and not self.is_header
+
+
+_BLANK = _LineInfo()
+
+
+def _shift(
+    indices: list[int], start: int, end: int, added: list[int], delta: int
+) -> None:
+    # update a sorted list of line indices after lines[start:end] were
+    # replaced: indices in the replaced range are dropped in favor of
+    # added ones, and following indices are shifted by delta
+    lo = bisect_left(indices, start)
+    hi = bisect_left(indices, end)
+    if delta == 0:
+        # fast path for edits that don't add or remove lines
+        indices[lo:hi] = added
+        return
+    indices[lo:] = [*added, *(i + delta for i in indices[hi:])]
+
+
+@final
+class IncrementalParser:
+    """
+    Parse a configuration incrementally, as it's being edited.
+
+    Parse results are kept for every line, along with section boundaries,
+    so that each edit only re-parses the lines it touches, and updates
+    affected sections in place. As a result, the cost of edits that don't
+    add, remove or rename keys (e.g., typing a value) is independent of the
+    size of the file. Other edits rebuild the section(s) they touch.
+
+    Parsing follows the same rules as inifix.loads, except that problems are
+    reported as diagnostics instead of raising an exception. Lines that can't
+    be parsed are skipped, while parameters that fail validation (e.g.,
+    invalid keys) are kept in the configuration.
+
+    The configuration is updated in place by subsequent edits; use
+    copy.deepcopy to keep a snapshot.
+
+    Parameters
+    ----------
+    source: str (default: "")
+      the initial content
+
+    parse_scalars_as_lists: bool (default: False)
+      see inifix.loads
+
+    integer_casting: 'stable' (default) or 'aggressive'
+      see inifix.loads
+
+    Examples
+    --------
+    >>> import inifix
+    >>> parser = inifix.IncrementalParser("[Hydro]\\ngamma  1.4\\n")
+    >>> parser.edit(1, 2, "gamma  5/3").config
+    {'Hydro': {'gamma': '5/3'}}
+    >>> parser.edit(1, 2, "gamma").diagnostics
+    [Diagnostic(lineno=2, message="Failed to parse 'gamma': expected at least one value")]
+
+    .. versionadded: 7.1.0
+    """
+
+    __slots__ = (
+        "_caster",
+        "_config",
+        "_errors",
+        "_headers",
+        "_lines",
+        "_parse_scalars_as_lists",
+        "_preamble",
+    )
+
+    def __init__(
+        self,
+        source: str = "",
+        /,
+        *,
+        parse_scalars_as_lists: bool = False,
+        integer_casting: Literal["stable", "aggressive"] = "stable",
+    ) -> None:
+        self._caster: CasterFunction = _get_caster(integer_casting)
+        self._parse_scalars_as_lists = parse_scalars_as_lists
+        self._lines: list[_LineInfo] = []
+        # sorted indices of section headers, and of lines with errors
+        self._headers: list[int] = []
+        self._errors: list[int] = []
+        # holds parameters found before the first section,
+        # which make up the configuration if there are no sections
+        self._preamble = _LineInfo(is_header=True)
+        self._config: dict[str, Any] = self._preamble.section
+        self.edit(0, 0, source)
+
+    @property
+    def config(self) -> AnyMutConfig:
+        return self._config
+
+    @property
+    def diagnostics(self) -> list[Diagnostic]:
+        lines = self._lines
+        return [
+            Diagnostic(index + 1, message)
+            for index in self._errors
+            for message in lines[index].errors
+        ]
+
+    def edit(self, start: int, end: int, text: str, /) -> ParseResult:
+        """
+        Replace lines[start:end] with text, and return the updated state.
+
+        Parameters
+        ----------
+        start, end: int
+          bounds of the replaced lines, counting from 0, with end excluded.
+          Use start == end to insert lines, and an empty text to delete them.
+
+        text: str
+          the new lines, split with str.splitlines. Use "\\n" (not "") to
+          insert a single empty line.
+
+        Raises
+        ------
+        IndexError: if start and end are out of bounds
+        """
+        if not 0 <= start <= end <= len(self._lines):
+            raise IndexError(
+                f"Invalid line range [{start}, {end}) "
+                f"for a document with {len(self._lines)} lines"
+            )
+        old = self._lines[start:end]
+        new = [self._parse_line(line) for line in text.splitlines()]
+        self._lines[start:end] = new
+
+        delta = len(new) - len(old)
+        new_end = start + len(new)
+        _shift(
+            self._errors,
+            start,
+            end,
+            [i for i, info in enumerate(new, start) if info.errors],
+            delta,
+        )
+        _shift(
+            self._headers,
+            start,
+            end,
+            [i for i, info in enumerate(new, start) if info.is_header],
+            delta,
+        )
+        if any(info.is_header for info in old) or any(info.is_header for info in new):
+            self._rebuild(start, new_end)
+        else:
+            self._update(start, old, new)
+        return ParseResult(self._config, self.diagnostics)
+
+    # internals
+
+    def _parse_line(self, line: str, /) -> _LineInfo:
+        # same normalization as inifix.loads
+        code = _SPLIT_COMMENTS(line)[0].strip()
+        if not code:
+            return _BLANK
+        if match := _section_regexp().fullmatch(code):
+            return _LineInfo(match["title"], is_header=True)
+
+        key, *raw_values = split_tokens(code)
+        if not raw_values:
+            return _LineInfo(
+                errors=(f"Failed to parse {code!r}: expected at least one value",)
+            )
+        values: Any = [self._caster(v) for v in raw_values]
+        if len(values) == 1 and not self._parse_scalars_as_lists:
+            values = values[0]
+        errors = tuple(
+            str(exc) for exc in collect_exceptions_for_elementary_item(key, values)
+        )
+        return _LineInfo(key, values, errors=errors)
+
+    def _section_bounds(self, lineno: int, /) -> tuple[_LineInfo, int, int]:
+        # return the header of the section containing a line, and the range
+        # of its content
+        headers = self._headers
+        pos = bisect_right(headers, lineno) - 1
+        begin = headers[pos] + 1 if pos >= 0 else 0
+        end = headers[pos + 1] if pos + 1 < len(headers) else len(self._lines)
+        header = self._lines[headers[pos]] if pos >= 0 else self._preamble
+        return header, begin, end
+
+    def _update(self, start: int, old: list[_LineInfo], new: list[_LineInfo]) -> None:
+        # edited lines belong to the same section as the line right before
+        # them (after a deletion, lines[start] may be the next section's header)
+        header, begin, end = self._section_bounds(start - 1)
+        if header is self._preamble and self._headers:
+            # parameters found before the first section are ignored
+            return
+
+        old_keys = [info.name for info in old if info.is_param]
+        new_keys = [info.name for info in new if info.is_param]
+        counts = header.counts
+        if old_keys == new_keys and all(counts[k] == 1 for k in old_keys):
+            # keys are unique and unchanged: only values need updating
+            section = header.section
+            for info in new:
+                if info.is_param:
+                    section[info.name] = info.values
+        else:
+            self._build_section(header, begin, end)
+
+    def _build_section(self, header: _LineInfo, begin: int, end: int) -> None:
+        # as in inifix.loads, the last occurrence of a key wins,
+        # but keys are ordered by first occurrence
+        section = header.section
+        counts = header.counts
+        section.clear()
+        counts.clear()
+        for info in self._lines[begin:end]:
+            if info.is_param:
+                section[info.name] = info.values
+                counts[info.name] = counts.get(info.name, 0) + 1
+
+    def _rebuild(self, start: int, end: int) -> None:
+        # section boundaries changed: rebuild all sections overlapping the
+        # edited range, starting from the one containing the line right before
+        # it (which may have gained or lost lines), then the top level
+        lineno = start - 1
+        while True:
+            header, begin, stop = self._section_bounds(lineno)
+            if header is self._preamble:
+                # don't mutate a previously returned sectionless configuration
+                header.section = {}
+            self._build_section(header, begin, stop)
+            if stop >= end:
+                break
+            lineno = stop
+
+        if not self._headers:
+            self._config = self._preamble.section
+            return
+        config: dict[str, Any] = {}
+        for index in self._headers:
+            header = self._lines[index]
+            # as in inifix.loads, a repeated section replaces the first one
+            config[header.name] = header.section
+        self._config = config
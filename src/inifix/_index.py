@@ -0,0 +1,407 @@
+__all__ = [
+    "Index",
+    "IndexUpdate",
+]
+
+import os
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass, field
+from math import isnan
+from typing import TYPE_CHECKING, Any, final
+
+from inifix._typing import AnyConfig, Scalar
+
+if TYPE_CHECKING:
+    import sqlite3
+    from concurrent.futures import Executor
+
+# bump whenever the schema changes
+_SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    error TEXT
+);
+CREATE TABLE params (
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    section TEXT,
+    key TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    value,
+    type TEXT NOT NULL
+);
+-- covering indexes, so that queries never need to read the table itself
+CREATE INDEX params_key_value
+    ON params(key, value, type, position, section, file_id);
+CREATE INDEX params_file
+    ON params(file_id, key, position, section, value, type);
+CREATE INDEX params_section_key ON params(section, key);
+CREATE INDEX params_value ON params(value);
+"""
+
+# (section, key, position, value, type)
+_Row = tuple[str | None, str, int, Any, str]
+
+_INT64_MIN = -(2**63)
+_INT64_MAX = 2**63 - 1
+
+
+def _sql_value(value: Scalar, /) -> Any:
+    # sqlite has no booleans, stores nan as NULL,
+    # and can't hold integers that don't fit in 64 bits
+    if type(value) is bool:
+        return int(value)
+    if type(value) is float and isnan(value):
+        return None
+    if type(value) is int and not _INT64_MIN <= value <= _INT64_MAX:
+        return str(value)
+    return value
+
+
+def _rows(config: AnyConfig, /) -> Iterator[_Row]:
+    from inifix._io import _always_iterable
+
+    for key, value in config.items():
+        if isinstance(value, Mapping):
+            for param, values in value.items():
+                for position, v in enumerate(_always_iterable(values)):
+                    yield key, param, position, _sql_value(v), type(v).__name__
+        else:
+            for position, v in enumerate(_always_iterable(value)):
+                yield None, key, position, _sql_value(v), type(v).__name__
+
+
+@dataclass(frozen=True, slots=True)
+class _ScanResult:
+    path: str
+    mtime_ns: int
+    size: int
+    hash: str
+    rows: list[_Row] | None
+    error: str | None
+
+
+def _scan(path: str, known_hash: str | None, /) -> _ScanResult:
+    # runs in worker processes: read, hash, and parse only if content changed
+    import hashlib
+
+    from inifix._io import _normalize_data, loads
+
+    try:
+        with open(path, "rb") as fh:
+            st = os.fstat(fh.fileno())
+            data = fh.read()
+    except OSError as exc:
+        # indexed as a failed file, so it's scanned again on the next update
+        return _ScanResult(path, -1, -1, "", [], str(exc))
+    digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+    if digest == known_hash:
+        return _ScanResult(path, st.st_mtime_ns, st.st_size, digest, None, None)
+    try:
+        text = data.decode("utf-8")
+        # same check as inifix.load
+        if not "".join(_normalize_data(text)):
+            raise ValueError(f"{path!r} appears to be empty.")
+        config = loads(text)
+    except (ValueError, ExceptionGroup, UnicodeDecodeError) as exc:
+        return _ScanResult(path, st.st_mtime_ns, st.st_size, digest, [], str(exc))
+    return _ScanResult(
+        path, st.st_mtime_ns, st.st_size, digest, list(_rows(config)), None
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class IndexUpdate:
+    """
+    A summary of changes made by Index.update.
+
+    added: number of files indexed for the first time
+    updated: number of files whose content changed since they were indexed
+    unchanged: number of files that were skipped, because their content
+      didn't change
+    removed: number of files removed from the index
+    errors: files that couldn't be parsed, mapped to error messages.
+      Such files are indexed without parameters.
+    """
+
+    added: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    errors: dict[str, str] = field(default_factory=dict)
+
+
+@final
+class Index:
+    """
+    A queryable index of parameters found in many files, stored in a
+    SQLite database.
+
+    Every value is stored as a (file, section, key, position, value) row,
+    with its type, and rows are indexed by section, key and value, so that
+    queries don't need to load any file.
+
+    Parameters
+    ----------
+    database: str or os.PathLike
+      the database file, created if it doesn't exist
+
+    Examples
+    --------
+    >>> import inifix
+    >>> with inifix.Index("runs.db") as index:  # doctest: +SKIP
+    ...     index.update(glob.glob("runs/*/idefix.ini"))
+    ...     index.query({"Hydro": {"gamma": 1.4}, "TimeIntegrator": {"nstages": 3}})
+
+    .. versionadded: 7.1.0
+    """
+
+    __slots__ = ("_connection",)
+
+    def __init__(self, database: str | os.PathLike[str], /) -> None:
+        import sqlite3
+
+        self._connection = sqlite3.connect(database)
+        self._connection.execute("PRAGMA foreign_keys = ON")
+        self._connection.execute("PRAGMA journal_mode = WAL")
+        self._connection.execute("PRAGMA synchronous = NORMAL")
+        (version,) = self._connection.execute("PRAGMA user_version").fetchone()
+        if version == 0:
+            with self._connection:
+                self._connection.executescript(_SCHEMA)
+                self._connection.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        elif version != _SCHEMA_VERSION:
+            self._connection.close()
+            raise ValueError(
+                f"{os.fspath(database)!r} was created with an incompatible "
+                f"version of inifix (schema version {version}, "
+                f"expected {_SCHEMA_VERSION}). Delete it to start over."
+            )
+
+    def __enter__(self) -> "Index":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __len__(self) -> int:
+        count: int
+        (count,) = self._connection.execute("SELECT COUNT(*) FROM files").fetchone()
+        return count
+
+    def update(
+        self,
+        files: Iterable[str | os.PathLike[str]],
+        /,
+        *,
+        executor: "Executor | None" = None,
+        prune: bool = True,
+    ) -> IndexUpdate:
+        """
+        Index files, skipping those that didn't change since they were last
+        indexed.
+
+        A file is considered unchanged if its modification time and size
+        didn't change, or if its content has the same hash as before.
+        Only changed files are parsed.
+
+        Parameters
+        ----------
+        files: iterable of paths
+          the files to index
+
+        executor: concurrent.futures.Executor, optional
+          used to read and parse changed files in parallel.
+          By default, files are processed serially.
+
+        prune: bool (default: True)
+          if set to True, previously indexed files that are not listed
+          (e.g., files that were deleted) are removed from the index
+
+        Returns
+        -------
+        IndexUpdate
+        """
+        conn = self._connection
+        known: dict[str, tuple[int, int, int, str]] = {
+            path: (file_id, mtime_ns, size, hash_)
+            for file_id, path, mtime_ns, size, hash_ in conn.execute(
+                "SELECT id, path, mtime_ns, size, hash FROM files"
+            )
+        }
+
+        seen: set[str] = set()
+        to_scan: list[str] = []
+        known_hashes: list[str | None] = []
+        unchanged = 0
+        for file in files:
+            path = os.path.abspath(file)
+            if path in seen:
+                continue
+            seen.add(path)
+            previous = known.get(path)
+            if previous is not None:
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    pass
+                else:
+                    if (st.st_mtime_ns, st.st_size) == previous[1:3]:
+                        unchanged += 1
+                        continue
+            to_scan.append(path)
+            known_hashes.append(None if previous is None else previous[3])
+
+        results: Iterator[_ScanResult]
+        if executor is None:
+            results = map(_scan, to_scan, known_hashes)
+        else:
+            results = executor.map(_scan, to_scan, known_hashes, chunksize=64)
+
+        added = updated = removed = 0
+        errors: dict[str, str] = {}
+        with conn:
+            for res in results:
+                previous = known.get(res.path)
+                if res.rows is None:
+                    # touched, but identical
+                    assert previous is not None
+                    unchanged += 1
+                    conn.execute(
+                        "UPDATE files SET mtime_ns = ?, size = ? WHERE id = ?",
+                        (res.mtime_ns, res.size, previous[0]),
+                    )
+                    continue
+                if res.error is not None:
+                    errors[res.path] = res.error
+                if previous is None:
+                    added += 1
+                    file_id = conn.execute(
+                        "INSERT INTO files (path, mtime_ns, size, hash, error) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (res.path, res.mtime_ns, res.size, res.hash, res.error),
+                    ).lastrowid
+                else:
+                    updated += 1
+                    file_id = previous[0]
+                    conn.execute("DELETE FROM params WHERE file_id = ?", (file_id,))
+                    conn.execute(
+                        "UPDATE files SET mtime_ns = ?, size = ?, hash = ?, error = ? "
+                        "WHERE id = ?",
+                        (res.mtime_ns, res.size, res.hash, res.error, file_id),
+                    )
+                conn.executemany(
+                    "INSERT INTO params VALUES (?, ?, ?, ?, ?, ?)",
+                    ((file_id, *row) for row in res.rows),
+                )
+
+            if prune:
+                stale = [(v[0],) for k, v in known.items() if k not in seen]
+                removed = len(stale)
+                conn.executemany("DELETE FROM files WHERE id = ?", stale)
+
+        return IndexUpdate(added, updated, unchanged, removed, errors)
+
+    def query(self, conditions: AnyConfig, /) -> list[str]:
+        """
+        Return paths of indexed files matching all conditions, sorted.
+
+        Parameters
+        ----------
+        conditions: Mapping
+          parameters and their expected values, with the same layout as
+          a configuration. Parameters found in a section (e.g.,
+          {"Hydro": {"gamma": 1.4}}) only match that section, while others
+          (e.g., {"gamma": 1.4}) match any section.
+          Values are compared strictly: types must match (1, 1.0 and True
+          are all different), and lists only match parameters with the
+          same values, in the same order.
+
+        Examples
+        --------
+        >>> index.query({"Hydro": {"gamma": 1.4}, "X1-grid": [1, 0.0, 64, "u", 1.0]})  # doctest: +SKIP
+        ['/data/runs/001/idefix.ini', '/data/runs/002/idefix.ini']
+        """
+        from inifix._io import _always_iterable
+
+        selects: list[str] = []
+        params: list[Any] = []
+        for key, value in conditions.items():
+            if isinstance(value, Mapping):
+                for param, values in value.items():
+                    sql, args = _match(
+                        param, list(_always_iterable(values)), section=key
+                    )
+                    selects.append(sql)
+                    params.extend(args)
+            else:
+                sql, args = _match(key, list(_always_iterable(value)), any_section=True)
+                selects.append(sql)
+                params.extend(args)
+
+        if not selects:
+            sql = "SELECT path FROM files ORDER BY path"
+        else:
+            sql = (
+                "SELECT path FROM files WHERE id IN "
+                f"({' INTERSECT '.join(selects)}) ORDER BY path"
+            )
+        return [path for (path,) in self._connection.execute(sql, params)]
+
+    @property
+    def connection(self) -> "sqlite3.Connection":
+        """The underlying database connection, for custom queries."""
+        return self._connection
+
+
+def _value_clause(alias: str, value: Scalar, /) -> tuple[str, list[Any]]:
+    if (v := _sql_value(value)) is None:
+        return f"{alias}.value IS NULL AND {alias}.type = ?", [type(value).__name__]
+    return f"{alias}.value = ? AND {alias}.type = ?", [v, type(value).__name__]
+
+
+def _match(
+    key: str,
+    values: list[Scalar],
+    /,
+    *,
+    section: str | None = None,
+    any_section: bool = False,
+) -> tuple[str, list[Any]]:
+    # select ids of files where a parameter holds exactly the given values
+    if not values:
+        raise ValueError(f"Expected at least one value for {key!r}")
+    joins: list[str] = []
+    join_args: list[Any] = []
+    for position, value in enumerate(values[1:], start=1):
+        alias = f"p{position}"
+        clause, args = _value_clause(alias, value)
+        joins.append(
+            f"JOIN params AS {alias} ON {alias}.file_id = p0.file_id "
+            f"AND {alias}.section IS p0.section AND {alias}.key = p0.key "
+            f"AND {alias}.position = {position} AND {clause}"
+        )
+        join_args.extend(args)
+
+    clause, where_args = _value_clause("p0", values[0])
+    where = f"p0.key = ? AND p0.position = 0 AND {clause}"
+    where_args.insert(0, key)
+    if not any_section:
+        where += " AND p0.section IS ?"
+        where_args.append(section)
+    # parameters holding more values don't match
+    where += (
+        " AND NOT EXISTS (SELECT 1 FROM params AS pn WHERE pn.file_id = p0.file_id "
+        "AND pn.section IS p0.section AND pn.key = p0.key "
+        f"AND pn.position = {len(values)})"
+    )
+    sql = f"SELECT p0.file_id FROM params AS p0 {' '.join(joins)} WHERE {where}"
+    return sql, [*join_args, *where_args]
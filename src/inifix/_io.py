@@ -1,11 +1,13 @@
 import os
 import re
 from collections.abc import Callable, Iterator, Mapping, Sequence
-from functools import partial
+from functools import cache, partial
 from io import BufferedIOBase, IOBase
 from itertools import pairwise
-from typing import IO, AnyStr, Literal, Protocol, cast, overload
+from time import perf_counter
+from typing import IO, TYPE_CHECKING, AnyStr, Literal, Protocol, cast, overload
 
+import inifix
 from inifix._floatencoder import FloatEncoder
 from inifix._typing import (
     AnyConfig,
@@ -24,6 +26,14 @@ from inifix._typing import (
 )
 from inifix._validation import SCALAR_TYPES, validate_inifile_schema
 
+# modules only needed for some options are imported when these are used, and
+# annotations refer to them with absolute forward references, so they still
+# resolve at runtime
+if TYPE_CHECKING:
+    import inifix._compact
+    import inifix._frozen
+    import inifix._schema
+
 __all__ = [
     "dump",
     "dumps",
@@ -31,7 +41,23 @@ __all__ = [
     "loads",
 ]
 
-SECTION_REGEXP: re.Pattern[str] = re.compile(r"\[(?P<title>[^(){}\[\]]+)\]\s*")
+# set by inifix.profile_load while at least one profiling context is active.
+# Timing hooks below cost a single check otherwise
+_profiling = False
+
+
+def _record(phase: str, tstart: float | None, /) -> None:
+    # tstart is None if profiling was disabled when the phase started
+    if tstart is not None:
+        from inifix._profiling import record
+
+        record(phase, tstart)
+
+
+# regular expressions are compiled on first use, to keep importing inifix cheap
+@cache
+def _section_regexp() -> re.Pattern[str]:
+    return re.compile(r"\[(?P<title>[^(){}\[\]]+)\]\s*")
 
 
 def _always_iterable(obj: Scalar | Sequence[Scalar], /) -> Iterator[Scalar]:
@@ -77,16 +103,21 @@ _SPLIT_COMMENTS = partial(str.split, sep="#", maxsplit=1)
 
 def _normalize_data(data: StrLike) -> list[str]:
     # normalize text body `data` to parsable text lines
+    tstart = perf_counter() if _profiling else None
     if isinstance(data, bytes):
         data = data.decode("utf-8")
-    return [line.strip() for (line, *_) in map(_SPLIT_COMMENTS, data.splitlines())]
+    lines = [line.strip() for (line, *_) in map(_SPLIT_COMMENTS, data.splitlines())]
+    _record("normalize", tstart)
+    return lines
 
 
-_TOKEN = re.compile(r"""'[^']*'|"[^"]*"|\S+""")
+@cache
+def _token_regexp() -> re.Pattern[str]:
+    return re.compile(r"""'[^']*'|"[^"]*"|\S+""")
 
 
 def split_tokens(data: str) -> list[str]:
-    return _TOKEN.findall(data)
+    return _token_regexp().findall(data)
 
 
 TRUTHY_STRINGS: frozenset[str] = frozenset(
@@ -95,12 +126,15 @@ TRUTHY_STRINGS: frozenset[str] = frozenset(
 FALSY_STRINGS: frozenset[str] = frozenset({"false", "FALSE", "False", "no", "NO", "No"})
 ALL_BOOL_STRINGS: frozenset[str] = frozenset({*TRUTHY_STRINGS, *FALSY_STRINGS})
 
-_RE_CASTERS: list[tuple[re.Pattern[str], Callable[[str], Scalar]]] = [
-    (re.compile("(" + "|".join(TRUTHY_STRINGS) + ")"), lambda _: True),
-    (re.compile("(" + "|".join(FALSY_STRINGS) + ")"), lambda _: False),
-    (re.compile(r"^'.*'$"), lambda s: s[1:-1]),
-    (re.compile(r'^".*"$'), lambda s: s[1:-1]),
-]
+
+@cache
+def _re_casters() -> list[tuple[re.Pattern[str], Callable[[str], Scalar]]]:
+    return [
+        (re.compile("(" + "|".join(TRUTHY_STRINGS) + ")"), lambda _: True),
+        (re.compile("(" + "|".join(FALSY_STRINGS) + ")"), lambda _: False),
+        (re.compile(r"^'.*'$"), lambda s: s[1:-1]),
+        (re.compile(r'^".*"$'), lambda s: s[1:-1]),
+    ]
 
 
 def auto_cast_aggressive(s: str) -> Scalar:
@@ -114,7 +148,7 @@ def auto_cast_aggressive(s: str) -> Scalar:
         else:
             return f
 
-    for regexp, caster in _RE_CASTERS:
+    for regexp, caster in _re_casters():
         if regexp.fullmatch(s):
             return caster(s)
 
@@ -132,7 +166,7 @@ def auto_cast_stable(s: str) -> Scalar:
     except ValueError:
         pass
 
-    for regexp, caster in _RE_CASTERS:
+    for regexp, caster in _re_casters():
         if regexp.fullmatch(s):
             return caster(s)
 
@@ -152,6 +186,11 @@ def _get_caster(integer_casting: Literal["stable", "aggressive"]) -> CasterFunct
             )
 
 
+def _check_output_options(*, compact: bool, frozen: bool) -> None:
+    if compact and frozen:
+        raise ValueError("compact=True and frozen=True are mutually exclusive.")
+
+
 def tokenize_line(
     line: str,
     line_number: int,
@@ -160,14 +199,41 @@ def tokenize_line(
 ) -> tuple[str, list[Scalar]]:
     key, *raw_values = split_tokens(line)
     if not raw_values:
-        if filename is None:
-            raise ValueError(f"Failed to parse line {line_number}: {line!r}")
-        else:
-            raise ValueError(f"Failed to parse {filename}:{line_number}:\n{line}")
+        raise _parse_error(line, line_number, filename)
 
     return key, [caster(v) for v in raw_values]
 
 
+def _tokenize_line_with_schema(
+    line: str,
+    line_number: int,
+    filename: str | None,
+    caster: CasterFunction,
+    casters: "Mapping[str, inifix._schema.ValuesCaster]",
+) -> tuple[str, list[Scalar]]:
+    key, *raw_values = split_tokens(line)
+    if not raw_values:
+        raise _parse_error(line, line_number, filename)
+    if (cast_values := casters.get(key)) is None:
+        return key, [caster(v) for v in raw_values]
+    try:
+        return key, cast_values(raw_values)
+    except ValueError as exc:
+        raise _parse_error(line, line_number, filename, f"{key!r}: {exc}") from None
+
+
+def _parse_error(
+    line: str, line_number: int, filename: str | None, reason: str | None = None
+) -> ValueError:
+    if filename is None:
+        msg = f"Failed to parse line {line_number}: {line!r}"
+    else:
+        msg = f"Failed to parse {filename}:{line_number}:\n{line}"
+    if reason is not None:
+        msg = f"{msg}\n{reason}"
+    return ValueError(msg)
+
+
 def _unwrap_section(section: Section_ScalarsForbidden) -> MutSection_ScalarsAllowed:
     section_unwrapped: MutSection_ScalarsAllowed = {}
     for key, values in section.items():
@@ -184,20 +250,38 @@ def _section_from_lines(
     *,
     caster: CasterFunction,
     filename: str | None,
+    casters: "Mapping[str, inifix._schema.ValuesCaster] | None" = None,
 ) -> MutSection_ScalarsForbidden:
+    timer = None
+    if _profiling:
+        from inifix._profiling import SectionTimer
+
+        timer = SectionTimer(caster, casters)
+        caster, casters = timer.caster, timer.casters
     section: MutSection_ScalarsForbidden = {}
     for line_number, line in enumerate(lines, start=1):
         if not line:
             continue
         values: Scalar | list[Scalar]
-        key, values = tokenize_line(
-            line,
-            filename=filename,
-            line_number=line_number,
-            caster=caster,
-        )
+        if casters is None:
+            key, values = tokenize_line(
+                line,
+                filename=filename,
+                line_number=line_number,
+                caster=caster,
+            )
+        else:
+            key, values = _tokenize_line_with_schema(
+                line,
+                filename=filename,
+                line_number=line_number,
+                caster=caster,
+                casters=casters,
+            )
         validate_section_item(key, values)
         section[key] = values
+    if timer is not None:
+        timer.stop(lines)
     return section
 
 
@@ -208,20 +292,24 @@ def _config_from_string_with_sections(
     parse_scalars_as_lists: bool,
     caster: CasterFunction,
     filename: str | None = None,
+    schema: "inifix.Schema | None" = None,
 ) -> (
     MutConfig_SectionsRequired_ScalarsAllowed
     | MutConfig_SectionsRequired_ScalarsForbidden
 ):
     config: MutConfig_SectionsRequired_ScalarsForbidden = {}
     section_limits = [*section_linenos, len(lines)]
+    section_regexp = _section_regexp()
     for line_begin, line_end in pairwise(section_limits):
         section_lines = lines[line_begin:line_end]
-        if (match := SECTION_REGEXP.fullmatch(section_lines[0])) is None:
+        if (match := section_regexp.fullmatch(section_lines[0])) is None:
             raise RuntimeError
-        config[match["title"]] = _section_from_lines(
+        title = match["title"]
+        config[title] = _section_from_lines(
             section_lines[1:],
             caster=caster,
             filename=filename,
+            casters=None if schema is None else schema._casters(title),
         )
     if parse_scalars_as_lists:
         return config
@@ -239,31 +327,39 @@ def _from_string(
     parse_scalars_as_lists: bool,
     caster: CasterFunction,
     filename: str | None = None,
+    schema: "inifix.Schema | None" = None,
 ) -> AnyMutConfig:
-    lines = _normalize_data(data)
-    section_linenos: list[int] = []
-    for i, line in enumerate(lines):
-        if SECTION_REGEXP.fullmatch(line):
-            section_linenos.append(i)
+    tstart = perf_counter() if _profiling else None
+    try:
+        lines = _normalize_data(data)
+        section_linenos: list[int] = []
+        is_section_header = _section_regexp().fullmatch
+        for i, line in enumerate(lines):
+            if is_section_header(line):
+                section_linenos.append(i)
+
+        if section_linenos:
+            return _config_from_string_with_sections(
+                lines,
+                section_linenos=section_linenos,
+                parse_scalars_as_lists=parse_scalars_as_lists,
+                caster=caster,
+                filename=filename,
+                schema=schema,
+            )
 
-    if section_linenos:
-        return _config_from_string_with_sections(
+        section = _section_from_lines(
             lines,
-            section_linenos=section_linenos,
-            parse_scalars_as_lists=parse_scalars_as_lists,
             caster=caster,
             filename=filename,
+            casters=None if schema is None else schema._casters(None),
         )
-
-    section = _section_from_lines(
-        lines,
-        caster=caster,
-        filename=filename,
-    )
-    if parse_scalars_as_lists:
-        return section
-    else:
-        return _unwrap_section(section)
+        if parse_scalars_as_lists:
+            return section
+        else:
+            return _unwrap_section(section)
+    finally:
+        _record("parse", tstart)
 
 
 class StrLikeReader(Protocol):
@@ -275,6 +371,7 @@ def _from_file_descriptor(
     *,
     parse_scalars_as_lists: bool,
     caster: CasterFunction,
+    schema: "inifix.Schema | None" = None,
 ) -> AnyMutConfig:
     filename = str(getattr(file, "name", repr(file)))
     data = file.read()
@@ -286,6 +383,7 @@ def _from_file_descriptor(
         filename=filename,
         parse_scalars_as_lists=parse_scalars_as_lists,
         caster=caster,
+        schema=schema,
     )
 
 
@@ -294,6 +392,7 @@ def _from_path(
     *,
     parse_scalars_as_lists: bool,
     caster: CasterFunction,
+    schema: "inifix.Schema | None" = None,
 ) -> AnyMutConfig:
     file = os.fspath(file)
     with open(file, "rb") as fh:
@@ -301,9 +400,87 @@ def _from_path(
             fh,
             parse_scalars_as_lists=parse_scalars_as_lists,
             caster=caster,
+            schema=schema,
         )
 
 
+def _validate_parsed(
+    config: AnyMutConfig,
+    *,
+    sections: Literal["allow", "forbid", "require"],
+    schema: "inifix.Schema | None",
+) -> None:
+    if schema is not None:
+        # parameters declared in a schema don't need validating again
+        config = schema._undeclared(config)
+    tstart = perf_counter() if _profiling else None
+    validate_inifile_schema(config, sections=sections)
+    _record("validate", tstart)
+
+
+def _has_valid_layout(
+    config: AnyMutConfig, sections: Literal["allow", "forbid", "require"]
+) -> bool:
+    # parsed configurations have either only sections or no section at all
+    match sections:
+        case "allow":
+            return True
+        case "forbid":
+            return not any(isinstance(v, dict) for v in config.values())
+        case "require":
+            return all(isinstance(v, dict) for v in config.values())
+        case _:
+            return False
+
+
+def _from_path_with_snapshot(
+    file: str | os.PathLike[str],
+    *,
+    parse_scalars_as_lists: bool,
+    integer_casting: Literal["stable", "aggressive"],
+    caster: CasterFunction,
+    schema: "inifix.Schema | None",
+    sections: Literal["allow", "forbid", "require"],
+    skip_validation: bool,
+) -> AnyMutConfig:
+    from inifix._snapshot import read_snapshot, write_snapshot
+
+    file = os.fspath(file)
+    with open(file, "rb") as fh:
+        data = fh.read()
+        st = os.fstat(fh.fileno())
+    options = (parse_scalars_as_lists, integer_casting, repr(schema))
+
+    snapshot = read_snapshot(file, data, st, options)
+    if _profiling:
+        from inifix._profiling import record_snapshot
+
+        record_snapshot(hit=snapshot is not None)
+    if snapshot is not None:
+        config, validated = snapshot
+        if skip_validation or (validated and _has_valid_layout(config, sections)):
+            return config
+        # raises if invalid
+        _validate_parsed(config, sections=sections, schema=schema)
+        if not validated:
+            write_snapshot(file, data, st, options, config, validated=True)
+        return config
+
+    if not "".join(_normalize_data(data)):
+        raise ValueError(f"{file!r} appears to be empty.")
+    config = _from_string(
+        data,
+        filename=file,
+        parse_scalars_as_lists=parse_scalars_as_lists,
+        caster=caster,
+        schema=schema,
+    )
+    if not skip_validation:
+        _validate_parsed(config, sections=sections, schema=schema)
+    write_snapshot(file, data, st, options, config, validated=not skip_validation)
+    return config
+
+
 # dump helper functions
 
 
@@ -346,7 +523,13 @@ def _write_to_buffer(data: AnyConfig, buffer: IOBase) -> None:
             _write("\n", buffer)
 
 
-def _write_to_file(data: AnyConfig, file: str | os.PathLike[str], /) -> None:
+def _write_atomically(
+    file: str | os.PathLike[str],
+    /,
+    write: Callable[[IOBase], object],
+    *,
+    keep_mode: bool = False,
+) -> None:
     if os.path.exists(file) and not os.access(file, os.W_OK):
         raise PermissionError(f"Cannot write to {file} (permission denied)")
 
@@ -355,10 +538,16 @@ def _write_to_file(data: AnyConfig, file: str | os.PathLike[str], /) -> None:
     with TemporaryDirectory(dir=os.path.dirname(file)) as tmpdir:
         tmpfile = os.path.join(tmpdir, "ini")
         with open(tmpfile, "wb") as fh:
-            _write_to_buffer(data, fh)
+            write(fh)
+        if keep_mode:
+            os.chmod(tmpfile, os.stat(file).st_mode & 0o7777)
         os.replace(tmpfile, file)
 
 
+def _write_to_file(data: AnyConfig, file: str | os.PathLike[str], /) -> None:
+    _write_atomically(file, partial(_write_to_buffer, data))
+
+
 # narrowing return type on *two* keyword arguments at once:
 # sections and parse_scalars_as_list
 
@@ -374,6 +563,34 @@ def _write_to_file(data: AnyConfig, file: str | os.PathLike[str], /) -> None:
 # overloads are sorted from most to least strict return type
 
 
+@overload
+def load(
+    source: str | os.PathLike[str] | IO[AnyStr],
+    /,
+    *,
+    frozen: Literal[True],
+    parse_scalars_as_lists: bool = False,
+    integer_casting: Literal["stable", "aggressive"] = "stable",
+    schema: "inifix.Schema | None" = None,
+    sections: Literal["allow", "forbid", "require"] = "allow",
+    skip_validation: bool = False,
+    compact: Literal[False] = False,
+    snapshot: bool = False,
+) -> "inifix._frozen.FrozenConfig": ...
+@overload
+def load(
+    source: str | os.PathLike[str] | IO[AnyStr],
+    /,
+    *,
+    compact: Literal[True],
+    parse_scalars_as_lists: bool = False,
+    integer_casting: Literal["stable", "aggressive"] = "stable",
+    schema: "inifix.Schema | None" = None,
+    sections: Literal["allow", "forbid", "require"] = "allow",
+    skip_validation: bool = False,
+    frozen: Literal[False] = False,
+    snapshot: bool = False,
+) -> "inifix._compact.CompactMapping": ...
 @overload
 def load(
     source: str | os.PathLike[str] | IO[AnyStr],
@@ -382,7 +599,11 @@ def load(
     sections: Literal["forbid"],
     parse_scalars_as_lists: Literal[True],
     integer_casting: Literal["stable", "aggressive"] = "stable",
+    schema: "inifix.Schema | None" = None,
     skip_validation: bool = False,
+    compact: Literal[False] = False,
+    frozen: Literal[False] = False,
+    snapshot: bool = False,
 ) -> MutConfig_SectionsForbidden_ScalarsForbidden: ...
 @overload
 def load(
@@ -392,7 +613,11 @@ def load(
     sections: Literal["require"],
     parse_scalars_as_lists: Literal[True],
     integer_casting: Literal["stable", "aggressive"] = "stable",
+    schema: "inifix.Schema | None" = None,
     skip_validation: bool = False,
+    compact: Literal[False] = False,
+    frozen: Literal[False] = False,
+    snapshot: bool = False,
 ) -> MutConfig_SectionsRequired_ScalarsForbidden: ...
 @overload
 def load(
@@ -402,7 +627,11 @@ def load(
     sections: Literal["forbid"],
     parse_scalars_as_lists: Literal[False] = False,
     integer_casting: Literal["stable", "aggressive"] = "stable",
+    schema: "inifix.Schema | None" = None,
     skip_validation: bool = False,
+    compact: Literal[False] = False,
+    frozen: Literal[False] = False,
+    snapshot: bool = False,
 ) -> MutConfig_SectionsForbidden_ScalarsAllowed: ...
 @overload
 def load(
@@ -412,7 +641,11 @@ def load(
     sections: Literal["require"],
     parse_scalars_as_lists: Literal[False] = False,
     integer_casting: Literal["stable", "aggressive"] = "stable",
+    schema: "inifix.Schema | None" = None,
     skip_validation: bool = False,
+    compact: Literal[False] = False,
+    frozen: Literal[False] = False,
+    snapshot: bool = False,
 ) -> MutConfig_SectionsRequired_ScalarsAllowed: ...
 @overload
 def load(
@@ -422,7 +655,11 @@ def load(
     parse_scalars_as_lists: Literal[True],
     sections: Literal["allow"] = "allow",
     integer_casting: Literal["stable", "aggressive"] = "stable",
+    schema: "inifix.Schema | None" = None,
     skip_validation: bool = False,
+    compact: Literal[False] = False,
+    frozen: Literal[False] = False,
+    snapshot: bool = False,
 ) -> MutConfig_SectionsAllowed_ScalarsForbidden: ...
 @overload
 def load(
@@ -432,7 +669,11 @@ def load(
     parse_scalars_as_lists: Literal[False] = False,
     sections: Literal["allow"] = "allow",
     integer_casting: Literal["stable", "aggressive"] = "stable",
+    schema: "inifix.Schema | None" = None,
     skip_validation: bool = False,
+    compact: Literal[False] = False,
+    frozen: Literal[False] = False,
+    snapshot: bool = False,
 ) -> AnyMutConfig: ...
 
 
@@ -443,10 +684,16 @@ def load(
     # parsing options
     parse_scalars_as_lists: bool = False,
     integer_casting: Literal["stable", "aggressive"] = "stable",
+    schema: "inifix.Schema | None" = None,
     # validation options
     sections: Literal["allow", "forbid", "require"] = "allow",
     skip_validation: bool = False,
-) -> AnyMutConfig:
+    # output options
+    compact: bool = False,
+    frozen: bool = False,
+    # caching options
+    snapshot: bool = False,
+) -> "AnyMutConfig | inifix._compact.CompactMapping | inifix._frozen.FrozenConfig":
     """
     Parse data from a file.
 
@@ -474,6 +721,13 @@ def load(
 
         .. versionadded: 5.0.0
 
+    schema: inifix.Schema, optional
+        expected types of parameters. Declared parameters are cast directly
+        to their type, instead of having their type inferred, and values that
+        can't be cast to it are parse errors.
+
+        .. versionadded: 7.1.0
+
     sections: 'allow' (default), 'forbid' or 'require'
         use sections='forbid' to invalidate any section found,
         or sections='require' to invalidate a sectionless structure.
@@ -493,35 +747,116 @@ def load(
 
         .. versionadded: 4.1.0
 
+    compact: bool (default: False)
+        if set to True, return a read-only, memory-efficient mapping instead
+        of a dict. Keys are interned and shared between results, and
+        homogeneous lists of ints or floats are stored as array.array objects.
+        Use the to_dict() method to get a mutable copy.
+
+        .. versionadded: 7.1.0
+
+    frozen: bool (default: False)
+        if set to True, return an immutable, hashable mapping instead of a
+        dict, with lists stored as tuples. Identical sections and configurations
+        are shared between results. Cannot be combined with compact=True.
+        Use the to_dict() method to get a mutable copy.
+
+        .. versionadded: 7.1.0
+
+    snapshot: bool (default: False)
+        if set to True, keep a binary snapshot of the parsed (and validated)
+        configuration in a cache directory, and use it on subsequent calls
+        instead of parsing again, as long as the file's content and parsing
+        options are unchanged. Stale or corrupted snapshots are ignored.
+        The cache directory can be set with the INIFIX_CACHE_DIR environment
+        variable. Requires source to be a path.
+
+        .. versionadded: 7.1.0
+
     See Also
     --------
     inifix.loads
     """
+    _check_output_options(compact=compact, frozen=frozen)
     caster = _get_caster(integer_casting)
 
-    if isinstance(source, IOBase):
-        config = _from_file_descriptor(
-            source,
-            parse_scalars_as_lists=parse_scalars_as_lists,
-            caster=caster,
-        )
-    else:
-        # to the best of my knowledge, the return type of `open` is:
-        # - `IO[AnyStr]` at typecheck-time
-        # - `IOBase` at runtime
-        # however typecheckers won't recognize our runtime checking as narrowing
-        source = cast("str | os.PathLike[str]", source)
-        config = _from_path(
-            source,
-            parse_scalars_as_lists=parse_scalars_as_lists,
-            caster=caster,
-        )
-
+    tstart = perf_counter() if _profiling else None
+    try:
+        if isinstance(source, IOBase):
+            if snapshot:
+                raise TypeError("snapshot=True requires source to be a path")
+            config = _from_file_descriptor(
+                source,
+                parse_scalars_as_lists=parse_scalars_as_lists,
+                caster=caster,
+                schema=schema,
+            )
+        else:
+            # to the best of my knowledge, the return type of `open` is:
+            # - `IO[AnyStr]` at typecheck-time
+            # - `IOBase` at runtime
+            # however typecheckers won't recognize our runtime checking as narrowing
+            source = cast("str | os.PathLike[str]", source)
+            if snapshot:
+                config = _from_path_with_snapshot(
+                    source,
+                    parse_scalars_as_lists=parse_scalars_as_lists,
+                    integer_casting=integer_casting,
+                    caster=caster,
+                    schema=schema,
+                    sections=sections,
+                    skip_validation=skip_validation,
+                )
+                # already validated
+                skip_validation = True
+            else:
+                config = _from_path(
+                    source,
+                    parse_scalars_as_lists=parse_scalars_as_lists,
+                    caster=caster,
+                    schema=schema,
+                )
+    finally:
+        _record("load", tstart)
     if not skip_validation:
-        validate_inifile_schema(config, sections=sections)
+        _validate_parsed(config, sections=sections, schema=schema)
+    if compact:
+        from inifix._compact import compact as compact_config
+
+        return compact_config(config)
+    if frozen:
+        from inifix._frozen import freeze
+
+        return freeze(config)
     return config
 
 
+@overload
+def loads(
+    source: str,
+    /,
+    *,
+    frozen: Literal[True],
+    parse_scalars_as_lists: bool = False,
+    integer_casting: Literal["stable", "aggressive"] = "stable",
+    schema: "inifix.Schema | None" = None,
+    sections: Literal["allow", "forbid", "require"] = "allow",
+    skip_validation: bool = False,
+    compact: Literal[False] = False,
+) -> "inifix._frozen.FrozenConfig": ...
+@overload
+def loads(
+    source: str,
+    /,
+    *,
+    compact: Literal[True],
+    parse_scalars_as_lists: bool = False,
+    integer_casting: Literal["stable", "aggressive"] = "stable",
+    schema: "inifix.Schema | None" = None,
+    sections: Literal["allow", "forbid", "require"] = "allow",
+    skip_validation: bool = False,
+    frozen: Literal[False] = False,
+) -> "inifix._compact.CompactMapping": ...
 @overload
 def loads(
     source: str,
@@ -530,7 +865,10 @@ def loads(
     sections: Literal["forbid"],
     parse_scalars_as_lists: Literal[True],
     integer_casting: Literal["stable", "aggressive"] = "stable",
+    schema: "inifix.Schema | None" = None,
     skip_validation: bool = False,
+    compact: Literal[False] = False,
+    frozen: Literal[False] = False,
 ) -> MutConfig_SectionsForbidden_ScalarsForbidden: ...
 @overload
 def loads(
@@ -540,7 +878,10 @@ def loads(
     sections: Literal["require"],
     parse_scalars_as_lists: Literal[True],
     integer_casting: Literal["stable", "aggressive"] = "stable",
+    schema: "inifix.Schema | None" = None,
     skip_validation: bool = False,
+    compact: Literal[False] = False,
+    frozen: Literal[False] = False,
 ) -> MutConfig_SectionsRequired_ScalarsForbidden: ...
 @overload
 def loads(
@@ -550,7 +891,10 @@ def loads(
     sections: Literal["forbid"],
     parse_scalars_as_lists: Literal[False] = False,
     integer_casting: Literal["stable", "aggressive"] = "stable",
+    schema: "inifix.Schema | None" = None,
     skip_validation: bool = False,
+    compact: Literal[False] = False,
+    frozen: Literal[False] = False,
 ) -> MutConfig_SectionsForbidden_ScalarsAllowed: ...
 @overload
 def loads(
@@ -560,7 +904,10 @@ def loads(
     sections: Literal["require"],
     parse_scalars_as_lists: Literal[False] = False,
     integer_casting: Literal["stable", "aggressive"] = "stable",
+    schema: "inifix.Schema | None" = None,
     skip_validation: bool = False,
+    compact: Literal[False] = False,
+    frozen: Literal[False] = False,
 ) -> MutConfig_SectionsRequired_ScalarsAllowed: ...
 @overload
 def loads(
@@ -570,7 +917,10 @@ def loads(
     parse_scalars_as_lists: Literal[True],
     sections: Literal["allow"] = "allow",
     integer_casting: Literal["stable", "aggressive"] = "stable",
+    schema: "inifix.Schema | None" = None,
     skip_validation: bool = False,
+    compact: Literal[False] = False,
+    frozen: Literal[False] = False,
 ) -> MutConfig_SectionsAllowed_ScalarsForbidden: ...
 @overload
 def loads(
@@ -580,7 +930,10 @@ def loads(
     parse_scalars_as_lists: Literal[False] = False,
     sections: Literal["allow"] = "allow",
     integer_casting: Literal["stable", "aggressive"] = "stable",
+    schema: "inifix.Schema | None" = None,
     skip_validation: bool = False,
+    compact: Literal[False] = False,
+    frozen: Literal[False] = False,
 ) -> AnyMutConfig: ...
 
 
@@ -591,10 +944,14 @@ def loads(
     # parsing options
     parse_scalars_as_lists: bool = False,
     integer_casting: Literal["stable", "aggressive"] = "stable",
+    schema: "inifix.Schema | None" = None,
     # validation options
     sections: Literal["allow", "forbid", "require"] = "allow",
     skip_validation: bool = False,
-) -> AnyMutConfig:
+    # output options
+    compact: bool = False,
+    frozen: bool = False,
+) -> "AnyMutConfig | inifix._compact.CompactMapping | inifix._frozen.FrozenConfig":
     """
     Parse data from a string.
 
@@ -619,6 +976,13 @@ def loads(
 
         .. versionadded: 5.0.0
 
+    schema: inifix.Schema, optional
+        expected types of parameters. Declared parameters are cast directly
+        to their type, instead of having their type inferred, and values that
+        can't be cast to it are parse errors.
+
+        .. versionadded: 7.1.0
+
     sections: 'allow' (default), 'forbid' or 'require'
         use sections='forbid' to invalidate any section found,
         or sections='require' to invalidate a sectionless structure.
@@ -638,17 +1002,45 @@ def loads(
 
         .. versionadded: 4.1.0
 
+    compact: bool (default: False)
+        if set to True, return a read-only, memory-efficient mapping instead
+        of a dict. Keys are interned and shared between results, and
+        homogeneous lists of ints or floats are stored as array.array objects.
+        Use the to_dict() method to get a mutable copy.
+
+        .. versionadded: 7.1.0
+
+    frozen: bool (default: False)
+        if set to True, return an immutable, hashable mapping instead of a
+        dict, with lists stored as tuples. Identical sections and configurations
+        are shared between results. Cannot be combined with compact=True.
+        Use the to_dict() method to get a mutable copy.
+
+        .. versionadded: 7.1.0
+
     See Also
     --------
     inifix.load
     """
+    _check_output_options(compact=compact, frozen=frozen)
     caster = _get_caster(integer_casting)
     retv = _from_string(
-        source, parse_scalars_as_lists=parse_scalars_as_lists, caster=caster
+        source,
+        parse_scalars_as_lists=parse_scalars_as_lists,
+        caster=caster,
+        schema=schema,
     )
 
     if not skip_validation:
-        validate_inifile_schema(retv, sections=sections)
+        _validate_parsed(retv, sections=sections, schema=schema)
+    if compact:
+        from inifix._compact import compact as compact_config
+
+        return compact_config(retv)
+    if frozen:
+        from inifix._frozen import freeze
+
+        return freeze(retv)
     return retv
 
 
@@ -0,0 +1,136 @@
+__all__ = [
+    "Overlay",
+    "overlay",
+]
+
+from collections.abc import Iterator, Mapping
+from itertools import chain
+from typing import Any, final
+
+from inifix._typing import AnyConfig, Scalar
+
+_MISSING = object()
+
+
+@final
+class Overlay(Mapping[str, Any]):
+    """
+    A read-only view of layered configurations.
+
+    Lookups go through layers in order, as with collections.ChainMap, so
+    earlier layers take precedence. Sections are merged parameter by
+    parameter: a section found in several layers is returned as an Overlay
+    of these sections. A value that is not a section shadows sections found
+    in later layers, and vice versa.
+
+    Layers are not copied, so changes to them are visible through the view.
+    Use inifix.overlay to create one.
+
+    .. versionadded: 7.1.0
+    """
+
+    __slots__ = ("_layers",)
+
+    _layers: tuple[Mapping[str, Any], ...]
+
+    def __getitem__(self, key: str, /) -> Any:
+        sections: list[Mapping[str, Any]] = []
+        for layer in self._layers:
+            if (value := layer.get(key, _MISSING)) is _MISSING:
+                continue
+            if not isinstance(value, Mapping):
+                if not sections:
+                    return value
+                break
+            sections.append(value)
+        if not sections:
+            raise KeyError(key)
+        return _view(tuple(sections))
+
+    def __contains__(self, key: object, /) -> bool:
+        return any(key in layer for layer in self._layers)
+
+    def __iter__(self) -> Iterator[str]:
+        # same order as collections.ChainMap: that of the last layer, followed
+        # by keys only found in earlier layers
+        return iter(dict.fromkeys(chain.from_iterable(reversed(self._layers))))
+
+    def __len__(self) -> int:
+        return len(set().union(*self._layers))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({len(self._layers)} layers, {len(self)} keys)"
+
+    def flatten(self) -> dict[str, Any]:
+        """Return a plain, mutable copy, as returned by inifix.load."""
+        result: dict[str, Any] = {}
+        # a single pass over each layer, from the lowest priority one
+        for layer in reversed(self._layers):
+            _merge_into(result, layer)
+        return result
+
+
+def _merge_into(result: dict[str, Any], layer: Mapping[str, Any], /) -> None:
+    for key, value in layer.items():
+        if isinstance(value, Mapping):
+            # sections in result are always copies, and never a layer's own
+            if not isinstance(section := result.get(key), dict):
+                section = result[key] = {}
+            _merge_into(section, value)
+        else:
+            result[key] = value if isinstance(value, Scalar) else list(value)
+
+
+def _view(layers: tuple[Mapping[str, Any], ...], /) -> Overlay:
+    view = object.__new__(Overlay)
+    view._layers = layers
+    return view
+
+
+def overlay(*configs: AnyConfig) -> Overlay:
+    """
+    Layer configurations on top of each other, without copying them.
+
+    Parameters
+    ----------
+    *configs: Mapping
+      configurations (e.g., as returned by inifix.load), from highest to lowest
+      priority, as with collections.ChainMap
+
+    Returns
+    -------
+    Overlay
+      a read-only mapping, resolving lookups through layers, section by
+      section. It can be passed to inifix.dump and inifix.dumps directly,
+      or converted to a dict with Overlay.flatten().
+
+    Raises
+    ------
+    TypeError: if any of configs is not a mapping
+
+    Examples
+    --------
+    >>> import inifix
+    >>> base = {"Hydro": {"solver": "hllc", "gamma": 1.4}}
+    >>> run = {"Hydro": {"gamma": 1.67}}
+    >>> conf = inifix.overlay(run, base)
+    >>> conf["Hydro"]["gamma"], conf["Hydro"]["solver"]
+    (1.67, 'hllc')
+    >>> conf.flatten()
+    {'Hydro': {'solver': 'hllc', 'gamma': 1.67}}
+
+    .. versionadded: 7.1.0
+    """
+    layers: list[Mapping[str, Any]] = []
+    for config in configs:
+        if isinstance(config, Overlay):
+            # resolving through nested overlays is equivalent to resolving
+            # through their layers
+            layers.extend(config._layers)
+        elif isinstance(config, Mapping):
+            layers.append(config)
+        else:
+            raise TypeError(
+                f"Expected a mapping, got {config!r} with type {type(config).__name__}"
+            )
+    return _view(tuple(layers))
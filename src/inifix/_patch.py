@@ -0,0 +1,61 @@
+__all__ = [
+    "patch",
+]
+
+import os
+from collections.abc import Mapping
+
+from inifix._document import Document
+from inifix._typing import AnyConfig
+from inifix._validation import validate_inifile_schema
+
+
+def patch(
+    file: str | os.PathLike[str],
+    updates: AnyConfig,
+    /,
+    *,
+    skip_validation: bool = False,
+) -> None:
+    """
+    Update parameters in a file, in place.
+
+    Only lines holding updated parameters are rewritten, and only their
+    values are replaced: comments, alignment and all other lines are kept
+    as is. Parameters and sections missing from the file are appended.
+    The file is read once, and written atomically, only if its content
+    changes.
+
+    Parameters
+    ----------
+    file: str or os.PathLike
+      the file to update
+
+    updates: Mapping
+      new values, with the same layout as the file's content (i.e.,
+      updates are grouped by section if and only if the file has sections)
+
+    skip_validation: bool (default: False)
+      if set to True, updates are not validated
+
+    Raises
+    ------
+    ValueError: if updates are invalid, or don't match the file's layout
+
+    See Also
+    --------
+    inifix.Document
+
+    .. versionadded: 7.1.0
+    """
+    if not skip_validation:
+        validate_inifile_schema(updates)
+
+    doc = Document.load(file, skip_validation=True)
+    for key, value in updates.items():
+        if isinstance(value, Mapping) and key in doc:
+            doc[key].update(value)
+        else:
+            doc[key] = value
+    if doc.changed:
+        doc.dump(file)
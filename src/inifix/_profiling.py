@@ -0,0 +1,173 @@
+__all__ = [
+    "LoadProfile",
+    "profile_load",
+]
+
+from collections.abc import Callable, Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from threading import Lock
+from time import perf_counter
+from typing import Any, final
+
+
+@dataclass(slots=True)
+class LoadProfile:
+    """
+    Measurements collected while profiling.
+
+    time: wall time spent in each phase, in seconds. 'load' includes reading
+      input and 'parse', which includes 'normalize', 'tokenize' and 'cast'.
+      'tokenize' and 'cast' are disjoint, and are accounted for once per
+      section rather than per line. 'validate' is not nested in other phases,
+      except when loading with snapshot=True. Times are inclusive, and should
+      not be summed across nested phases.
+    calls: number of calls for each phase ('tokenize' and 'cast' count
+      sections)
+    lines: number of parameter lines parsed
+    tokens: number of tokens (keys and values) parsed
+    snapshot_hits, snapshot_misses: number of snapshots that were reused or
+      (re)written, when loading with snapshot=True
+    """
+
+    time: dict[str, float] = field(default_factory=dict)
+    calls: dict[str, int] = field(default_factory=dict)
+    lines: int = 0
+    tokens: int = 0
+    snapshot_hits: int = 0
+    snapshot_misses: int = 0
+
+    def _record(self, phase: str, elapsed: float) -> None:
+        self.time[phase] = self.time.get(phase, 0.0) + elapsed
+        self.calls[phase] = self.calls.get(phase, 0) + 1
+
+    def as_dict(self) -> dict[str, float | int]:
+        """Return measurements as a flat mapping, suitable for metrics systems."""
+        retv: dict[str, float | int] = {}
+        for phase, elapsed in self.time.items():
+            retv[f"{phase}.time"] = elapsed
+            retv[f"{phase}.calls"] = self.calls[phase]
+        retv["lines"] = self.lines
+        retv["tokens"] = self.tokens
+        retv["snapshot_hits"] = self.snapshot_hits
+        retv["snapshot_misses"] = self.snapshot_misses
+        return retv
+
+
+# profiles measuring loads in the current context. Threads don't inherit it,
+# unless they explicitly run in a copy of it
+_profiles: ContextVar[tuple[LoadProfile, ...]] = ContextVar(
+    "inifix_profiles", default=()
+)
+# a profile may be shared by threads running in copies of the same context
+_lock = Lock()
+_active_count = 0
+
+
+def record(phase: str, tstart: float, /) -> None:
+    # called from the timing hooks in inifix._io
+    elapsed = perf_counter() - tstart
+    if profiles := _profiles.get():
+        with _lock:
+            for prof in profiles:
+                prof._record(phase, elapsed)
+
+
+def record_snapshot(*, hit: bool) -> None:
+    if profiles := _profiles.get():
+        with _lock:
+            for prof in profiles:
+                if hit:
+                    prof.snapshot_hits += 1
+                else:
+                    prof.snapshot_misses += 1
+
+
+@final
+class SectionTimer:
+    # wraps casters passed to inifix._io._section_from_lines, so that time
+    # spent casting values can be told apart from the rest of the work
+
+    __slots__ = ("casters", "caster", "_cast_time", "_tokens", "_tstart")
+
+    def __init__(
+        self,
+        caster: Callable[[str], Any],
+        casters: Mapping[str, Callable[[list[str]], list[Any]]] | None,
+    ) -> None:
+        self._cast_time = 0.0
+        self._tokens = 0
+        self.caster = self._time_caster(caster)
+        self.casters = (
+            None
+            if casters is None
+            else {key: self._time_values_caster(f) for key, f in casters.items()}
+        )
+        self._tstart = perf_counter()
+
+    def _time_caster(self, caster: Callable[[str], Any]) -> Callable[[str], Any]:
+        def timed(s: str) -> Any:
+            tstart = perf_counter()
+            try:
+                return caster(s)
+            finally:
+                self._cast_time += perf_counter() - tstart
+                self._tokens += 1
+
+        return timed
+
+    def _time_values_caster(
+        self, cast_values: Callable[[list[str]], list[Any]]
+    ) -> Callable[[list[str]], list[Any]]:
+        def timed(raw_values: list[str]) -> list[Any]:
+            tstart = perf_counter()
+            try:
+                return cast_values(raw_values)
+            finally:
+                self._cast_time += perf_counter() - tstart
+                self._tokens += len(raw_values)
+
+        return timed
+
+    def stop(self, lines: list[str]) -> None:
+        elapsed = perf_counter() - self._tstart
+        if not (profiles := _profiles.get()):
+            return
+        nlines = sum(map(bool, lines))
+        with _lock:
+            for prof in profiles:
+                prof._record("tokenize", elapsed - self._cast_time)
+                prof._record("cast", self._cast_time)
+                prof.lines += nlines
+                prof.tokens += nlines + self._tokens
+
+
+@contextmanager
+def profile_load() -> Iterator[LoadProfile]:
+    """
+    Collect per-phase timings and counts for calls to inifix.load and
+    inifix.loads, within a context.
+
+    Timing hooks in the loader are only enabled while at least one profiling
+    context is active, so profiling has no cost otherwise. Only loads
+    performed in the current thread (or, more precisely, the current
+    contextvars.Context) are accounted for.
+
+    .. versionadded: 7.1.0
+    """
+    global _active_count
+    from inifix import _io
+
+    prof = LoadProfile()
+    token = _profiles.set((*_profiles.get(), prof))
+    with _lock:
+        _active_count += 1
+        _io._profiling = True
+    try:
+        yield prof
+    finally:
+        with _lock:
+            _active_count -= 1
+            _io._profiling = _active_count > 0
+        _profiles.reset(token)
@@ -0,0 +1,253 @@
+__all__ = [
+    "Schema",
+]
+
+from collections.abc import Callable, Mapping
+from itertools import cycle
+from types import GenericAlias, UnionType
+from typing import Any, final
+
+from inifix._typing import AnyMutConfig, Scalar
+from inifix._validation import collect_exceptions_for_elementary_item
+
+# cast all tokens of a parameter, raising ValueError if they don't match
+ValuesCaster = Callable[[list[str]], list[Scalar]]
+
+
+def _cast_int(s: str, /) -> int:
+    try:
+        return int(s)
+    except ValueError:
+        # accept decimal notations of integers, such as '1e3'
+        f = float(s)
+        if not f.is_integer():
+            raise
+        return int(f)
+
+
+def _cast_str(s: str, /) -> str:
+    # same unquoting rules as inferred casting
+    if len(s) >= 2 and s[0] == s[-1] and s[0] in "'\"":
+        return s[1:-1]
+    return s
+
+
+def _bool_caster() -> Callable[[str], bool]:
+    # inifix._io imports this module
+    from inifix._io import FALSY_STRINGS, TRUTHY_STRINGS
+
+    bools = dict.fromkeys(TRUTHY_STRINGS, True) | dict.fromkeys(FALSY_STRINGS, False)
+
+    def cast_bool(s: str, /) -> bool:
+        try:
+            return bools[s]
+        except KeyError:
+            raise ValueError(f"invalid bool {s!r}") from None
+
+    return cast_bool
+
+
+_SCALAR_CASTERS: dict[type, Callable[[str], Scalar]] = {
+    int: _cast_int,
+    float: float,
+    str: _cast_str,
+}
+
+
+def _describe(spec: Any, /) -> str:
+    if isinstance(spec, type):
+        return spec.__name__
+    if isinstance(spec, UnionType):
+        return " | ".join(_describe(t) for t in spec.__args__)
+    if isinstance(spec, GenericAlias):
+        return f"list[{_describe(spec.__args__[0])}]"
+    if isinstance(spec, tuple):
+        return f"({', '.join(map(_describe, spec))})"
+    if isinstance(spec, list):
+        return f"[{', '.join(map(_describe, spec))}]"
+    if spec is Ellipsis:
+        return "..."
+    return repr(spec)
+
+
+def _compile_scalar(spec: Any, /) -> Callable[[str], Scalar]:
+    if spec is bool:
+        return _bool_caster()
+    if isinstance(spec, type) and spec in _SCALAR_CASTERS:
+        return _SCALAR_CASTERS[spec]
+    if isinstance(spec, UnionType):
+        casters = [_compile_scalar(t) for t in spec.__args__]
+
+        def cast_union(s: str, /) -> Scalar:
+            # types are tried in order
+            for caster in casters:
+                try:
+                    return caster(s)
+                except ValueError:
+                    pass
+            raise ValueError(s)
+
+        return cast_union
+    raise TypeError(
+        f"Unsupported type {_describe(spec)}. "
+        "Expected int, float, bool, str, or a union of these"
+    )
+
+
+def _compile_values(spec: Any, /) -> ValuesCaster:
+    description = _describe(spec)
+
+    def mismatch(raw: list[str], /) -> ValueError:
+        return ValueError(f"expected {description}, got {' '.join(raw)!r}")
+
+    if isinstance(spec, GenericAlias) and spec.__origin__ is list:
+        # list[T] is short for [T, ...]
+        spec = [*spec.__args__, ...]
+
+    if not isinstance(spec, list):
+        cast_scalar = _compile_scalar(spec)
+
+        def cast_single(raw: list[str], /) -> list[Scalar]:
+            if len(raw) != 1:
+                raise mismatch(raw)
+            try:
+                return [cast_scalar(raw[0])]
+            except ValueError:
+                raise mismatch(raw) from None
+
+        return cast_single
+
+    items = list(spec)
+    repeated: list[Callable[[str], Scalar]] = []
+    if items and items[-1] is Ellipsis:
+        if len(items) < 2:
+            raise TypeError(f"Invalid pattern {description}: nothing to repeat")
+        items.pop()
+        last = items.pop()
+        repeated = [
+            _compile_scalar(t) for t in (last if isinstance(last, tuple) else (last,))
+        ]
+    if not items and not repeated:
+        raise TypeError(f"Invalid pattern {description}: expected at least one type")
+    if any(t is Ellipsis or isinstance(t, tuple) for t in items):
+        raise TypeError(
+            f"Invalid pattern {description}: '...' is only supported at the end, "
+            "after a type or a (group, of, types)"
+        )
+    prefix = [_compile_scalar(t) for t in items]
+    size = len(prefix)
+    period = len(repeated)
+
+    def cast_sequence(raw: list[str], /) -> list[Scalar]:
+        n = len(raw)
+        if n != size and (not period or n < size or (n - size) % period):
+            raise mismatch(raw)
+        try:
+            values = [cast(s) for cast, s in zip(prefix, raw, strict=False)]
+            if n > size:
+                values.extend(
+                    cast(s)
+                    for cast, s in zip(cycle(repeated), raw[size:], strict=False)
+                )
+        except ValueError:
+            raise mismatch(raw) from None
+        return values
+
+    return cast_sequence
+
+
+def _check_key(key: object, /) -> None:
+    if exceptions := collect_exceptions_for_elementary_item(key, 0):
+        raise exceptions[0]
+
+
+@final
+class Schema:
+    """
+    Expected types of parameters, by section and key.
+
+    The specification mirrors the structure of a configuration: it maps
+    section names to mappings of keys to types, and/or keys to types for
+    sectionless files. Supported types are
+    - int, float, bool and str, or a union of these (e.g., int | str),
+      tried in order, for parameters holding a single value
+    - list[T], for one or more values of type T
+    - a list of types, for values of these types, in order
+    - a list of types, ending with T, ... or (T1, T2, ...), ... where the last
+      type or group of types may be repeated any number of times
+
+    Declared parameters are cast directly to their type, without inference,
+    so a parameter declared as float is always parsed as a float, even if
+    it's written as an int. Values that can't be cast to their declared type
+    are parse errors. Parameters that are not declared are cast as usual.
+
+    The specification is checked and compiled on creation, so a Schema
+    should be created once and reused.
+
+    Parameters
+    ----------
+    spec: Mapping
+      the expected types
+
+    Raises
+    ------
+    TypeError: if spec contains unsupported types
+    ValueError: if spec contains invalid keys
+
+    Examples
+    --------
+    >>> import inifix
+    >>> schema = inifix.Schema({
+    ...     "Grid": {"X1-grid": [int, float, (int, str, float), ...]},
+    ...     "TimeIntegrator": {"CFL": float},
+    ... })
+    >>> inifix.loads("[TimeIntegrator]\\nCFL  1", schema=schema)
+    {'TimeIntegrator': {'CFL': 1.0}}
+
+    .. versionadded: 7.1.0
+    """
+
+    __slots__ = ("_params", "_repr", "_sections")
+
+    def __init__(self, spec: Mapping[str, Any], /) -> None:
+        self._params: dict[str, ValuesCaster] = {}
+        self._sections: dict[str, dict[str, ValuesCaster]] = {}
+        descriptions: list[str] = []
+        for key, value in spec.items():
+            if isinstance(value, Mapping):
+                if not isinstance(key, str) or not key:
+                    raise ValueError(f"Invalid section name {key!r}")
+                section = self._sections[key] = {}
+                for param, param_spec in value.items():
+                    _check_key(param)
+                    section[param] = _compile_values(param_spec)
+                described = ", ".join(
+                    f"{param!r}: {_describe(param_spec)}"
+                    for param, param_spec in value.items()
+                )
+                descriptions.append(f"{key!r}: {{{described}}}")
+            else:
+                _check_key(key)
+                self._params[key] = _compile_values(value)
+                descriptions.append(f"{key!r}: {_describe(value)}")
+        self._repr = f"{type(self).__name__}({{{', '.join(descriptions)}}})"
+
+    def __repr__(self) -> str:
+        return self._repr
+
+    def _undeclared(self, config: AnyMutConfig, /) -> dict[str, Any]:
+        # a copy of a parsed configuration, without parameters declared in
+        # sections. Their keys were validated on creation, and their values
+        # were cast to valid types
+        return {
+            key: {k: v for k, v in value.items() if k not in casters}
+            if isinstance(value, dict) and (casters := self._sections.get(key))
+            else value
+            for key, value in config.items()
+        }
+
+    def _casters(self, section: str | None, /) -> dict[str, ValuesCaster] | None:
+        # casters for parameters in a section, or outside of any section
+        if section is None:
+            return self._params or None
+        return self._sections.get(section)
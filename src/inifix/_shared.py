@@ -0,0 +1,357 @@
+__all__ = [
+    "SharedConfig",
+    "share",
+]
+
+import struct
+import sys
+from collections.abc import Iterator, Mapping, Sequence
+from typing import TYPE_CHECKING, Any, final
+
+from inifix._compact import _INT64_MAX, _INT64_MIN
+from inifix._typing import AnyConfig, Scalar
+
+if TYPE_CHECKING:
+    from multiprocessing.shared_memory import SharedMemory
+
+# Layout of a shared block (all integers are little-endian)
+#
+# header: magic, format version, offset of the top-level table
+# table: number of entries (u32), followed by
+#   - entries, in insertion order: key offset (u32), key size (u32), item
+#   - entry indices, sorted by encoded key (u32 each), for lookups
+# item: type (u8), 7 padding bytes, 8 bytes of payload, which is
+#   - the value itself, for ints, floats and bools
+#   - offset and size (u32, u32) of UTF-8 data, for strs and big ints
+#   - offset (u32) and number of items (u32) of a list of items
+#   - offset (u32) of a table, for sections
+# strs are deduplicated, and stored without terminators.
+_MAGIC = b"INIFIXSH"
+_FORMAT_VERSION = 1
+_HEADER = struct.Struct("<8sII")
+_COUNT = struct.Struct("<I")
+_ITEM = struct.Struct("<B7x8s")
+_ENTRY = struct.Struct("<IIB7x8s")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+_SPAN = struct.Struct("<II")
+
+
+class _Kind:
+    # item types (not an Enum, for faster lookups in match statements)
+    SECTION = 0
+    INT = 1
+    FLOAT = 2
+    BOOL = 3
+    STR = 4
+    BIGINT = 5
+    LIST = 6
+
+
+class _Writer:
+    __slots__ = ("data", "strings")
+
+    def __init__(self) -> None:
+        self.data = bytearray(_HEADER.size)
+        self.strings: dict[str, bytes] = {}
+
+    def _append(self, chunk: bytes, /) -> int:
+        offset = len(self.data)
+        if offset + len(chunk) > 0xFFFFFFFF:
+            raise ValueError("configuration is too large to be shared (>4GiB)")
+        self.data += chunk
+        return offset
+
+    def _span(self, s: str, /) -> bytes:
+        if (span := self.strings.get(s)) is None:
+            encoded = s.encode()
+            span = self.strings[s] = _SPAN.pack(self._append(encoded), len(encoded))
+        return span
+
+    def _scalar(self, value: Scalar, /) -> tuple[int, bytes]:
+        # bool is a subclass of int, so it needs to be checked first
+        if isinstance(value, bool):
+            return _Kind.BOOL, bytes([value]).ljust(8, b"\0")
+        if isinstance(value, int):
+            if _INT64_MIN <= value <= _INT64_MAX:
+                return _Kind.INT, _I64.pack(value)
+            return _Kind.BIGINT, self._span(str(value))
+        if isinstance(value, float):
+            return _Kind.FLOAT, _F64.pack(value)
+        if isinstance(value, str):
+            return _Kind.STR, self._span(value)
+        raise TypeError(
+            f"Expected an int, float, bool or str, got {value!r} "
+            f"with type {type(value).__name__}"
+        )
+
+    def item(self, value: Any, /) -> tuple[int, bytes]:
+        if isinstance(value, Mapping):
+            return _Kind.SECTION, _SPAN.pack(self.table(value), 0)
+        if isinstance(value, Sequence) and not isinstance(value, str):
+            items = b"".join(_ITEM.pack(*self._scalar(v)) for v in value)
+            return _Kind.LIST, _SPAN.pack(self._append(items), len(value))
+        return self._scalar(value)
+
+    def table(self, data: Mapping[str, Any], /) -> int:
+        # nested values are written first, so their offsets are known
+        entries = [
+            (key.encode(), *_SPAN.unpack(self._span(key)), *self.item(value))
+            for key, value in data.items()
+        ]
+        order = sorted(range(len(entries)), key=lambda i: entries[i][0])
+        return self._append(
+            b"".join(
+                (
+                    _COUNT.pack(len(entries)),
+                    *(_ENTRY.pack(*entry[1:]) for entry in entries),
+                    struct.pack(f"<{len(order)}I", *order),
+                )
+            )
+        )
+
+
+def _encode(data: AnyConfig, /) -> bytearray:
+    writer = _Writer()
+    root = writer.table(data)
+    _HEADER.pack_into(writer.data, 0, _MAGIC, _FORMAT_VERSION, root)
+    return writer.data
+
+
+@final
+class SharedConfig(Mapping[str, Any]):
+    """
+    A read-only view of a configuration stored in shared memory.
+
+    Values are decoded on access, and aren't cached, so any number of
+    processes can read a configuration while it's only stored once.
+    Lists are returned as tuples, and sections as SharedConfig objects.
+
+    Use inifix.share to create one, and SharedConfig.attach to access it from
+    another process. Pickling a SharedConfig only pickles the name of its
+    shared memory block, so it's cheap to pass to worker processes, which
+    attach to it on unpickling. Processes started with fork can also use
+    the parent's object directly.
+
+    .. versionadded: 7.1.0
+    """
+
+    __slots__ = ("_buf", "_offset", "_owner", "_shm", "_size")
+
+    _shm: "SharedMemory"
+    _buf: memoryview
+    _offset: int
+    _size: int
+    _owner: bool
+
+    @classmethod
+    def attach(cls, name: str, /) -> "SharedConfig":
+        """
+        Attach to a configuration shared by another process.
+
+        Raises
+        ------
+        FileNotFoundError: if no shared memory block has this name
+        ValueError: if the block doesn't hold a shared configuration
+        """
+        from multiprocessing.shared_memory import SharedMemory
+
+        if sys.version_info >= (3, 13):
+            shm = SharedMemory(name, track=False)
+        else:
+            from multiprocessing import resource_tracker
+
+            # prior to Python 3.13, attached blocks are tracked as if they
+            # were created by this process, and destroyed when its resource
+            # tracker exits. This is only a problem for processes with their
+            # own tracker: the creator's children (e.g., workers in a pool)
+            # inherit its tracker, which may only track a block once
+            tracker = getattr(resource_tracker, "_resource_tracker", None)
+            has_tracker = getattr(tracker, "_fd", None) is not None
+            shm = SharedMemory(name)
+            if not has_tracker:
+                resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+
+        assert shm.buf is not None
+        try:
+            magic, version, root = _HEADER.unpack_from(shm.buf, 0)
+        except struct.error:
+            magic = version = None
+        if magic != _MAGIC or version != _FORMAT_VERSION:
+            shm.close()
+            raise ValueError(f"{name!r} doesn't hold a shared configuration")
+        return _view(shm, root, owner=False)
+
+    @property
+    def name(self) -> str:
+        """The name of the shared memory block."""
+        return self._shm.name
+
+    def close(self) -> None:
+        """
+        Detach from the shared memory block. The configuration, and all
+        views of it, can't be used afterwards.
+        """
+        self._shm.close()
+
+    def unlink(self) -> None:
+        """
+        Destroy the shared memory block, once all processes have detached
+        from it. Only the process that created it should call this.
+        """
+        self._shm.unlink()
+
+    def __enter__(self) -> "SharedConfig":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+        if self._owner:
+            self.unlink()
+
+    def _entry(self, index: int, /) -> tuple[Any, ...]:
+        return _ENTRY.unpack_from(
+            self._buf, self._offset + _COUNT.size + index * _ENTRY.size
+        )
+
+    def _str(self, key_offset: int, key_size: int, /) -> str:
+        return str(self._buf[key_offset : key_offset + key_size], "utf-8")
+
+    def _decode(self, kind: int, payload: bytes, /) -> Any:
+        match kind:
+            case _Kind.INT:
+                return _I64.unpack(payload)[0]
+            case _Kind.FLOAT:
+                return _F64.unpack(payload)[0]
+            case _Kind.BOOL:
+                return payload[0] != 0
+            case _Kind.STR:
+                return self._str(*_SPAN.unpack(payload))
+            case _Kind.BIGINT:
+                return int(self._str(*_SPAN.unpack(payload)))
+            case _Kind.LIST:
+                offset, size = _SPAN.unpack(payload)
+                return tuple(
+                    self._decode(*item)
+                    for item in _ITEM.iter_unpack(
+                        self._buf[offset : offset + size * _ITEM.size]
+                    )
+                )
+            case _Kind.SECTION:
+                return _view(self._shm, _SPAN.unpack(payload)[0], owner=False)
+            case _:
+                raise ValueError(f"Corrupted shared configuration {self.name!r}")
+
+    def __getitem__(self, key: str, /) -> Any:
+        if not isinstance(key, str):
+            raise KeyError(key)
+        target = key.encode(errors="surrogatepass")
+        buf = self._buf
+        order = self._offset + _COUNT.size + self._size * _ENTRY.size
+        # binary search over sorted entries, comparing encoded keys
+        lo, hi = 0, self._size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            (index,) = _COUNT.unpack_from(buf, order + mid * _COUNT.size)
+            key_offset, key_size, kind, payload = self._entry(index)
+            candidate = bytes(buf[key_offset : key_offset + key_size])
+            if candidate == target:
+                return self._decode(kind, payload)
+            if candidate < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(self._size):
+            key_offset, key_size, _, _ = self._entry(index)
+            yield self._str(key_offset, key_size)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.name!r}, {len(self)} keys)"
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (_attach_at, (self.name, self._offset))
+
+    def _items(self) -> Iterator[tuple[str, Any]]:
+        # a single pass over entries, instead of a lookup per key
+        for index in range(self._size):
+            key_offset, key_size, kind, payload = self._entry(index)
+            yield self._str(key_offset, key_size), self._decode(kind, payload)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a plain, mutable copy, as returned by inifix.load."""
+        return {
+            key: value.to_dict()
+            if isinstance(value, SharedConfig)
+            else list(value)
+            if isinstance(value, tuple)
+            else value
+            for key, value in self._items()
+        }
+
+
+def _view(shm: "SharedMemory", offset: int, *, owner: bool) -> SharedConfig:
+    view = object.__new__(SharedConfig)
+    # released when the block is closed
+    assert shm.buf is not None
+    view._shm = shm
+    view._buf = shm.buf
+    view._offset = offset
+    (view._size,) = _COUNT.unpack_from(view._buf, offset)
+    view._owner = owner
+    return view
+
+
+def _attach_at(name: str, offset: int, /) -> SharedConfig:
+    root = SharedConfig.attach(name)
+    return root if offset == root._offset else _view(root._shm, offset, owner=False)
+
+
+def share(data: AnyConfig, /, *, name: str | None = None) -> SharedConfig:
+    """
+    Copy a configuration to a new shared memory block.
+
+    Parameters
+    ----------
+    data: Mapping
+      the configuration to share (e.g., as returned by inifix.load)
+
+    name: str, optional
+      the name of the shared memory block. By default, a unique name is
+      generated.
+
+    Returns
+    -------
+    SharedConfig
+      a read-only view of the shared configuration. Its name can be passed to
+      SharedConfig.attach from other processes. The block persists until
+      unlink() is called, or the returned object is used as a context manager
+      and exits.
+
+    Raises
+    ------
+    TypeError: if data contains values of unsupported types
+    FileExistsError: if a shared memory block with this name already exists
+
+    Examples
+    --------
+    >>> import inifix
+    >>> with inifix.share({"Hydro": {"gamma": 1.4}}) as shared:
+    ...     shared["Hydro"]["gamma"]
+    1.4
+
+    .. versionadded: 7.1.0
+    """
+    from multiprocessing.shared_memory import SharedMemory
+
+    encoded = _encode(data)
+    shm = SharedMemory(name, create=True, size=len(encoded))
+    assert shm.buf is not None
+    shm.buf[: len(encoded)] = encoded
+    _, _, root = _HEADER.unpack_from(encoded, 0)
+    return _view(shm, root, owner=True)
@@ -0,0 +1,132 @@
+__all__ = [
+    "read_snapshot",
+    "snapshot_path",
+    "write_snapshot",
+]
+
+import marshal
+import os
+import sys
+from hashlib import blake2b
+from typing import Any
+
+from inifix._typing import AnyMutConfig
+
+# bumped whenever the layout of snapshot files changes
+_FORMAT_VERSION = 1
+_MAGIC = b"INIFIXSNAP"
+
+# parsing options a snapshot depends on:
+# (parse_scalars_as_lists, integer_casting, repr(schema))
+_Options = tuple[bool, str, str]
+
+
+def _cache_dir() -> str:
+    if path := os.environ.get("INIFIX_CACHE_DIR"):
+        return path
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser(
+            os.path.join("~", "AppData", "Local")
+        )
+    elif sys.platform == "darwin":
+        base = os.path.expanduser(os.path.join("~", "Library", "Caches"))
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser(
+            os.path.join("~", ".cache")
+        )
+    return os.path.join(base, "inifix", "snapshots")
+
+
+def snapshot_path(file: str, options: _Options, /) -> str:
+    # one snapshot per source file and set of parsing options
+    key = f"{os.path.abspath(file)}\0{options!r}".encode(errors="surrogateescape")
+    name = blake2b(key, digest_size=16).hexdigest()
+    return os.path.join(_cache_dir(), f"{name}.snapshot")
+
+
+def _digest(data: bytes, /) -> bytes:
+    return blake2b(data, digest_size=16).digest()
+
+
+def _header(
+    data: bytes, st: os.stat_result, options: _Options, *, validated: bool
+) -> tuple[Any, ...]:
+    from inifix._version import __version__
+
+    return (
+        _MAGIC,
+        _FORMAT_VERSION,
+        __version__,
+        options,
+        st.st_size,
+        st.st_mtime_ns,
+        _digest(data),
+        validated,
+    )
+
+
+def read_snapshot(
+    file: str, data: bytes, st: os.stat_result, options: _Options, /
+) -> tuple[AnyMutConfig, bool] | None:
+    """
+    Return the configuration stored in file's snapshot, and whether it was
+    validated, or None if there is no usable snapshot.
+
+    data and st are the source's current content and status.
+    """
+    try:
+        with open(snapshot_path(file, options), "rb") as fh:
+            buffer = fh.read()
+        size = int.from_bytes(buffer[:4], "little")
+        header = marshal.loads(buffer[4 : 4 + size])
+        expected = _header(data, st, options, validated=False)
+        if (
+            not isinstance(header, tuple)
+            or len(header) != len(expected)
+            or header[:-1] != expected[:-1]
+        ):
+            # stale, or written by another version of inifix
+            return None
+        config = marshal.loads(memoryview(buffer)[4 + size :])
+    except (OSError, EOFError, ValueError, TypeError):
+        # missing or corrupted
+        return None
+    if type(config) is not dict:
+        return None
+    return config, bool(header[-1])
+
+
+def write_snapshot(
+    file: str,
+    data: bytes,
+    st: os.stat_result,
+    options: _Options,
+    config: AnyMutConfig,
+    /,
+    *,
+    validated: bool,
+) -> None:
+    """
+    Store a snapshot of a parsed configuration.
+    Failures are ignored, since snapshots are only an optimization.
+    """
+    from inifix._io import _write_atomically
+
+    header = marshal.dumps(_header(data, st, options, validated=validated))
+    try:
+        body = marshal.dumps(config)
+    except ValueError:
+        # not marshallable (e.g., a str subclass)
+        return
+
+    def write(fh: Any) -> None:
+        fh.write(len(header).to_bytes(4, "little"))
+        fh.write(header)
+        fh.write(body)
+
+    path = snapshot_path(file, options)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        _write_atomically(path, write)
+    except OSError:
+        pass
@@ -1,11 +1,22 @@
 import re
+from array import array
+from collections.abc import Mapping
 from enum import Enum, auto
+from functools import cache
 from typing import Literal, assert_never
 
 from inifix._typing import AnyConfig
 
-_PARAM_NAME_REGEXP = re.compile(r"[-\.\w]+")
 SCALAR_TYPES = (int, float, bool, str)
+# sequences accepted as lists of values. Other sequences (e.g., bytes or range)
+# are rejected rather than silently written out element by element
+SEQUENCE_TYPES = (list, tuple, array)
+
+
+@cache
+def _param_name_regexp() -> re.Pattern[str]:
+    # compiled on first use, to keep importing inifix cheap
+    return re.compile(r"[-\.\w]+")
 
 
 class SectionsMode(Enum):
@@ -15,7 +26,7 @@ class SectionsMode(Enum):
 
 
 def _uses_invalid_chars(s: str) -> bool:
-    ma = re.fullmatch(_PARAM_NAME_REGEXP, s)
+    ma = _param_name_regexp().fullmatch(s)
     return ma is None
 
 
@@ -49,7 +60,7 @@ def collect_exceptions_for_elementary_item(
         )
 
     invalid_values: list[object] = []
-    if isinstance(value, list):
+    if isinstance(value, SEQUENCE_TYPES):
         for ev in value:
             if not isinstance(ev, SCALAR_TYPES):
                 invalid_values.append(ev)
@@ -86,7 +97,7 @@ def validate_inifile_schema(
 
     Parameters
     ----------
-    data: dict
+    data: Mapping
       the candidate configuration to be (in)validated.
 
     sections: 'allow' (default), 'forbid' or 'require'
@@ -123,7 +134,7 @@ def validate_inifile_schema(
                 f"Invalid schema: found key {k} with type {type(k).__name__}, expected a str"
             )
 
-        if isinstance(v, dict):
+        if isinstance(v, Mapping):
             match sections_mode:
                 case SectionsMode.ALLOW | SectionsMode.REQUIRE:
                     section_exceptions: list[ValueError] = []
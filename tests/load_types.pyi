@@ -1,6 +1,8 @@
 from io import BytesIO
 
 from inifix import load, loads
+from inifix._compact import CompactMapping
+from inifix._frozen import FrozenConfig
 from inifix._typing import (
     AnyMutConfig,
     MutConfig_SectionsAllowed_ScalarsForbidden,
@@ -69,3 +71,10 @@ c2_5: MutConfig_SectionsRequired_ScalarsForbidden = load(
     BytesIO(bytes_w_section), sections="require", parse_scalars_as_lists=True
 )
 c2_5 = loads(bytes_w_section.decode(), sections="require", parse_scalars_as_lists=True)
+
+# compact results don't depend on other arguments
+c3_0: CompactMapping = load(BytesIO(bytes_w_section), compact=True)
+c3_0 = loads(bytes_w_section.decode(), compact=True, sections="require")
+
+c3_1: FrozenConfig = load(BytesIO(bytes_w_section), frozen=True)
+c3_1 = loads(bytes_w_section.decode(), frozen=True, parse_scalars_as_lists=True)
@@ -0,0 +1,274 @@
+import dataclasses
+import re
+from dataclasses import dataclass, field
+from io import BytesIO, StringIO
+from pathlib import Path
+from typing import Any, Optional, Union
+
+import pytest
+
+import inifix
+
+DATA = """\
+[Grid]
+X1-grid   2  0.0  32  u  0.5  32  s  1.0
+X2-grid   1  0.0  64  u  1.0
+
+[TimeIntegrator]
+CFL       1
+tstop     1e3
+first_dt  1.e-4
+
+[Output]
+vtk       1
+log       100
+labels    'x'  y
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class Grid:
+    x1_grid: list[int | float | str] = field(metadata={"inifix": "X1-grid"})
+    x2_grid: tuple[int, float, int, str, float] = field(metadata={"inifix": "X2-grid"})
+
+
+@dataclass
+class TimeIntegrator:
+    CFL: float
+    tstop: int
+    first_dt: float = 1e-3
+    max_dt: Optional[float] = None  # noqa: UP045
+
+
+@dataclass
+class Output:
+    vtk: float
+    log: int
+    labels: tuple[str, ...] = ()
+
+
+@dataclass
+class Config:
+    grid: Grid = field(metadata={"inifix": "Grid"})
+    time_integrator: TimeIntegrator = field(metadata={"inifix": "TimeIntegrator"})
+    output: Output | None = field(default=None, metadata={"inifix": "Output"})
+
+
+@dataclass
+class Flat:
+    a: int
+    b: Union[int, str]  # noqa: UP007
+    c: bool = False
+
+
+def test_load_into() -> None:
+    conf = inifix.load_into(StringIO(DATA), Config)
+    assert conf == Config(
+        grid=Grid(
+            x1_grid=[2, 0.0, 32, "u", 0.5, 32, "s", 1.0],
+            x2_grid=(1, 0.0, 64, "u", 1.0),
+        ),
+        time_integrator=TimeIntegrator(CFL=1.0, tstop=1000, first_dt=1e-4),
+        output=Output(vtk=1.0, log=100, labels=("x", "y")),
+    )
+    assert type(conf.time_integrator.CFL) is float
+    assert type(conf.time_integrator.tstop) is int
+
+
+def test_load_into_path(tmp_path: Path) -> None:
+    file = tmp_path / "test.ini"
+    file.write_text(DATA)
+    expected = inifix.load_into(StringIO(DATA), Config)
+    assert inifix.load_into(file, Config) == expected
+    assert inifix.load_into(str(file), Config) == expected
+    with open(file, "rb") as fh:
+        assert inifix.load_into(fh, Config) == expected
+
+
+def test_sectionless() -> None:
+    assert inifix.load_into(StringIO("a 1\nb  x\nc yes"), Flat) == Flat(1, "x", True)
+    assert inifix.load_into(StringIO("a 1\nb  2"), Flat) == Flat(1, 2)
+
+
+def test_optional_section() -> None:
+    data = DATA[: DATA.index("[Output]")]
+    assert inifix.load_into(StringIO(data), Config).output is None
+
+
+def test_preamble_is_ignored() -> None:
+    conf = inifix.load_into(StringIO(f"unrelated  1\n{DATA}"), Config)
+    assert conf.output is not None
+
+
+def test_repeated_section() -> None:
+    conf = inifix.load_into(StringIO(f"{DATA}\n[Output]\nvtk 2\nlog 1"), Config)
+    assert conf.output == Output(vtk=2.0, log=1)
+
+
+@pytest.mark.parametrize(
+    "data, match",
+    [
+        (
+            "[Grid]\nX1-grid 1",
+            "Missing required parameter(s) in section 'Grid': 'X2-grid'",
+        ),
+        ("[TimeIntegrator]\nCFL 1\ntstop 1", "Missing required section 'Grid'"),
+    ],
+)
+def test_missing(data: str, match: str) -> None:
+    with pytest.raises(ValueError) as excinfo:
+        inifix.load_into(StringIO(data), Config)
+    assert match in str(excinfo.value)
+
+
+def test_missing_sectionless() -> None:
+    with pytest.raises(ValueError, match=r"^Missing required parameter\(s\): 'b'$"):
+        inifix.load_into(StringIO("a 1"), Flat)
+
+
+@pytest.mark.parametrize(
+    "data, reason",
+    [
+        (f"{DATA}\n[Hydro]\nsolver hllc", "unknown section 'Hydro'"),
+        (f"{DATA}\nsolver hllc", "unknown parameter 'solver'"),
+    ],
+)
+def test_unknown(data: str, reason: str) -> None:
+    with pytest.raises(ValueError) as excinfo:
+        inifix.load_into(StringIO(data), Config)
+    assert str(excinfo.value).endswith(f"\n{reason}")
+    conf = inifix.load_into(StringIO(data), Config, ignore_unknown=True)
+    assert conf == inifix.load_into(StringIO(DATA), Config)
+
+
+def test_section_in_sectionless_file() -> None:
+    with pytest.raises(ValueError, match="Flat has no section fields"):
+        inifix.load_into(StringIO("a 1\nb 1\n[S]"), Flat)
+
+
+def test_error_location(tmp_path: Path) -> None:
+    file = tmp_path / "test.ini"
+    file.write_text(DATA.replace("vtk       1", "vtk       never"))
+    with pytest.raises(ValueError) as excinfo:
+        inifix.load_into(file, Config)
+    assert str(excinfo.value) == (
+        f"Failed to parse {file}:11:\nvtk       never\n"
+        "'vtk': expected float, got 'never'"
+    )
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        "a 1.5\nb 1",
+        "a 1 2\nb 1",
+        "a 1\nb 1\nc 1",
+    ],
+)
+def test_casting_errors(data: str) -> None:
+    with pytest.raises(ValueError, match="(?s)^Failed to parse .*expected"):
+        inifix.load_into(StringIO(data), Flat)
+
+
+def test_missing_value() -> None:
+    with pytest.raises(ValueError, match="Failed to parse"):
+        inifix.load_into(StringIO("a\nb 1"), Flat)
+
+
+@pytest.mark.parametrize("content", ["", "\n# comment\n"])
+def test_empty_file(tmp_path: Path, content: str) -> None:
+    # same error as inifix.load
+    file = tmp_path / "empty.ini"
+    file.write_text(content)
+    match = re.escape(f"{str(file)!r} appears to be empty.")
+    with pytest.raises(ValueError, match=match):
+        inifix.load(file)
+    with pytest.raises(ValueError, match=match):
+        inifix.load_into(file, Flat)
+    with pytest.raises(ValueError, match="appears to be empty"):
+        inifix.load_into(StringIO(content), Flat)
+
+
+@dataclass
+class Unsupported:
+    a: dict[str, int]
+
+
+@dataclass
+class Nested:
+    config: Config
+
+
+@dataclass
+class Mixed:
+    a: int
+    output: Output
+
+
+@dataclass
+class InvalidKey:
+    a: int = field(metadata={"inifix": "1a"})
+
+
+@pytest.mark.parametrize(
+    "cls, exc, match",
+    [
+        (dict, TypeError, "Expected a dataclass"),
+        (Unsupported, TypeError, "Unsupported type .* for field Unsupported.a"),
+        (Nested, TypeError, "sections can't be nested"),
+        (Mixed, TypeError, "Mixed mixes sections and parameters"),
+        (InvalidKey, ValueError, "Invalid key for field InvalidKey.a"),
+    ],
+)
+def test_invalid_class(cls: type[Any], exc: type[Exception], match: str) -> None:
+    with pytest.raises(exc, match=match):
+        inifix.load_into(StringIO("a 1"), cls)
+
+
+def test_non_init_fields() -> None:
+    @dataclass
+    class WithDerived:
+        a: int
+        b: int = field(init=False)
+
+        def __post_init__(self) -> None:
+            self.b = 2 * self.a
+
+    assert inifix.load_into(StringIO("a 1"), WithDerived).b == 2
+
+
+def test_dump_from(tmp_path: Path) -> None:
+    conf = inifix.load_into(StringIO(DATA), Config)
+    file = tmp_path / "test.ini"
+    inifix.dump_from(conf, file)
+    assert inifix.load_into(file, Config) == conf
+    loaded = inifix.load(file, sections="require")
+    assert loaded["Output"]["labels"] == ["x", "y"]
+    assert "max_dt" not in loaded["TimeIntegrator"]
+
+
+def test_dump_from_handle() -> None:
+    conf = inifix.load_into(StringIO(DATA[: DATA.index("[Output]")]), Config)
+    buffer = BytesIO()
+    inifix.dump_from(conf, buffer)
+    assert "Output" not in inifix.loads(buffer.getvalue().decode())
+    assert inifix.load_into(BytesIO(buffer.getvalue()), Config) == conf
+
+
+def test_dump_from_sectionless() -> None:
+    buffer = StringIO()
+    inifix.dump_from(Flat(1, "x", True), buffer)
+    assert inifix.loads(buffer.getvalue()) == {"a": 1, "b": "x", "c": True}
+
+
+@pytest.mark.parametrize("obj", [Flat, {"a": 1}])
+def test_dump_from_invalid(obj: Any) -> None:
+    with pytest.raises(TypeError):
+        inifix.dump_from(obj, StringIO())
+
+
+def test_binding_cache() -> None:
+    from inifix._binding import _get_binding
+
+    assert _get_binding(Config) is _get_binding(Config)
+    assert dataclasses.is_dataclass(_get_binding(Config).cls)
@@ -0,0 +1,151 @@
+import math
+import re
+import sys
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import inifix
+from inifix._testing import assert_scalar_equal
+
+
+@pytest.fixture
+def files(tmp_path: Path) -> list[Path]:
+    contents = [
+        "[Hydro]\ngamma  1.4\nsolver  hllc\n\n[Grid]\nX1-grid  1  0.0  64  u  1.0\n",
+        "[Hydro]\ngamma  1.6\n\n[Grid]\nX1-grid  1  0.0  128  u  1.0  64  l  2.0\n",
+        "[Hydro]\nsolver  roe\ngamma  nan\n",
+    ]
+    paths: list[Path] = []
+    for i, content in enumerate(contents):
+        path = tmp_path / f"run{i}.ini"
+        path.write_text(content)
+        paths.append(path)
+    return paths
+
+
+def test_load_columns(files: list[Path]) -> None:
+    table = inifix.load_columns(files)
+    assert len(table) == 3
+    assert table.paths == [str(f) for f in files]
+    assert list(table.columns) == [
+        "Hydro.gamma",
+        "Hydro.solver",
+        *(f"Grid.X1-grid[{i}]" for i in range(8)),
+    ]
+
+    gamma = table.columns["Hydro.gamma"]
+    assert isinstance(gamma.values, array)
+    assert gamma.values.typecode == "d"
+    assert gamma.values[:2] == array("d", [1.4, 1.6])
+    assert math.isnan(gamma.values[2])
+    assert gamma.mask == bytearray([0, 0, 0])
+
+    solver = table.columns["Hydro.solver"]
+    assert solver.values == ["hllc", None, "roe"]
+    assert solver.mask == bytearray([0, 1, 0])
+
+    nx = table.columns["Grid.X1-grid[2]"]
+    assert nx.values == array("q", [64, 128, 0])
+    assert nx.mask == bytearray([0, 0, 1])
+
+    assert table.columns["Grid.X1-grid[6]"].values == [None, "l", None]
+    assert table.columns["Grid.X1-grid[7]"].mask == bytearray([1, 0, 1])
+
+
+def test_matches_load(inifile: Path) -> None:
+    table = inifix.load_columns([inifile])
+    expected = inifix.load(inifile)
+    flat: dict[str, Any] = {}
+    for key, value in expected.items():
+        if isinstance(value, dict):
+            flat.update({f"{key}.{k}": v for k, v in value.items()})
+        else:
+            flat[key] = value
+
+    actual: dict[str, Any] = {}
+    for name, column in table.columns.items():
+        assert column.mask == bytearray([0])
+        base, _, index = name.partition("[")
+        if index:
+            actual.setdefault(base, []).append(column.values[0])
+        else:
+            actual[base] = column.values[0]
+    assert list(actual) == list(flat)
+    for name, value in flat.items():
+        if isinstance(value, list):
+            assert len(actual[name]) == len(value)
+            for v1, v2 in zip(actual[name], value, strict=True):
+                assert_scalar_equal(v1, v2)
+        else:
+            assert_scalar_equal(actual[name], value)
+
+
+def test_load_rules(tmp_path: Path) -> None:
+    # same rules as inifix.load for ignored and repeated parameters
+    file = tmp_path / "test.ini"
+    file.write_text("a  0\n[A]\nx  1  2\nx  3\n[B]\ny  1\n[A]\nz  1\n")
+    table = inifix.load_columns([file])
+    assert list(table.columns) == ["B.y", "A.z"]
+
+    file.write_text("a  0\na  1  2\n")
+    table = inifix.load_columns([file])
+    assert list(table.columns) == ["a[0]", "a[1]"]
+    assert table.columns["a[0]"].values[0] == 1
+
+
+def test_integer_casting(files: list[Path]) -> None:
+    table = inifix.load_columns(files, integer_casting="aggressive")
+    assert table.columns["Grid.X1-grid[1]"].values == array("q", [0, 0, 0])
+
+
+def test_executor(files: list[Path]) -> None:
+    with ThreadPoolExecutor(2) as executor:
+        table = inifix.load_columns(files, executor=executor)
+    assert table.columns["Hydro.solver"].values == ["hllc", None, "roe"]
+
+
+def test_invalid_files(tmp_path: Path, files: list[Path]) -> None:
+    invalid = tmp_path / "invalid.ini"
+    invalid.write_text("[Hydro]\ngamma\n")
+    with pytest.raises(ValueError, match="Failed to parse"):
+        inifix.load_columns([*files, invalid])
+
+    invalid.write_text("[Hydro]\n1gamma  1.4\n")
+    with pytest.raises(ExceptionGroup, match="Invalid schema"):
+        inifix.load_columns([*files, invalid])
+    table = inifix.load_columns([*files, invalid], skip_validation=True)
+    assert table.columns["Hydro.1gamma"].mask == bytearray([1, 1, 1, 0])
+
+
+@pytest.mark.parametrize("content", ["", "\n\n# comment\n"])
+def test_empty_file(tmp_path: Path, content: str) -> None:
+    # same error as inifix.load
+    empty = tmp_path / "empty.ini"
+    empty.write_text(content)
+    match = re.escape(f"{str(empty)!r} appears to be empty.")
+    with pytest.raises(ValueError, match=match):
+        inifix.load(empty)
+    with pytest.raises(ValueError, match=match):
+        inifix.load_columns([empty])
+
+
+def test_to_pandas(files: list[Path]) -> None:
+    pd = pytest.importorskip("pandas")
+    df = inifix.load_columns(files).to_pandas()
+    assert list(df.index) == [str(f) for f in files]
+    assert df.index.name == "path"
+    assert df["Hydro.gamma"].dtype == pd.Float64Dtype()
+    assert df["Grid.X1-grid[2]"].dtype == pd.Int64Dtype()
+    assert df["Grid.X1-grid[2]"].isna().tolist() == [False, False, True]
+    assert df["Hydro.solver"].tolist() == ["hllc", None, "roe"]
+
+
+def test_to_pandas_missing(files: list[Path], monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setitem(sys.modules, "pandas", None)
+    table = inifix.load_columns(files)
+    with pytest.raises(ImportError, match="requires pandas"):
+        table.to_pandas()
@@ -0,0 +1,108 @@
+import pickle
+from array import array
+from pathlib import Path
+
+import pytest
+
+import inifix
+from inifix._compact import CompactMapping, compact
+from inifix._testing import assert_mapping_equal
+
+DATA = """
+a 1 2 3
+b 1.0 2.5
+c 1 two 3.0
+d 'hello world'
+e 18446744073709551616 1
+"""
+SECTIONS = f"[Section]\n{DATA}\n[Other]\nf 1\ng true false\n"
+
+
+def test_to_dict_roundtrip(inifile: Path) -> None:
+    data = inifix.load(inifile)
+    compacted = inifix.load(inifile, compact=True)
+    assert isinstance(compacted, CompactMapping)
+    assert compacted.to_dict() == data
+    assert_mapping_equal(compacted, data)
+
+
+def test_values() -> None:
+    conf = inifix.loads(SECTIONS, compact=True)
+    section = conf["Section"]
+    assert isinstance(section, CompactMapping)
+    assert isinstance(section["a"], array)
+    assert section["a"].typecode == "q"
+    assert section["b"].typecode == "d"
+    assert section["c"] == (1, "two", 3.0)
+    assert section["d"] == "hello world"
+    # out of bounds for 64-bit arrays
+    assert isinstance(section["e"], tuple)
+    assert conf.to_dict() == inifix.loads(SECTIONS)
+
+
+def test_mapping_interface() -> None:
+    conf = inifix.loads(SECTIONS, compact=True)
+    assert list(conf) == ["Section", "Other"]
+    assert len(conf) == 2
+    assert "Other" in conf
+    assert "z" not in conf
+    assert conf.get("z") is None
+    with pytest.raises(KeyError):
+        conf["z"]
+    assert conf["Other"] == {"f": 1, "g": (True, False)}
+    assert repr(conf["Other"]) == "CompactMapping({'f': 1, 'g': (True, False)})"
+
+
+def test_read_only() -> None:
+    conf = inifix.loads(DATA, compact=True)
+    with pytest.raises(TypeError):
+        conf["a"] = 1  # type: ignore[index]
+    with pytest.raises(AttributeError):
+        conf.x = 1  # type: ignore[attr-defined]
+
+
+def test_shared_keys() -> None:
+    conf1 = inifix.loads(SECTIONS, compact=True)
+    conf2 = inifix.loads(SECTIONS.replace("1", "2"), compact=True)
+    assert conf1._data[0] is conf2._data[0]
+    assert conf1["Section"]._data[0] is conf2["Section"]._data[0]
+    key1 = next(iter(conf1["Section"]))
+    key2 = next(iter(conf2["Section"]))
+    assert key1 is key2
+
+
+def test_single_use_layout() -> None:
+    # data that isn't shared is stored as it would be in a plain dict
+    conf1 = inifix.loads("unique_key_1 1.0 2.0\nunique_key_2 'a'", compact=True)
+    layout = conf1._data[0]
+    assert layout.index is None
+    assert conf1._data[1] == {"unique_key_1": array("d", [1, 2]), "unique_key_2": "a"}
+
+    # layouts are only indexed once they are reused
+    conf2 = inifix.loads("unique_key_1 3.0 4.0\nunique_key_2 'b'", compact=True)
+    assert conf2._data[0] is layout
+    assert layout.index is not None
+    assert len(conf2._data) == 3
+    assert conf1 == {"unique_key_1": array("d", [1, 2]), "unique_key_2": "a"}
+    assert conf2 == {"unique_key_1": array("d", [3, 4]), "unique_key_2": "b"}
+    assert "unique_key_1" in conf1
+    assert "unique_key_1" in conf2
+
+
+def test_pickle() -> None:
+    conf = inifix.loads(SECTIONS, compact=True)
+    clone = pickle.loads(pickle.dumps(conf))
+    assert clone == conf
+    assert clone._data[0] is conf._data[0]
+
+
+def test_options() -> None:
+    conf = inifix.loads("a 1\nb 2", compact=True, parse_scalars_as_lists=True)
+    assert conf["a"] == array("q", [1])
+    with pytest.raises(ValueError):
+        inifix.loads(SECTIONS, compact=True, sections="forbid")
+
+
+def test_compact_idempotent() -> None:
+    conf = inifix.loads(DATA, compact=True)
+    assert compact(conf) is conf
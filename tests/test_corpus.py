@@ -0,0 +1,60 @@
+from dataclasses import replace
+
+import pytest
+
+from inifix import format_string, loads
+from inifix._corpus import PRESETS, CorpusSpec, generate, generate_corpus
+from inifix._testing import assert_mapping_equal
+
+SMALL_PRESETS = {
+    "default": PRESETS["default"],
+    "sectionless": PRESETS["sectionless"],
+    "giant-section": replace(PRESETS["giant-section"], params_per_section=1000),
+    "many-tiny-sections": replace(PRESETS["many-tiny-sections"], sections=500),
+    "long-lists": replace(PRESETS["long-lists"], sections=2),
+    "comment-heavy": PRESETS["comment-heavy"],
+}
+
+
+@pytest.mark.parametrize("spec", SMALL_PRESETS.values(), ids=SMALL_PRESETS.keys())
+@pytest.mark.parametrize("seed", range(3))
+def test_expected_results(spec: CorpusSpec, seed: int) -> None:
+    sample = generate(replace(spec, seed=seed))
+    assert sample.invalid_lines == 0
+    assert sample.expected is not None
+    assert_mapping_equal(loads(sample.text), sample.expected)
+
+
+@pytest.mark.parametrize("spec", SMALL_PRESETS.values(), ids=SMALL_PRESETS.keys())
+def test_format_roundtrip(spec: CorpusSpec) -> None:
+    sample = generate(spec)
+    assert sample.expected is not None
+    assert_mapping_equal(loads(format_string(sample.text)), sample.expected)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_invalid_lines(seed: int) -> None:
+    sample = generate(replace(PRESETS["invalid"], seed=seed))
+    assert sample.invalid_lines > 0
+    assert sample.expected is None
+    with pytest.raises((ValueError, ExceptionGroup)):
+        loads(sample.text)
+
+
+def test_deterministic() -> None:
+    spec = CorpusSpec(seed=42)
+    assert generate(spec).text == generate(spec).text
+    assert generate(spec).text != generate(replace(spec, seed=43)).text
+
+
+def test_generate_corpus() -> None:
+    corpus = generate_corpus(CorpusSpec(seed=3), n=4)
+    assert [sample.spec.seed for sample in corpus] == [3, 4, 5, 6]
+    assert len({sample.text for sample in corpus}) == 4
+
+
+@pytest.mark.parametrize("sections", [0, 10])
+@pytest.mark.parametrize("size", [10_000, 100_000])
+def test_scaled(sections: int, size: int) -> None:
+    spec = CorpusSpec(sections=sections).scaled(size)
+    assert 0.75 * size < len(generate(spec).text) < 1.25 * size
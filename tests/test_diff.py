@@ -0,0 +1,130 @@
+import math
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import Any, Literal
+
+import pytest
+
+import inifix
+from inifix._diff import ConfigDiff, SectionDiff
+from inifix._typing import Scalar
+
+REFERENCE = """
+[Grid]
+X1-grid 1 0.0 64 u 1.0
+X2-grid 1 0.0 64 u 2.0
+
+[Hydro]
+solver hllc
+gamma 1.4
+"""
+
+
+@pytest.mark.parametrize("frozen", [False, True])
+def test_identical(inifile: Path, frozen: Literal[False, True]) -> None:
+    a = inifix.load(inifile, frozen=frozen)
+    b = inifix.load(inifile, frozen=frozen)
+    assert not inifix.diff(a, b)
+    assert inifix.diff(a, b) == ConfigDiff()
+
+
+@pytest.mark.parametrize("frozen", [False, True])
+def test_differences(frozen: Literal[False, True]) -> None:
+    a = inifix.loads(REFERENCE, frozen=frozen, sections="require")
+    b = inifix.loads(
+        REFERENCE.replace("X2-grid", "X3-grid").replace(
+            "gamma 1.4", "gamma 1.4\nnu 0.1"
+        ),
+        frozen=frozen,
+        sections="require",
+    )
+    d = inifix.diff(a, b)
+    assert d.sections == {
+        "Grid": SectionDiff(
+            added={"X3-grid": b["Grid"]["X3-grid"]},
+            removed={"X2-grid": a["Grid"]["X2-grid"]},
+        ),
+        "Hydro": SectionDiff(added={"nu": 0.1}),
+    }
+    assert d.format().splitlines() == [
+        "[Grid]",
+        "- X2-grid  1  0.0  64  u  2.0",
+        "+ X3-grid  1  0.0  64  u  2.0",
+        "[Hydro]",
+        "+ nu  0.1",
+    ]
+
+
+def test_sections_added_and_removed() -> None:
+    a = inifix.loads("[A]\nx 1\n[B]\ny 2")
+    b = inifix.loads("[B]\ny 2\n[C]\nz 3")
+    assert inifix.diff(a, b).sections == {
+        "A": SectionDiff(removed={"x": 1}),
+        "C": SectionDiff(added={"z": 3}),
+    }
+
+
+def test_parameters_outside_of_sections() -> None:
+    a: dict[str, Any] = {"mode": "fast", "Grid": {"nx": 64}}
+    b: dict[str, Any] = {"Grid": {"nx": 128}, "mode": "slow", "Grid2": 1}
+    d = inifix.diff(a, b)
+    assert d.sections == {
+        None: SectionDiff(added={"Grid2": 1}, changed={"mode": ("fast", "slow")}),
+        "Grid": SectionDiff(changed={"nx": (64, 128)}),
+    }
+    # parameters outside of sections are listed first
+    assert list(d.sections) == [None, "Grid"]
+    assert d.format().splitlines() == [
+        "+ Grid2  1",
+        "~ mode  fast  ->  slow",
+        "[Grid]",
+        "~ nx  64  ->  128",
+    ]
+
+
+@pytest.mark.parametrize(
+    "v1, v2, equal",
+    [
+        pytest.param(float("nan"), float("nan"), True, id="nan"),
+        pytest.param(1, 1.0, False, id="int-float"),
+        pytest.param(1, True, False, id="int-bool"),
+        pytest.param([1, 2], (1, 2), True, id="list-tuple"),
+        pytest.param([1, 2], [1, 2, 3], False, id="lengths"),
+        pytest.param([1], 1, False, id="list-scalar"),
+        pytest.param("1 2", [1, 2], False, id="str-list"),
+    ],
+)
+def test_value_equality(
+    v1: Scalar | Sequence[Scalar], v2: Scalar | Sequence[Scalar], equal: bool
+) -> None:
+    d = inifix.diff({"x": v1}, {"x": v2})
+    assert (not d) is equal
+
+
+def test_nan_in_lists() -> None:
+    assert not inifix.diff({"x": [1.0, math.nan]}, {"x": [1.0, math.nan]})
+
+
+def test_compact_and_frozen() -> None:
+    plain = inifix.loads(REFERENCE)
+    assert not inifix.diff(plain, inifix.loads(REFERENCE, compact=True))
+    assert not inifix.diff(plain, inifix.loads(REFERENCE, frozen=True))
+
+
+def test_shared_sections_are_skipped(monkeypatch: pytest.MonkeyPatch) -> None:
+    from inifix import _diff
+
+    a = inifix.loads(REFERENCE, frozen=True)
+    b = inifix.loads(REFERENCE.replace("hllc", "roe"), frozen=True)
+    compared: list[Mapping[str, Any]] = []
+    original = _diff._diff_section
+
+    def spy(s1: Mapping[str, Any], s2: Mapping[str, Any], /) -> SectionDiff:
+        compared.append(s1)
+        return original(s1, s2)
+
+    monkeypatch.setattr(_diff, "_diff_section", spy)
+    assert inifix.diff(a, b).sections == {
+        "Hydro": SectionDiff(changed={"solver": ("hllc", "roe")})
+    }
+    assert a["Grid"] not in compared
@@ -0,0 +1,162 @@
+import os
+import stat
+from pathlib import Path
+
+import pytest
+
+import inifix
+from inifix._testing import assert_mapping_equal
+
+DATA = """\
+# header comment
+[Grid]
+X1-grid   1  0.0  64  u  1.0   # radial
+X2-grid   1  0.0  64  u  2.0
+
+[Hydro]
+solver    hllc      # riemann solver
+gamma     1.4
+
+[Output]
+vtk       0.1
+"""
+
+
+def test_roundtrip(inifile: Path) -> None:
+    source = inifile.read_text()
+    doc = inifix.Document.loads(source)
+    assert not doc.changed
+    assert doc.dumps() == source
+    assert doc.dumps(reformat=True) == source
+
+
+def test_to_dict(inifile: Path) -> None:
+    doc = inifix.Document.load(inifile)
+    assert_mapping_equal(doc.to_dict(), inifix.load(inifile))
+
+
+def test_mapping_interface() -> None:
+    doc = inifix.Document.loads(DATA)
+    assert list(doc) == ["Grid", "Hydro", "Output"]
+    assert len(doc) == 3
+    assert "Hydro" in doc
+    assert doc["Hydro"]["gamma"] == 1.4
+    assert doc["Grid"]["X1-grid"] == [1, 0.0, 64, "u", 1.0]
+    assert dict(doc["Hydro"]) == {"solver": "hllc", "gamma": 1.4}
+
+
+def test_set_value() -> None:
+    doc = inifix.Document.loads(DATA)
+    doc["Hydro"]["solver"] = "roe"
+    doc["Grid"]["X1-grid"] = [1, 0.0, 128, "u", 1.0]
+    assert doc.changed
+    assert doc.dumps() == DATA.replace("hllc ", "roe  ").replace(
+        "64  u  1.0 ", "128  u  1.0"
+    )
+
+
+def test_set_equal_value() -> None:
+    doc = inifix.Document.loads(DATA)
+    doc["Hydro"]["gamma"] = 1.4
+    doc["Hydro"] = {"solver": "hllc", "gamma": 1.4}
+    assert not doc.changed
+    assert doc.dumps() == DATA
+
+
+def test_add_and_delete() -> None:
+    doc = inifix.Document.loads(DATA)
+    doc["Hydro"]["csiso"] = [1, 2]
+    del doc["Grid"]["X2-grid"]
+    del doc["Output"]
+    doc["Boundary"] = {"X1-beg": "outflow"}
+    assert doc.dumps() == (
+        "# header comment\n"
+        "[Grid]\n"
+        "X1-grid   1  0.0  64  u  1.0   # radial\n"
+        "\n"
+        "[Hydro]\n"
+        "solver    hllc      # riemann solver\n"
+        "gamma     1.4\n"
+        "csiso     1  2\n"
+        "\n"
+        "[Boundary]\n"
+        "X1-beg    outflow\n"
+    )
+    assert_mapping_equal(
+        inifix.loads(doc.dumps()),
+        {
+            "Grid": {"X1-grid": [1, 0.0, 64, "u", 1.0]},
+            "Hydro": {"solver": "hllc", "gamma": 1.4, "csiso": [1, 2]},
+            "Boundary": {"X1-beg": "outflow"},
+        },
+    )
+
+
+def test_replace_section() -> None:
+    doc = inifix.Document.loads(DATA)
+    doc["Hydro"] = {"gamma": 5 / 3}
+    assert doc.to_dict()["Hydro"] == {"gamma": 5 / 3}
+    assert "riemann solver" not in doc.dumps()
+    assert "# header comment" in doc.dumps()
+
+
+def test_reformat_modified_sections_only() -> None:
+    source = DATA.replace("vtk       0.1", "vtk 0.1")
+    doc = inifix.Document.loads(source)
+    doc["Hydro"]["solver"] = "roe"
+    assert doc.dumps(reformat=True) == source.replace(
+        "solver    hllc      #", "solver    roe    #"
+    )
+    doc["Hydro"]["adiabatic_index"] = 1.4
+    out = doc.dumps(reformat=True)
+    assert "adiabatic_index    1.4\n" in out
+    assert "solver             roe" in out
+    # untouched sections are emitted verbatim
+    assert "vtk 0.1\n" in out
+    assert "X1-grid   1  0.0  64  u  1.0   # radial\n" in out
+
+
+def test_sectionless() -> None:
+    doc = inifix.Document.loads("a  1\nb  2  # comment\n")
+    doc["b"] = 3
+    doc["c"] = "x"
+    assert doc.dumps() == "a  1\nb  3  # comment\nc  x\n"
+    with pytest.raises(ValueError, match="not expected to be grouped by section"):
+        doc["S"] = {"a": 1}
+
+
+def test_layout_error() -> None:
+    doc = inifix.Document.loads(DATA)
+    with pytest.raises(ValueError, match="expected to be grouped by section"):
+        doc["a"] = 1
+
+
+def test_invalid_value() -> None:
+    doc = inifix.Document.loads(DATA)
+    with pytest.raises(ValueError):
+        doc["Hydro"]["gamma"] = {"nested": 1}
+    assert not doc.changed
+
+
+def test_missing_values() -> None:
+    with pytest.raises(ValueError, match="Failed to parse line 3"):
+        inifix.Document.loads("[S]\na  1\nb\n", skip_validation=True)
+
+
+def test_crlf() -> None:
+    source = DATA.replace("\n", "\r\n").removesuffix("\r\n")
+    doc = inifix.Document.loads(source)
+    assert doc.dumps() == source
+    doc["Output"]["dbl"] = 1
+    assert doc.dumps() == source + "\r\ndbl       1\r\n"
+
+
+def test_dump(tmp_path: Path) -> None:
+    file = tmp_path / "test.ini"
+    file.write_text(DATA)
+    os.chmod(file, 0o640)
+    doc = inifix.Document.load(file)
+    doc["Hydro"]["gamma"] = 1.6
+    doc.dump(file)
+    assert file.read_text() == DATA.replace("1.4", "1.6")
+    assert stat.S_IMODE(file.stat().st_mode) == 0o640
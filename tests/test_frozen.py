@@ -0,0 +1,148 @@
+import copy
+import math
+import pickle
+import threading
+from pathlib import Path
+
+import pytest
+
+import inifix
+from inifix._frozen import FrozenConfig, freeze
+
+DATA = """
+[Grid]
+X1-grid 1 0.0 64 u 1.0
+X2-grid 1 0.0 64 u 2.0
+
+[Hydro]
+solver hllc
+gamma 1.4
+"""
+
+
+def test_to_dict_roundtrip(inifile: Path) -> None:
+    data = inifix.load(inifile)
+    frozen = inifix.load(inifile, frozen=True)
+    assert isinstance(frozen, FrozenConfig)
+    assert frozen.to_dict() == data
+    assert frozen == freeze(data)
+
+
+def test_values() -> None:
+    conf = inifix.loads(DATA, frozen=True)
+    assert isinstance(conf["Grid"], FrozenConfig)
+    assert conf["Grid"]["X1-grid"] == (1, 0.0, 64, "u", 1.0)
+    assert conf["Hydro"]["gamma"] == 1.4
+    assert list(conf) == ["Grid", "Hydro"]
+    assert len(conf["Grid"]) == 2
+    assert "Hydro" in conf
+    with pytest.raises(KeyError):
+        conf["Output"]
+
+
+def test_immutable() -> None:
+    conf = inifix.loads(DATA, frozen=True)
+    with pytest.raises(TypeError):
+        conf["Hydro"] = {}  # type: ignore[index]
+    with pytest.raises(AttributeError):
+        conf.x = 1  # type: ignore[attr-defined]
+    assert copy.copy(conf) is conf
+    assert copy.deepcopy(conf) is conf
+
+
+def test_hashable() -> None:
+    conf1 = inifix.loads(DATA, frozen=True)
+    conf2 = inifix.loads(DATA, frozen=True)
+    conf3 = inifix.loads(DATA.replace("1.4", "5/3"), frozen=True)
+    assert hash(conf1) == hash(conf2)
+    assert len({conf1, conf2, conf3}) == 2
+    cache = {conf1: "result"}
+    assert cache[conf2] == "result"
+
+
+def test_identical_configs_are_shared() -> None:
+    conf1 = inifix.loads(DATA, frozen=True)
+    conf2 = inifix.loads(DATA, frozen=True)
+    assert conf1 is conf2
+
+
+def test_unchanged_sections_are_shared() -> None:
+    conf1 = inifix.loads(DATA, frozen=True)
+    conf2 = inifix.loads(DATA.replace("hllc", "roe"), frozen=True)
+    assert conf1 != conf2
+    assert conf1["Grid"] is conf2["Grid"]
+
+
+@pytest.mark.parametrize(
+    "a, b",
+    [
+        pytest.param("1", "true", id="int-bool"),
+        pytest.param("1", "1.0", id="int-float"),
+        pytest.param("0.0", "-0.0", id="signed-zeros"),
+    ],
+)
+def test_equal_values_of_different_types_are_not_shared(a: str, b: str) -> None:
+    conf1 = inifix.loads(f"[Section]\nx {a}", frozen=True)
+    conf2 = inifix.loads(f"[Section]\nx {b}", frozen=True)
+    # these compare equal, as in plain dicts, but are distinct objects
+    assert conf1 == conf2
+    assert conf1 is not conf2
+    assert conf1["Section"] is not conf2["Section"]
+    assert repr(conf1["Section"]["x"]) == repr(inifix.loads(f"x {a}")["x"])
+
+
+def test_nan() -> None:
+    conf = inifix.loads("x nan", frozen=True)
+    assert math.isnan(conf["x"])
+    assert conf == conf
+
+
+def test_replace() -> None:
+    conf = inifix.loads(DATA, frozen=True)
+    new = conf.replace({"Hydro": {"gamma": 1.0}})
+    assert new["Hydro"] == {"solver": "hllc", "gamma": 1.0}
+    assert new["Grid"] is conf["Grid"]
+    assert conf["Hydro"]["gamma"] == 1.4
+    assert new.replace({"Hydro": {"gamma": 1.4}}) is conf
+
+
+def test_dump(tmp_path: Path) -> None:
+    conf = inifix.loads(DATA, frozen=True)
+    assert inifix.dumps(conf) == inifix.dumps(conf.to_dict())
+    file = tmp_path / "frozen.ini"
+    inifix.dump(conf, file)
+    assert inifix.load(file, frozen=True) is conf
+
+
+def test_validate() -> None:
+    conf = inifix.loads(DATA, frozen=True)
+    inifix.validate_inifile_schema(conf, sections="require")
+    with pytest.raises(ValueError):
+        inifix.validate_inifile_schema(conf, sections="forbid")
+    invalid = freeze({"Section": {"x": [1, None]}})  # type: ignore[arg-type]
+    with pytest.raises(ExceptionGroup):
+        inifix.validate_inifile_schema(invalid)
+
+
+def test_pickle() -> None:
+    conf = inifix.loads(DATA, frozen=True)
+    assert pickle.loads(pickle.dumps(conf)) is conf
+
+
+def test_threads() -> None:
+    results: list[FrozenConfig] = []
+
+    def target() -> None:
+        results.append(inifix.loads(DATA, frozen=True))
+
+    threads = [threading.Thread(target=target) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(conf is results[0] for conf in results)
+
+
+def test_compact_and_frozen() -> None:
+    with pytest.raises(ValueError, match="mutually exclusive"):
+        inifix.loads(DATA, compact=True, frozen=True)  # type: ignore[call-overload]
@@ -0,0 +1,80 @@
+import re
+import subprocess
+import sys
+
+import pytest
+
+# budgets are expressed in microseconds, and compared to the best of a few runs,
+# so they are deliberately generous: they are meant to catch regressions
+# (e.g., a heavy module being imported eagerly), not to benchmark
+IMPORT_BUDGET_US = 10_000
+LOAD_IMPORT_BUDGET_US = 50_000
+N_RUNS = 5
+
+_IMPORTTIME_LINE = re.compile(
+    r"import time:\s+(?P<self>\d+) \|\s+(?P<cumulative>\d+) \|(?P<indent>\s+)(?P<name>\S+)"
+)
+
+
+def _importtime(code: str) -> dict[str, int]:
+    # cumulative import time for each module, in microseconds
+    res = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    timings: dict[str, int] = {}
+    for line in res.stderr.splitlines():
+        if (match := _IMPORTTIME_LINE.match(line)) is not None:
+            timings[match["name"]] = int(match["cumulative"])
+    return timings
+
+
+def _best_cumulative_time(code: str, module: str) -> int:
+    return min(_importtime(code)[module] for _ in range(N_RUNS))
+
+
+def test_import_is_lazy() -> None:
+    res = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, inifix; print(*sorted(m for m in sys.modules if m.startswith('inifix')))",
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    assert res.stdout.split() == ["inifix"]
+
+
+def test_lazy_attributes() -> None:
+    import inifix
+
+    for name in inifix.__all__:
+        assert getattr(inifix, name) is not None
+        assert name in dir(inifix)
+
+    with pytest.raises(AttributeError, match="has no attribute 'not_a_thing'"):
+        inifix.not_a_thing  # noqa: B018
+
+
+def test_import_time_budget() -> None:
+    assert _best_cumulative_time("import inifix", "inifix") < IMPORT_BUDGET_US
+
+
+def test_load_import_time_budget() -> None:
+    # accessing a public function pulls in its submodule, which is measured
+    # from the importtime line of inifix._io
+    code = "import inifix; inifix.load"
+    assert _best_cumulative_time(code, "inifix._io") < LOAD_IMPORT_BUDGET_US
+
+
+@pytest.mark.parametrize(
+    "module", ["inifix._compact", "inifix._frozen", "inifix._schema"]
+)
+def test_optional_modules_are_lazy(module: str) -> None:
+    # modules only needed for some options are imported when these are used
+    code = f"import sys, inifix; inifix.load; assert {module!r} not in sys.modules"
+    subprocess.run([sys.executable, "-c", code], check=True)
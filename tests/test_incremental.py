@@ -0,0 +1,118 @@
+import random
+from pathlib import Path
+
+import pytest
+
+import inifix
+from inifix._testing import assert_mapping_equal
+
+LINES = [
+    "[Grid]",
+    "[Hydro]",
+    "[Grid]",
+    "a  1",
+    "b  2  3",
+    "a  x",
+    "c  1.5  # comment",
+    "",
+    "# comment",
+    "e  'x y'",
+]
+INVALID_LINES = ["d", "1a  2"]
+
+
+def test_initial_state(inifile: Path) -> None:
+    source = inifile.read_text()
+    parser = inifix.IncrementalParser(source)
+    assert parser.diagnostics == []
+    assert_mapping_equal(parser.config, inifix.loads(source))
+
+
+def test_edit() -> None:
+    parser = inifix.IncrementalParser("[Hydro]\ngamma  1.4\n")
+    result = parser.edit(1, 2, "gamma  5/3")
+    assert result.config == {"Hydro": {"gamma": "5/3"}}
+    assert result.diagnostics == []
+
+    result = parser.edit(2, 2, "[Grid]\nX1-grid  1  0.0  64  u  1.0\n")
+    assert result.config == {
+        "Hydro": {"gamma": "5/3"},
+        "Grid": {"X1-grid": [1, 0.0, 64, "u", 1.0]},
+    }
+
+    # removing a header merges sections
+    result = parser.edit(2, 3, "")
+    assert result.config == {
+        "Hydro": {"gamma": "5/3", "X1-grid": [1, 0.0, 64, "u", 1.0]}
+    }
+
+    # and removing the last one drops sections altogether
+    result = parser.edit(0, 1, "")
+    assert result.config == {"gamma": "5/3", "X1-grid": [1, 0.0, 64, "u", 1.0]}
+
+
+def test_diagnostics() -> None:
+    parser = inifix.IncrementalParser("[Hydro]\ngamma  1.4\n")
+    result = parser.edit(1, 2, "gamma\n")
+    assert result.config == {"Hydro": {}}
+    [diagnostic] = result.diagnostics
+    assert diagnostic.lineno == 2
+    assert diagnostic.message == "Failed to parse 'gamma': expected at least one value"
+
+    # diagnostics follow lines as others are inserted
+    result = parser.edit(0, 0, "# comment\n\n")
+    assert [d.lineno for d in result.diagnostics] == [4]
+
+    result = parser.edit(3, 4, "1gamma  1.4")
+    [diagnostic] = result.diagnostics
+    assert (
+        diagnostic.message
+        == "Found key '1gamma'. Keys are expected to start with a letter"
+    )
+    # invalid keys are still parsed, as with skip_validation=True
+    assert result.config == {"Hydro": {"1gamma": 1.4}}
+
+    assert parser.edit(3, 4, "gamma  1.4").diagnostics == []
+
+
+def test_invalid_keys_are_kept() -> None:
+    result = inifix.IncrementalParser("[A]\na$b 1\nc 2\n").edit(3, 3, "d\n")
+    assert result.config == {"A": {"a$b": 1, "c": 2}}
+    assert [d.lineno for d in result.diagnostics] == [2, 4]
+
+
+def test_parse_scalars_as_lists() -> None:
+    parser = inifix.IncrementalParser("a  1\n", parse_scalars_as_lists=True)
+    assert parser.edit(1, 1, "b  2  3").config == {"a": [1], "b": [2, 3]}
+
+
+def test_invalid_range() -> None:
+    parser = inifix.IncrementalParser("a  1\n")
+    with pytest.raises(IndexError, match=r"Invalid line range \[1, 3\)"):
+        parser.edit(1, 3, "")
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_random_edits(seed: int) -> None:
+    # results should always match a full parse of the current content
+    rng = random.Random(seed)
+    pool = LINES + INVALID_LINES
+    lines = rng.choices(pool, k=rng.randrange(12))
+    parser = inifix.IncrementalParser("".join(f"{line}\n" for line in lines))
+    for _ in range(20):
+        start = rng.randrange(len(lines) + 1)
+        end = rng.randrange(start, len(lines) + 1)
+        new = rng.choices(pool, k=rng.randrange(4))
+        lines[start:end] = new
+        result = parser.edit(start, end, "".join(f"{line}\n" for line in new))
+
+        expected = inifix.loads(
+            "\n".join(line for line in lines if line != "d"), skip_validation=True
+        )
+        assert_mapping_equal(result.config, expected)
+        assert list(result.config) == list(expected)
+        assert {d.lineno for d in result.diagnostics} == {
+            lineno
+            for lineno, line in enumerate(lines, start=1)
+            if line in INVALID_LINES
+        }
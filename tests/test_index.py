@@ -0,0 +1,150 @@
+import math
+import os
+import sqlite3
+from collections.abc import Generator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import inifix
+
+RUN = """\
+[Hydro]
+solver    hllc
+gamma     {gamma}
+
+[Grid]
+X1-grid   1  0.0  {nx}  u  1.0
+
+[TimeIntegrator]
+scheme    {scheme}
+"""
+
+
+@pytest.fixture
+def runs(tmp_path: Path) -> list[str]:
+    files: list[str] = []
+    for i, (gamma, scheme) in enumerate(
+        [(1.4, "RK2"), (1.4, "RK3"), (1.6, "RK3"), ("5/3", "RK3")]
+    ):
+        file = tmp_path / f"run{i}.ini"
+        file.write_text(RUN.format(gamma=gamma, nx=64 * (i + 1), scheme=scheme))
+        files.append(str(file))
+    return files
+
+
+@pytest.fixture
+def index(tmp_path: Path) -> Generator[inifix.Index, None, None]:
+    with inifix.Index(tmp_path / "index.db") as index:
+        yield index
+
+
+def test_update(index: inifix.Index, runs: list[str]) -> None:
+    assert index.update(runs) == inifix._index.IndexUpdate(added=4)
+    assert len(index) == 4
+
+    # unchanged files are skipped
+    assert index.update(runs) == inifix._index.IndexUpdate(unchanged=4)
+
+    # touched files are re-hashed, but not parsed
+    os.utime(runs[0], ns=(0, 0))
+    assert index.update(runs) == inifix._index.IndexUpdate(unchanged=4)
+
+    with open(runs[1], "a") as fh:
+        fh.write("cfl       0.2\n")
+    assert index.update(runs[1:]) == inifix._index.IndexUpdate(
+        updated=1, unchanged=2, removed=1
+    )
+    assert len(index) == 3
+    assert index.query({"cfl": 0.2}) == [runs[1]]
+
+
+def test_update_no_prune(index: inifix.Index, runs: list[str]) -> None:
+    index.update(runs)
+    assert index.update(runs[:1], prune=False) == inifix._index.IndexUpdate(unchanged=1)
+    assert len(index) == 4
+
+
+def test_update_executor(index: inifix.Index, runs: list[str]) -> None:
+    with ThreadPoolExecutor(2) as executor:
+        assert index.update(runs, executor=executor).added == 4
+    assert index.query({"Hydro": {"gamma": 1.4}}) == runs[:2]
+
+
+def test_update_errors(index: inifix.Index, runs: list[str], tmp_path: Path) -> None:
+    invalid = tmp_path / "invalid.ini"
+    invalid.write_text("[Hydro]\ngamma\n")
+    update = index.update([*runs, invalid, tmp_path / "missing.ini"])
+    assert update.added == 6
+    assert sorted(update.errors) == [
+        str(invalid),
+        str(tmp_path / "missing.ini"),
+    ]
+    assert "Failed to parse" in update.errors[str(invalid)]
+    # files with errors are scanned again on the next update
+    invalid.write_text("[Hydro]\ngamma 1.4\n")
+    update = index.update([*runs, invalid])
+    assert update.updated == 1
+    assert update.removed == 1
+    assert str(invalid) in index.query({"Hydro": {"gamma": 1.4}})
+
+
+@pytest.mark.parametrize("content", ["", "# only a comment\n\n"])
+def test_update_empty_file(index: inifix.Index, tmp_path: Path, content: str) -> None:
+    empty = tmp_path / "empty.ini"
+    empty.write_text(content)
+    update = index.update([empty])
+    assert update.errors == {str(empty): f"{str(empty)!r} appears to be empty."}
+    assert index.query({}) == [str(empty)]
+
+
+@pytest.mark.parametrize(
+    "conditions, expected",
+    [
+        ({}, [0, 1, 2, 3]),
+        ({"Hydro": {"gamma": 1.4}}, [0, 1]),
+        ({"gamma": 1.4}, [0, 1]),
+        ({"Grid": {"gamma": 1.4}}, []),
+        ({"Hydro": {"gamma": 1.4}, "TimeIntegrator": {"scheme": "RK3"}}, [1]),
+        ({"gamma": 1.4, "scheme": "RK3"}, [1]),
+        ({"gamma": "5/3"}, [3]),
+        # types must match
+        ({"gamma": 1}, []),
+        ({"X1-grid": [1, 0.0, 128, "u", 1.0]}, [1]),
+        ({"X1-grid": [1, 0, 128, "u", 1.0]}, []),
+        # lists must match exactly
+        ({"X1-grid": [1, 0.0, 128, "u"]}, []),
+        ({"X1-grid": [1, 0.0, 128, "u", 1.0, 2]}, []),
+        ({"X1-grid": 1}, []),
+    ],
+)
+def test_query(
+    index: inifix.Index,
+    runs: list[str],
+    conditions: dict[str, Any],
+    expected: list[int],
+) -> None:
+    index.update(runs)
+    assert index.query(conditions) == [runs[i] for i in expected]
+
+
+def test_query_special_values(index: inifix.Index, tmp_path: Path) -> None:
+    file = tmp_path / "special.ini"
+    file.write_text("a  nan\nb  true\nc  1\nd  123456789012345678901234567890\n")
+    index.update([file])
+    assert index.query({"a": math.nan}) == [str(file)]
+    assert index.query({"b": True}) == [str(file)]
+    assert index.query({"b": 1}) == []
+    assert index.query({"c": True}) == []
+    assert index.query({"d": 123456789012345678901234567890}) == [str(file)]
+
+
+def test_incompatible_schema(tmp_path: Path) -> None:
+    database = tmp_path / "index.db"
+    with sqlite3.connect(database) as conn:
+        conn.execute("PRAGMA user_version = 1000")
+    conn.close()
+    with pytest.raises(ValueError, match="incompatible version of inifix"):
+        inifix.Index(database)
@@ -28,7 +28,14 @@ PARSING_OPTIONS = """
         as Python floats). Setting `integer_casting='aggressive'` will instead
         parse these as Python ints, matching the behavior of inifix 4.5
 
-        .. versionadded: 5.0.0"""
+        .. versionadded: 5.0.0
+
+    schema: inifix.Schema, optional
+        expected types of parameters. Declared parameters are cast directly
+        to their type, instead of having their type inferred, and values that
+        can't be cast to it are parse errors.
+
+        .. versionadded: 7.1.0"""
 
 VALIDATION_OPTIONS = """
     sections: 'allow' (default), 'forbid' or 'require'
@@ -50,6 +57,34 @@ VALIDATION_OPTIONS = """
 
         .. versionadded: 4.1.0"""
 
+OUTPUT_OPTIONS = """
+    compact: bool (default: False)
+        if set to True, return a read-only, memory-efficient mapping instead
+        of a dict. Keys are interned and shared between results, and
+        homogeneous lists of ints or floats are stored as array.array objects.
+        Use the to_dict() method to get a mutable copy.
+
+        .. versionadded: 7.1.0
+
+    frozen: bool (default: False)
+        if set to True, return an immutable, hashable mapping instead of a
+        dict, with lists stored as tuples. Identical sections and configurations
+        are shared between results. Cannot be combined with compact=True.
+        Use the to_dict() method to get a mutable copy.
+
+        .. versionadded: 7.1.0"""
+
+SNAPSHOT_OPTIONS = """
+    snapshot: bool (default: False)
+        if set to True, keep a binary snapshot of the parsed (and validated)
+        configuration in a cache directory, and use it on subsequent calls
+        instead of parsing again, as long as the file's content and parsing
+        options are unchanged. Stale or corrupted snapshots are ignored.
+        The cache directory can be set with the INIFIX_CACHE_DIR environment
+        variable. Requires source to be a path.
+
+        .. versionadded: 7.1.0"""
+
 DUMP_DOCSTRING: str = cleandoc(
     f"""
     Write data to a file.
@@ -106,6 +141,8 @@ LOAD_DOCSTRING: str = cleandoc(
           In binary mode, we assume UTF-8 encoding.
     {PARSING_OPTIONS}
     {VALIDATION_OPTIONS}
+    {OUTPUT_OPTIONS}
+    {SNAPSHOT_OPTIONS}
 
     See Also
     --------
@@ -123,6 +160,7 @@ LOADS_DOCSTRING: str = cleandoc(
         The content of a parameter file (has to be inifix format-compliant)
     {PARSING_OPTIONS}
     {VALIDATION_OPTIONS}
+    {OUTPUT_OPTIONS}
 
     See Also
     --------
@@ -0,0 +1,132 @@
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import inifix
+from inifix import Overlay
+from inifix._testing import assert_mapping_equal
+from inifix._typing import (
+    MutConfig_SectionsRequired_ScalarsAllowed,
+    MutSection_ScalarsAllowed,
+)
+
+BASE: MutConfig_SectionsRequired_ScalarsAllowed = {
+    "Grid": {"X1-grid": [1, 0.0, 64, "u", 1.0], "X2-grid": [1, 0.0, 64, "u", 1.0]},
+    "Hydro": {"solver": "hllc", "gamma": 1.4},
+    "Output": {"vtk": 10},
+}
+SITE: MutConfig_SectionsRequired_ScalarsAllowed = {"Output": {"vtk": 1, "log": 100}}
+RUN: MutConfig_SectionsRequired_ScalarsAllowed = {
+    "Hydro": {"gamma": 1.67},
+    "Boundary": {"X1-beg": "periodic"},
+}
+
+
+@pytest.fixture()
+def conf() -> Overlay:
+    return inifix.overlay(RUN, SITE, BASE)
+
+
+def test_lookup(conf: Overlay) -> None:
+    assert conf["Hydro"]["gamma"] == 1.67
+    assert conf["Hydro"]["solver"] == "hllc"
+    assert conf["Output"]["vtk"] == 1
+    assert conf["Output"]["log"] == 100
+    assert conf["Grid"]["X1-grid"] == [1, 0.0, 64, "u", 1.0]
+    assert conf["Boundary"]["X1-beg"] == "periodic"
+    assert isinstance(conf["Hydro"], Overlay)
+    with pytest.raises(KeyError):
+        conf["Hydro"]["missing"]
+    with pytest.raises(KeyError):
+        conf["missing"]
+
+
+def test_mapping_interface(conf: Overlay) -> None:
+    assert len(conf) == 4
+    assert list(conf) == ["Grid", "Hydro", "Output", "Boundary"]
+    assert list(conf["Output"]) == ["vtk", "log"]
+    assert len(conf["Output"]) == 2
+    assert "Boundary" in conf
+    assert "missing" not in conf
+    assert 1 not in conf  # type: ignore[comparison-overlap]
+    assert repr(conf) == "Overlay(3 layers, 4 keys)"
+
+
+def test_flatten(conf: Overlay) -> None:
+    flat = conf.flatten()
+    assert flat == {
+        "Grid": BASE["Grid"],
+        "Hydro": {"solver": "hllc", "gamma": 1.67},
+        "Output": {"vtk": 1, "log": 100},
+        "Boundary": {"X1-beg": "periodic"},
+    }
+    assert conf == flat
+    assert list(flat) == list(conf)
+    # layers are not modified, or shared with the result
+    flat["Grid"]["X1-grid"].append(2)
+    flat["Hydro"]["gamma"] = 1
+    assert BASE["Grid"]["X1-grid"] == [1, 0.0, 64, "u", 1.0]
+    assert RUN["Hydro"]["gamma"] == 1.67
+
+
+def test_no_copy() -> None:
+    run = {"Hydro": {"gamma": 1.67}}
+    conf = inifix.overlay(run, BASE)
+    run["Hydro"]["gamma"] = 2.0
+    assert conf["Hydro"]["gamma"] == 2.0
+
+
+def test_shadowing() -> None:
+    # values that are not sections shadow sections in later layers, and
+    # vice versa
+    conf = inifix.overlay({"a": {"x": 1}}, {"a": 1}, {"a": {"y": 1}})
+    assert dict(conf["a"]) == {"x": 1}
+    assert conf.flatten() == {"a": {"x": 1}}
+    conf = inifix.overlay({"a": 1}, {"a": {"x": 1}})
+    assert conf["a"] == 1
+    assert conf.flatten() == {"a": 1}
+
+
+def test_sectionless() -> None:
+    base: MutSection_ScalarsAllowed = {"a": 1, "b": [1, 2]}
+    conf = inifix.overlay({"a": 2}, base)
+    assert conf.flatten() == {"a": 2, "b": [1, 2]}
+
+
+def test_nested_overlays(conf: Overlay) -> None:
+    nested = inifix.overlay(RUN, inifix.overlay(SITE, BASE))
+    assert nested == conf
+    assert repr(nested) == "Overlay(3 layers, 4 keys)"
+
+
+def test_no_layers() -> None:
+    conf = inifix.overlay()
+    assert len(conf) == 0
+    assert conf.flatten() == {}
+
+
+def test_frozen_and_compact_layers(inifile: Path) -> None:
+    data = inifix.load(inifile)
+    conf = inifix.overlay(
+        inifix.load(inifile, frozen=True), inifix.load(inifile, compact=True)
+    )
+    assert_mapping_equal(conf.flatten(), data)
+
+
+def test_dump(conf: Overlay, tmp_path: Path) -> None:
+    assert inifix.loads(inifix.dumps(conf)) == conf.flatten()
+    file = tmp_path / "test.ini"
+    inifix.dump(conf, file)
+    assert inifix.load(file) == conf.flatten()
+
+
+def test_dump_validation() -> None:
+    with pytest.raises(ExceptionGroup):
+        inifix.dumps(inifix.overlay({"S": {"1a": 1}}, {"S": {"a": 1}}))
+
+
+@pytest.mark.parametrize("config", [None, [("a", 1)], "a"])
+def test_invalid_layer(config: Any) -> None:
+    with pytest.raises(TypeError, match="Expected a mapping"):
+        inifix.overlay(BASE, config)
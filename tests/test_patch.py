@@ -0,0 +1,128 @@
+import math
+import os
+import stat
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import inifix
+from inifix._typing import (
+    MutConfig_SectionsRequired_ScalarsAllowed,
+    MutSection_ScalarsAllowed,
+)
+
+DATA = """\
+# header comment
+[Grid]
+X1-grid   1  0.0  64  u  1.0   # radial
+X2-grid   1  0.0  64  u  2.0
+
+[Hydro]
+solver    hllc      # riemann solver
+gamma     1.4
+"""
+
+
+@pytest.fixture
+def target(tmp_path: Path) -> Path:
+    file = tmp_path / "test.ini"
+    file.write_text(DATA)
+    return file
+
+
+def test_patch(target: Path) -> None:
+    updates: MutConfig_SectionsRequired_ScalarsAllowed = {
+        "Grid": {"X1-grid": [1, 0.0, 128, "u", 1.0]},
+        "Hydro": {"solver": "roe"},
+    }
+    inifix.patch(target, updates)
+    assert target.read_text() == DATA.replace(
+        "64  u  1.0   # radial", "128  u  1.0  # radial"
+    ).replace("hllc      #", "roe       #")
+
+
+def test_patch_matches_load(target: Path) -> None:
+    updates: MutConfig_SectionsRequired_ScalarsAllowed = {
+        "Grid": {"X2-grid": [2, -1.0, 32, "l", 1e10]},
+        "Hydro": {"gamma": 5},
+    }
+    expected = inifix.load(target, sections="require")
+    for section, params in updates.items():
+        expected[section].update(params)
+    inifix.patch(target, updates)
+    assert inifix.load(target) == expected
+
+
+def test_new_parameters_and_sections(target: Path) -> None:
+    inifix.patch(target, {"Hydro": {"nu": 1e-3}, "Output": {"vtk": 0.1}})
+    assert target.read_text() == DATA + "nu        1e-3\n\n[Output]\nvtk    0.1\n"
+
+
+def test_unchanged_values(target: Path) -> None:
+    before = os.stat(target)
+    # 1.40 is equal to 1.4, so this line is kept as is
+    inifix.patch(target, {"Hydro": {"gamma": 1.40}, "Grid": {}})
+    after = os.stat(target)
+    assert target.read_text() == DATA
+    assert after.st_ino == before.st_ino
+    assert after.st_mtime_ns == before.st_mtime_ns
+
+
+def test_nan(tmp_path: Path) -> None:
+    target = tmp_path / "test.ini"
+    target.write_text("a nan\n")
+    before = os.stat(target)
+    inifix.patch(target, {"a": math.nan})
+    assert os.stat(target).st_ino == before.st_ino
+
+
+def test_sectionless(tmp_path: Path) -> None:
+    target = tmp_path / "test.ini"
+    target.write_text("a 1 # one\nb  2  3\n")
+    updates: MutSection_ScalarsAllowed = {"a": 10, "b": [4, 5, 6], "c": "hello world"}
+    inifix.patch(target, updates)
+    assert target.read_text() == "a 10 # one\nb  4  5  6\nc  'hello world'\n"
+
+
+def test_last_occurrence_wins(tmp_path: Path) -> None:
+    target = tmp_path / "test.ini"
+    target.write_text("[A]\nx 1\nx 2\n[A]\nx 3\n")
+    inifix.patch(target, {"A": {"x": 4}})
+    assert target.read_text() == "[A]\nx 1\nx 2\n[A]\nx 4\n"
+    assert inifix.load(target) == {"A": {"x": 4}}
+
+
+def test_line_endings(tmp_path: Path) -> None:
+    target = tmp_path / "test.ini"
+    target.write_bytes(b"[A]\r\nx 1\r\ny 2")
+    inifix.patch(target, {"A": {"x": 3, "z": 4}})
+    assert target.read_bytes() == b"[A]\r\nx 3\r\ny 2\r\nz 4\r\n"
+
+
+def test_file_mode(target: Path) -> None:
+    target.chmod(0o640)
+    inifix.patch(target, {"Hydro": {"gamma": 2.0}})
+    assert stat.S_IMODE(os.stat(target).st_mode) == 0o640
+
+
+@pytest.mark.parametrize(
+    "updates, match",
+    [
+        pytest.param({"gamma": 2.0}, "expected to be grouped by section", id="layout"),
+        pytest.param({"Hydro": {"gamma": None}}, None, id="invalid-value"),
+    ],
+)
+def test_invalid_updates(
+    target: Path, updates: dict[str, Any], match: str | None
+) -> None:
+    with pytest.raises((ValueError, ExceptionGroup), match=match):
+        inifix.patch(target, updates)
+    assert target.read_text() == DATA
+
+
+def test_sections_in_sectionless_file(tmp_path: Path) -> None:
+    target = tmp_path / "test.ini"
+    target.write_text("a 1\n")
+    with pytest.raises(ValueError, match="not expected to be grouped by section"):
+        inifix.patch(target, {"A": {"a": 1}})
@@ -0,0 +1,134 @@
+import contextvars
+import threading
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+
+import inifix
+from inifix import _io
+
+
+def test_profile_load(datadir: Path) -> None:
+    with inifix.profile_load() as prof:
+        data = inifix.load(
+            datadir / "idefix-khi.ini", parse_scalars_as_lists=True, sections="require"
+        )
+        inifix.loads("a 1 2 3\nb 'hello world'")
+
+    assert prof.calls["load"] == 1
+    assert prof.calls["parse"] == 2
+    assert prof.calls["validate"] == 2
+    assert set(prof.time) == {
+        "load",
+        "parse",
+        "normalize",
+        "tokenize",
+        "cast",
+        "validate",
+    }
+    assert all(t >= 0 for t in prof.time.values())
+    assert prof.time["load"] >= prof.time["parse"]
+    assert prof.time["parse"] >= prof.time["tokenize"] + prof.time["cast"]
+
+    # tokenizing and casting are timed once per section
+    assert prof.calls["tokenize"] == prof.calls["cast"] == len(data) + 1
+    assert prof.lines == sum(len(section) for section in data.values()) + 2
+    assert prof.tokens == sum(
+        1 + len(values) for section in data.values() for values in section.values()
+    ) + (4 + 2)
+
+    stats = prof.as_dict()
+    assert stats["lines"] == prof.lines
+    assert stats["load.calls"] == 1
+    assert stats["cast.time"] == prof.time["cast"]
+
+
+def test_load_entry_points(datadir: Path, tmp_path: Path) -> None:
+    file = tmp_path / "test.ini"
+    file.write_bytes((datadir / "idefix-khi.ini").read_bytes())
+    with inifix.profile_load() as prof:
+        expected = inifix.load(file)
+        with open(file, "rb") as fh:
+            assert inifix.load(fh) == expected
+        assert inifix.load(BytesIO(file.read_bytes())) == expected
+        for _ in range(2):
+            # a miss, then a hit
+            assert inifix.load(file, snapshot=True) == expected
+    assert prof.calls["load"] == 5
+    assert prof.calls["parse"] == 4
+    assert prof.snapshot_misses == 1
+    assert prof.snapshot_hits == 1
+
+
+def test_hooks_are_disabled_outside_of_context() -> None:
+    assert not _io._profiling
+    with inifix.profile_load():
+        with inifix.profile_load():
+            assert _io._profiling
+        assert _io._profiling
+    assert not _io._profiling
+
+
+def test_schema_casters() -> None:
+    schema = inifix.Schema({"a": int, "b": list[float]})
+    with inifix.profile_load() as prof:
+        inifix.loads("a 1\nb 2 3\nc 'hello'", schema=schema)
+    assert prof.calls["cast"] == 1
+    assert prof.lines == 3
+    assert prof.tokens == 2 + 3 + 2
+
+
+def test_results_are_unchanged(datadir: Path) -> None:
+    file = datadir / "idefix-khi.ini"
+    expected = inifix.load(file)
+    with inifix.profile_load():
+        assert inifix.load(file) == expected
+
+
+def test_nested_contexts() -> None:
+    with inifix.profile_load() as outer:
+        inifix.loads("a 1")
+        with inifix.profile_load() as inner:
+            inifix.loads("b 2 3")
+        inifix.loads("c 4")
+    assert inner.lines == 1
+    assert inner.tokens == 3
+    assert outer.lines == 3
+    assert outer.tokens == 7
+
+
+def test_errors_are_recorded() -> None:
+    with inifix.profile_load() as prof, pytest.raises(ValueError, match="line 1"):
+        inifix.loads("a")
+    assert prof.calls["parse"] == 1
+    assert prof.lines == 0
+
+
+def test_concurrent_loads() -> None:
+    def target() -> None:
+        for _ in range(10):
+            inifix.loads("a 1 2\nb 3")
+
+    with inifix.profile_load() as prof:
+        # threads running in a copy of the profiling context are accounted for
+        threads = [
+            threading.Thread(target=contextvars.copy_context().run, args=(target,))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    assert prof.lines == 4 * 10 * 2
+    assert prof.tokens == 4 * 10 * 5
+
+
+def test_other_threads_are_ignored() -> None:
+    with inifix.profile_load() as prof:
+        thread = threading.Thread(target=inifix.loads, args=("a 1",))
+        thread.start()
+        thread.join()
+        inifix.loads("b 2 3")
+    assert prof.calls["parse"] == 1
+    assert prof.lines == 1
@@ -0,0 +1,205 @@
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import inifix
+from inifix import Schema
+from inifix._testing import assert_mapping_equal
+from inifix._typing import Scalar
+
+DATA = """\
+[Grid]
+X1-grid   2  0.0  32  u  0.5  32  s  1.0
+X2-grid   1  0.0  64  u  1.0
+
+[TimeIntegrator]
+CFL       1
+tstop     1e3
+first_dt  1.e-4
+
+[Output]
+vtk       1
+log       100
+labels    'x'  y
+"""
+
+SCHEMA = Schema(
+    {
+        "Grid": {
+            "X1-grid": [int, float, (int, str, float), ...],
+            "X2-grid": [int, float, (int, str, float), ...],
+        },
+        "TimeIntegrator": {"CFL": float, "tstop": int},
+        "Output": {"vtk": float, "labels": list[str]},
+    }
+)
+
+
+def _infer_schema(data: Mapping[str, Any]) -> Schema:
+    # a schema matching the types found in data
+    def spec(value: Any) -> Any:
+        return [type(v) for v in value] if isinstance(value, list) else type(value)
+
+    return Schema(
+        {
+            key: {k: spec(v) for k, v in value.items()}
+            if isinstance(value, dict)
+            else spec(value)
+            for key, value in data.items()
+        }
+    )
+
+
+def test_load(inifile: Path) -> None:
+    expected = inifix.load(inifile)
+    schema = _infer_schema(expected)
+    assert_mapping_equal(inifix.load(inifile, schema=schema), expected)
+
+
+def test_declared_types() -> None:
+    conf = inifix.loads(DATA, schema=SCHEMA, sections="require")
+    assert conf["Grid"]["X1-grid"] == [2, 0.0, 32, "u", 0.5, 32, "s", 1.0]
+    assert conf["Grid"]["X2-grid"] == [1, 0.0, 64, "u", 1.0]
+    assert type(conf["TimeIntegrator"]["CFL"]) is float
+    assert conf["TimeIntegrator"]["tstop"] == 1000
+    assert type(conf["TimeIntegrator"]["tstop"]) is int
+    assert type(conf["Output"]["vtk"]) is float
+    assert conf["Output"]["labels"] == ["x", "y"]
+
+
+def test_undeclared_parameters() -> None:
+    conf = inifix.loads(DATA, schema=SCHEMA, sections="require")
+    expected = inifix.loads(DATA, sections="require")
+    assert conf["TimeIntegrator"]["first_dt"] == expected["TimeIntegrator"]["first_dt"]
+    assert type(conf["Output"]["log"]) is int
+    conf = inifix.loads(
+        DATA, schema=SCHEMA, integer_casting="aggressive", sections="require"
+    )
+    assert type(conf["TimeIntegrator"]["first_dt"]) is float
+
+
+@pytest.mark.parametrize(
+    "spec, source, expected",
+    [
+        (int, "1", 1),
+        (int, "1.0", 1),
+        (float, "1", 1.0),
+        (str, "1", "1"),
+        (str, "'a b'", "a b"),
+        (str, '"a"', "a"),
+        (bool, "yes", True),
+        (bool, "False", False),
+        (int | str, "1", 1),
+        (int | str, "a", "a"),
+        (bool | str, "true", True),
+        (list[int], "1", 1),
+        (list[int], "1 2 3", [1, 2, 3]),
+        ([int, str], "1 a", [1, "a"]),
+        ([int, float, ...], "1 2", [1, 2.0]),
+        ([int, float, ...], "1 2 3", [1, 2.0, 3.0]),
+        ([(int, str), ...], "1 a 2 b", [1, "a", 2, "b"]),
+    ],
+)
+def test_casting(spec: Any, source: str, expected: Scalar | list[Scalar]) -> None:
+    conf = inifix.loads(f"p  {source}", schema=Schema({"p": spec}), sections="forbid")
+    assert conf["p"] == expected
+    assert type(conf["p"]) is type(expected)
+
+
+@pytest.mark.parametrize(
+    "spec, source",
+    [
+        (int, "1.5"),
+        (int, "a"),
+        (float, "a"),
+        (bool, "1"),
+        (int, "1 2"),
+        (int | float, "a"),
+        ([int, str], "1"),
+        ([int, str], "1 a 2"),
+        ([int, (str, float), ...], "1 a"),
+        ([int, (str, float), ...], "1 a 1.0 b"),
+        (list[float], "1 a"),
+    ],
+)
+def test_casting_errors(spec: Any, source: str) -> None:
+    schema = Schema({"S": {"p": spec}})
+    with pytest.raises(
+        ValueError, match="(?s)^Failed to parse line 1: .*expected"
+    ) as excinfo:
+        inifix.loads(f"[S]\np  {source}", schema=schema)
+    assert str(excinfo.value).endswith(f"got {source!r}")
+
+
+def test_error_location(tmp_path: Path) -> None:
+    file = tmp_path / "test.ini"
+    file.write_text(DATA.replace("vtk       1", "vtk       never"))
+    with pytest.raises(ValueError) as excinfo:
+        inifix.load(file, schema=SCHEMA)
+    message = str(excinfo.value)
+    assert message.startswith(f"Failed to parse {file}:")
+    assert message.endswith("\nvtk       never\n'vtk': expected float, got 'never'")
+
+
+def test_parse_scalars_as_lists() -> None:
+    conf = inifix.loads(
+        DATA, schema=SCHEMA, parse_scalars_as_lists=True, sections="require"
+    )
+    assert conf["TimeIntegrator"]["CFL"] == [1.0]
+
+
+def test_validation() -> None:
+    # undeclared parameters are still validated
+    with pytest.raises(ExceptionGroup):
+        inifix.loads("[Output]\nvtk  1\n1log  1", schema=SCHEMA)
+    with pytest.raises(ValueError, match="sections were explicitly forbidden"):
+        inifix.loads(DATA, schema=SCHEMA, sections="forbid")
+
+
+def test_sectionless() -> None:
+    schema = Schema({"a": float, "S": {"b": float}})
+    assert inifix.loads("a  1\nb  1", schema=schema) == {"a": 1.0, "b": 1}
+    assert inifix.loads("[S]\na  1\nb  1", schema=schema) == {"S": {"a": 1, "b": 1.0}}
+
+
+def test_snapshot(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("INIFIX_CACHE_DIR", str(tmp_path / "cache"))
+    file = tmp_path / "test.ini"
+    file.write_text(DATA)
+    conf = inifix.load(file, snapshot=True, sections="require")
+    assert conf["Output"]["vtk"] == 1
+    conf = inifix.load(file, snapshot=True, schema=SCHEMA, sections="require")
+    assert type(conf["Output"]["vtk"]) is float
+
+
+def test_repr() -> None:
+    assert repr(SCHEMA) == (
+        "Schema({'Grid': {'X1-grid': [int, float, (int, str, float), ...], "
+        "'X2-grid': [int, float, (int, str, float), ...]}, "
+        "'TimeIntegrator': {'CFL': float, 'tstop': int}, "
+        "'Output': {'vtk': float, 'labels': list[str]}})"
+    )
+
+
+@pytest.mark.parametrize(
+    "spec, match",
+    [
+        ({"p": dict}, "Unsupported type dict"),
+        ({"p": None}, "Unsupported type None"),
+        ({"p": list[dict]}, "Unsupported type dict"),  # type: ignore[type-arg]
+        ({"p": []}, "expected at least one type"),
+        ({"p": [...]}, "nothing to repeat"),
+        ({"p": [int, ..., str]}, "only supported at the end"),
+        ({"p": [(int, str), float]}, "only supported at the end"),
+    ],
+)
+def test_invalid_spec(spec: dict[str, Any], match: str) -> None:
+    with pytest.raises(TypeError, match=match):
+        Schema(spec)
+
+
+def test_invalid_keys() -> None:
+    with pytest.raises(ValueError, match="Keys are expected to start with a letter"):
+        Schema({"S": {"1p": int}})
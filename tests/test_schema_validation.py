@@ -1,3 +1,4 @@
+from array import array
 from collections.abc import Mapping
 from pathlib import Path
 from typing import Any
@@ -170,6 +171,33 @@ def test_dump_invalid_conf(
         ).matches(excinfo.value)
 
 
+@pytest.mark.parametrize(
+    "value",
+    [
+        pytest.param(b"abc", id="bytes"),
+        pytest.param(bytearray(b"abc"), id="bytearray"),
+        pytest.param(memoryview(b"abc"), id="memoryview"),
+        pytest.param(range(3), id="range"),
+    ],
+)
+def test_dumps_non_list_sequence(value: object) -> None:
+    # these used to be written out element by element, e.g., b'abc' as 97 98 99
+    match = (
+        rf"^Key 'a' is associated to value .* with type {type(value).__name__}\. "
+        r"Expected an int, float, bool, str, or list of these types$"
+    )
+    with RaisesGroup(
+        RaisesExc(ValueError, match=match),
+        allow_unwrapped=True,
+        flatten_subgroups=True,
+    ):
+        dumps({"a": value})  # type: ignore[arg-type]
+
+
+def test_dumps_tuples_and_arrays() -> None:
+    assert dumps({"a": (1, 2), "b": array("d", [1.5, 2.5])}) == "a 1  2\nb 1.5  2.5\n"
+
+
 def test_unknown_sections_value() -> None:
     with pytest.raises(TypeError):
         validate_inifile_schema(
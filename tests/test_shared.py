@@ -0,0 +1,128 @@
+import math
+import multiprocessing
+import pickle
+from collections.abc import Generator
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import inifix
+from inifix import SharedConfig
+from inifix._testing import assert_mapping_equal
+from inifix._typing import MutConfig_SectionsRequired_ScalarsAllowed
+
+
+@pytest.fixture()
+def shared() -> Generator[SharedConfig, None, None]:
+    data: MutConfig_SectionsRequired_ScalarsAllowed = {
+        "Grid": {"X1-grid": [1, 0.0, 64, "u", 1.0], "X2-grid": []},
+        "Hydro": {"solver": "hllc", "gamma": 1.4, "csiso": True},
+        "Misc": {
+            "big": 2**70,
+            "nan": math.nan,
+            "unicode": "τ",
+            "ordered-z": 1,
+            "ordered-a": 2,
+        },
+        "Empty": {},
+    }
+    with inifix.share(data) as shared:
+        yield shared
+
+
+def test_roundtrip(inifile: Path) -> None:
+    data = inifix.load(inifile)
+    with inifix.share(data) as shared:
+        assert_mapping_equal(shared.to_dict(), data)
+        assert list(shared) == list(data)
+
+
+def test_mapping_interface(shared: SharedConfig) -> None:
+    assert len(shared) == 4
+    assert list(shared) == ["Grid", "Hydro", "Misc", "Empty"]
+    assert "Hydro" in shared
+    assert "Hydro2" not in shared
+    assert 1 not in shared  # type: ignore[comparison-overlap]
+    assert isinstance(shared["Hydro"], SharedConfig)
+    assert shared["Hydro"]["gamma"] == 1.4
+    assert shared["Hydro"]["csiso"] is True
+    assert shared["Grid"]["X1-grid"] == (1, 0.0, 64, "u", 1.0)
+    assert shared["Grid"]["X2-grid"] == ()
+    assert shared["Misc"]["big"] == 2**70
+    assert math.isnan(shared["Misc"]["nan"])
+    assert shared["Misc"]["unicode"] == "τ"
+    assert list(shared["Misc"])[-2:] == ["ordered-z", "ordered-a"]
+    assert dict(shared["Empty"]) == {}
+    with pytest.raises(KeyError):
+        shared["Hydro"]["missing"]
+
+
+def test_lookup(inifile: Path) -> None:
+    data = inifix.load(inifile)
+    with inifix.share(data) as shared:
+        for key, value in data.items():
+            if isinstance(value, dict):
+                for k, v in value.items():
+                    assert shared[key][k] == (tuple(v) if isinstance(v, list) else v)
+            else:
+                assert shared[key] == (
+                    tuple(value) if isinstance(value, list) else value
+                )
+
+
+def test_attach(shared: SharedConfig) -> None:
+    other = SharedConfig.attach(shared.name)
+    assert_mapping_equal(other.to_dict(), shared.to_dict())
+    other.close()
+    # the block is still available
+    assert shared["Hydro"]["solver"] == "hllc"
+
+
+def test_pickle(shared: SharedConfig) -> None:
+    section = pickle.loads(pickle.dumps(shared["Hydro"]))
+    assert dict(section) == {"solver": "hllc", "gamma": 1.4, "csiso": True}
+    assert len(pickle.dumps(shared)) < 100
+    section.close()
+
+
+def test_unlink_on_exit() -> None:
+    with inifix.share({"a": 1}) as shared:
+        name = shared.name
+    with pytest.raises(FileNotFoundError):
+        SharedConfig.attach(name)
+
+
+def test_named_block() -> None:
+    with inifix.share({"a": 1}, name="inifix-test-shared") as shared:
+        assert shared.name.endswith("inifix-test-shared")
+        with pytest.raises(FileExistsError):
+            inifix.share({"a": 1}, name="inifix-test-shared")
+
+
+def test_attach_invalid_block() -> None:
+    shm = SharedMemory(create=True, size=64)
+    try:
+        with pytest.raises(ValueError, match="doesn't hold a shared configuration"):
+            SharedConfig.attach(shm.name)
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def test_invalid_value() -> None:
+    with pytest.raises(TypeError, match="Expected an int, float, bool or str"):
+        inifix.share({"a": [None]})  # type: ignore[arg-type]
+
+
+def _read(shared: SharedConfig, key: str) -> Any:
+    return shared["Hydro"][key]
+
+
+def test_worker_process(shared: SharedConfig) -> None:
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(1) as pool:
+        assert pool.apply(_read, (shared, "gamma")) == 1.4
+    # workers don't destroy the block on exit
+    assert shared["Hydro"]["gamma"] == 1.4
@@ -0,0 +1,199 @@
+import os
+from pathlib import Path
+from typing import Any, Literal
+
+import pytest
+
+import inifix
+from inifix._snapshot import snapshot_path
+from inifix._testing import assert_mapping_equal
+from inifix._typing import AnyMutConfig
+
+DATA = """\
+[Grid]
+X1-grid   1  0.0  64  u  1.0
+[Hydro]
+solver    hllc
+gamma     1.4
+"""
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    path = tmp_path / "cache"
+    monkeypatch.setenv("INIFIX_CACHE_DIR", str(path))
+    return path
+
+
+@pytest.fixture()
+def file(tmp_path: Path) -> Path:
+    file = tmp_path / "test.ini"
+    file.write_text(DATA)
+    return file
+
+
+@pytest.fixture()
+def parse_calls(monkeypatch: pytest.MonkeyPatch) -> list[tuple[Any, ...]]:
+    calls: list[tuple[Any, ...]] = []
+    from_string = inifix._io._from_string
+
+    def spy(*args: Any, **kwargs: Any) -> AnyMutConfig:
+        calls.append(args)
+        return from_string(*args, **kwargs)
+
+    monkeypatch.setattr("inifix._io._from_string", spy)
+    return calls
+
+
+def _snapshot(
+    file: Path, parse_scalars_as_lists: bool = False, integer_casting: str = "stable"
+) -> str:
+    return snapshot_path(
+        str(file), (parse_scalars_as_lists, integer_casting, repr(None))
+    )
+
+
+def test_roundtrip(inifile: Path, tmp_path: Path) -> None:
+    # copy data files, so that snapshots are not shared between tests
+    file = tmp_path / inifile.name
+    file.write_bytes(inifile.read_bytes())
+    expected = inifix.load(file)
+    assert_mapping_equal(inifix.load(file, snapshot=True), expected)
+    assert os.path.exists(_snapshot(file))
+    assert_mapping_equal(inifix.load(file, snapshot=True), expected)
+
+
+def test_snapshot_is_used(file: Path, parse_calls: list[tuple[Any, ...]]) -> None:
+    inifix.load(file, snapshot=True)
+    inifix.load(file, snapshot=True)
+    assert len(parse_calls) == 1
+
+
+def test_results_are_independent(file: Path) -> None:
+    conf1 = inifix.load(file, snapshot=True, sections="require")
+    conf1["Hydro"]["gamma"] = 5 / 3
+    conf2 = inifix.load(file, snapshot=True, sections="require")
+    assert conf2["Hydro"]["gamma"] == 1.4
+    assert conf2 is not inifix.load(file, snapshot=True)
+
+
+def test_stale(file: Path, parse_calls: list[tuple[Any, ...]]) -> None:
+    inifix.load(file, snapshot=True)
+    st = file.stat()
+    file.write_text(DATA.replace("hllc", "roe "))
+    # mtime and size alone are not trusted
+    os.utime(file, ns=(st.st_atime_ns, st.st_mtime_ns))
+    conf = inifix.load(file, snapshot=True, sections="require")
+    assert conf["Hydro"]["solver"] == "roe"
+    assert len(parse_calls) == 2
+
+
+@pytest.mark.parametrize(
+    "content", [b"", b"\x00\x00\x00", b"\x10\x00\x00\x00garbage", b"\xff" * 64]
+)
+def test_corrupted(file: Path, content: bytes) -> None:
+    inifix.load(file, snapshot=True)
+    with open(_snapshot(file), "wb") as fh:
+        fh.write(content)
+    assert_mapping_equal(inifix.load(file, snapshot=True), inifix.load(file))
+    # the snapshot was repaired
+    assert os.path.getsize(_snapshot(file)) > 64
+
+
+def test_truncated(file: Path) -> None:
+    inifix.load(file, snapshot=True)
+    path = _snapshot(file)
+    with open(path, "rb") as fh:
+        content = fh.read()
+    with open(path, "wb") as fh:
+        fh.write(content[:-10])
+    assert_mapping_equal(inifix.load(file, snapshot=True), inifix.load(file))
+
+
+def test_version_mismatch(
+    file: Path, monkeypatch: pytest.MonkeyPatch, parse_calls: list[tuple[Any, ...]]
+) -> None:
+    inifix.load(file, snapshot=True)
+    monkeypatch.setattr("inifix._version.__version__", "0.0.0")
+    inifix.load(file, snapshot=True)
+    inifix.load(file, snapshot=True)
+    assert len(parse_calls) == 2
+
+
+def test_parsing_options(file: Path) -> None:
+    conf = inifix.load(file, snapshot=True, sections="require")
+    assert conf["Hydro"]["gamma"] == 1.4
+    as_lists = inifix.load(
+        file, snapshot=True, parse_scalars_as_lists=True, sections="require"
+    )
+    assert as_lists["Hydro"]["gamma"] == [1.4]
+    assert _snapshot(file, True) != _snapshot(file)
+    assert os.path.exists(_snapshot(file, True))
+    conf = inifix.load(
+        file, snapshot=True, integer_casting="aggressive", sections="require"
+    )
+    assert conf["Grid"]["X1-grid"] == [1, 0, 64, "u", 1]
+
+
+def test_validation(tmp_path: Path) -> None:
+    file = tmp_path / "test.ini"
+    file.write_text("1a  1\n")
+    with pytest.raises(ExceptionGroup):
+        inifix.load(file, snapshot=True)
+    assert not os.path.exists(_snapshot(file))
+
+    # unvalidated snapshots are validated on use
+    assert inifix.load(file, snapshot=True, skip_validation=True) == {"1a": 1}
+    assert os.path.exists(_snapshot(file))
+    with pytest.raises(ExceptionGroup):
+        inifix.load(file, snapshot=True)
+
+
+@pytest.mark.parametrize("sections", ["forbid", "require"])
+def test_sections(
+    file: Path, tmp_path: Path, sections: Literal["forbid", "require"]
+) -> None:
+    inifix.load(file, snapshot=True)
+    if sections == "forbid":
+        with pytest.raises(ValueError, match="sections were explicitly forbidden"):
+            inifix.load(file, snapshot=True, sections=sections)
+    else:
+        inifix.load(file, snapshot=True, sections=sections)
+
+    sectionless = tmp_path / "sectionless.ini"
+    sectionless.write_text("a  1\n")
+    inifix.load(sectionless, snapshot=True)
+    if sections == "require":
+        with pytest.raises(ValueError, match="sections were explicitly required"):
+            inifix.load(sectionless, snapshot=True, sections=sections)
+    else:
+        inifix.load(sectionless, snapshot=True, sections=sections)
+
+
+def test_output_options(file: Path) -> None:
+    inifix.load(file, snapshot=True)
+    assert inifix.load(file, snapshot=True, frozen=True) == inifix.load(
+        file, frozen=True
+    )
+    assert inifix.load(file, snapshot=True, compact=True).to_dict() == inifix.load(file)
+
+
+def test_empty_file(tmp_path: Path) -> None:
+    file = tmp_path / "empty.ini"
+    file.write_text("# nothing\n")
+    with pytest.raises(ValueError, match="appears to be empty"):
+        inifix.load(file, snapshot=True)
+
+
+def test_unwritable_cache(
+    file: Path, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    # a file in place of the cache directory
+    (tmp_path / "blocked").touch()
+    monkeypatch.setenv("INIFIX_CACHE_DIR", str(tmp_path / "blocked"))
+    assert_mapping_equal(inifix.load(file, snapshot=True), inifix.load(file))
+
+
+def test_file_descriptor(file: Path) -> None:
+    with open(file, "rb") as fh, pytest.raises(TypeError, match="requires source"):
+        inifix.load(fh, snapshot=True)